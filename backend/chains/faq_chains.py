@@ -3,8 +3,9 @@
 import json
 from typing import List, Dict
 from langchain_core.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
 from backend.infrastructure.config import settings
+from backend.infrastructure.llm_clients import llm_clients
+from backend.infrastructure.metrics import LLM_CALLS
 from backend.infrastructure.vectorstore import get_vectorstore_client
 import re
 
@@ -28,7 +29,7 @@ Retorne em JSON: [{{"question": ..., "answer": ..., "excerpt": ..., "link":...}}
 # 2) Retriever + LLM
 vs = get_vectorstore_client()
 retriever = vs.as_retriever(search_kwargs={"k": 3})
-llm = ChatOpenAI(model=settings.CHAT_MODEL)
+llm = llm_clients.chat()
 
 # 3) Chain
 faq_chain = faq_template | llm
@@ -40,7 +41,9 @@ def build_enriched_emails(emails: List[str]) -> List[str]:
     """
     enriched = []
     for body in emails:
-        docs = retriever.invoke(body)
+        LLM_CALLS.inc(endpoint="faq", kind="embedding")
+        with llm_clients.slot(settings.EMBEDDINGS_MODEL):
+            docs = retriever.invoke(body)
         context = "\n\n".join(d.page_content for d in docs)
         enriched.append(f"E-mail:\n{body}\n\nContexto encontrado:\n{context}")
     return enriched
@@ -50,7 +53,9 @@ def run_faq_chain(raw_emails: List[str]) -> List[Dict]:
     enriched = build_enriched_emails(raw_emails)
 
     # 2) Invocar o chain
-    result = faq_chain.invoke({"emails": enriched})
+    LLM_CALLS.inc(endpoint="faq", kind="chat")
+    with llm_clients.slot(settings.CHAT_MODEL):
+        result = faq_chain.invoke({"emails": enriched})
 
     # 3) Extrair o texto bruto de onde der
     if isinstance(result, str):
@@ -0,0 +1,76 @@
+# backend/chains/json_stream.py
+
+import json
+from typing import Any, List
+
+class JSONArrayStreamParser:
+    """
+    Parser incremental para um array JSON de objetos que chega em pedaços
+    (tokens do LLM). A cada `feed` devolve os objetos do nível superior
+    que acabaram de ser fechados, sem esperar o fim do array.
+
+    Tudo antes do array é ignorado (cercas ```json, texto do modelo). Um
+    '[' só abre o array se o próximo caractere não branco for '{' ou ']';
+    colchetes no texto do modelo ("[o quiz]") não contam.
+    Objetos que não são JSON válido são descartados e contados em `errors`,
+    sem interromper os demais.
+    """
+    def __init__(self):
+        self._buf: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False     # viu um '[' candidato
+        self._committed = False   # o '[' candidato é mesmo o início do array
+        self.done = False
+        self.errors: List[str] = []
+
+    def feed(self, chunk: str) -> List[Any]:
+        items = []
+        for ch in chunk:
+            if self.done:
+                break
+            if not self._started:
+                self._started = ch == "["
+                continue
+            if not self._committed:
+                if ch.isspace() or ch == "[":
+                    continue
+                if ch not in "{]":
+                    self._started = False
+                    continue
+                self._committed = True
+
+            # Entre objetos: só vírgulas, espaços ou o fechamento do array
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._buf = ["{"]
+                elif ch == "]":
+                    self.done = True
+                continue
+
+            self._buf.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    raw = "".join(self._buf)
+                    self._buf = []
+                    try:
+                        items.append(json.loads(raw))
+                    except json.JSONDecodeError as e:
+                        self.errors.append(f"{e}: {raw[:200]}")
+        return items
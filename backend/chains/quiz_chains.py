@@ -1,17 +1,21 @@
 from langchain_core.prompts import PromptTemplate
 from backend.infrastructure.vectorstore import get_vectorstore_client
-from langchain_openai import ChatOpenAI
 from backend.infrastructure.config import settings
+from backend.infrastructure.llm_clients import llm_clients
+from backend.infrastructure.metrics import LLM_CALLS
+from backend.chains.json_stream import JSONArrayStreamParser
+from backend.services.text_utils import normalize_text, is_near_duplicate
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import json
-from typing import List, Dict, Any
+import logging
+import math
+import re
+from typing import List, Dict, Any, Iterator
 
-# PromptTemplate precisa de chaves duplas para JSON literal
-quiz_template = PromptTemplate(
-    input_variables=["theme", "n_questions"],
-    template="""
-Você é um assistente que gera quizzes baseados na documentação oficial de Python, FastAPI e Streamlit.
-Gere exatamente {n_questions} perguntas de múltipla escolha sobre o tema "{theme}".
-Retorne a saída no seguinte formato JSON:
+logger = logging.getLogger(__name__)
+
+# Formato de saída comum aos prompts de quiz
+QUIZ_JSON_FORMAT = """Retorne a saída no seguinte formato JSON:
 [
   {{
     "prompt": "<texto da pergunta>",
@@ -27,54 +31,225 @@ Retorne a saída no seguinte formato JSON:
   ...
 ]
 """
+
+# PromptTemplate precisa de chaves duplas para JSON literal
+quiz_template = PromptTemplate(
+    input_variables=["theme", "n_questions"],
+    template="""
+Você é um assistente que gera quizzes baseados na documentação oficial de Python, FastAPI e Streamlit.
+Gere exatamente {n_questions} perguntas de múltipla escolha sobre o tema "{theme}".
+""" + QUIZ_JSON_FORMAT
+)
+
+# Variante para a geração em lotes: cada lote recebe trechos diferentes da documentação
+quiz_batch_template = PromptTemplate(
+    input_variables=["theme", "n_questions", "context", "avoid"],
+    template="""
+Você é um assistente que gera quizzes baseados na documentação oficial de Python, FastAPI e Streamlit.
+Gere exatamente {n_questions} perguntas de múltipla escolha sobre o tema "{theme}",
+baseadas principalmente nos trechos de documentação abaixo.
+
+Documentação:
+{context}
+
+Não repita nenhuma destas perguntas:
+{avoid}
+
+""" + QUIZ_JSON_FORMAT
 )
 
 # Retriever + LLM
 vs = get_vectorstore_client()
 retriever = vs.as_retriever(search_kwargs={"k": 3})
-llm = ChatOpenAI(model=settings.CHAT_MODEL)
+llm = llm_clients.chat()
 
 # Chain direta: só gera o texto bruto
 quiz_chain = quiz_template | llm
+quiz_batch_chain = quiz_batch_template | llm
+
+# Perguntas de lotes diferentes com enunciados assim parecidos contam como repetidas
+DUPLICATE_PROMPT_THRESHOLD = 0.9
+# Trechos da documentação entregues a cada lote
+CHUNKS_PER_BATCH = 2
+
+def normalize_quiz_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte um item cru do LLM ({prompt, options, correct_answer, explanation})
+    no formato usado pelo serviço. Levanta ValueError se o item for inválido.
+    """
+    if not isinstance(item, dict):
+        raise ValueError(f"Pergunta em formato inesperado: {item!r}")
+    prompt = item.get("prompt", "")
+    explanation = item.get("explanation", "")
+    options = item.get("options", {})
+    correct_letter = item.get("correct_answer")
+    if correct_letter not in options:
+        raise ValueError(f"Letra correta '{correct_letter}' não encontrada em options {options}")
+
+    # Texto da resposta correta
+    correct_text = options[correct_letter]
+    # Converte options em lista de alternativas
+    alternatives = [
+        {"letter": letter, "text": text}
+        for letter, text in options.items()
+    ]
+
+    return {
+        "prompt": prompt,
+        "explanation": explanation,
+        "correct_answer_letter": correct_letter,
+        "correct_answer_text": correct_text,
+        "alternatives": alternatives
+    }
 
 def run_quiz_chain(theme: str, n_questions: int) -> List[Dict[str, Any]]:
     """
     Executa a chain para gerar um quiz e retorna lista de perguntas já normalizadas.
     """
-    raw = quiz_chain.invoke({"theme": theme, "n_questions": n_questions})
+    LLM_CALLS.inc(endpoint="quiz", kind="chat")
+    with llm_clients.slot(settings.CHAT_MODEL):
+        raw = quiz_chain.invoke({"theme": theme, "n_questions": n_questions})
 
     try:
         data = json.loads(raw.content)
         if not isinstance(data, list):
             raise ValueError("Formato esperado é uma lista de perguntas.")
 
-        questions: List[Dict[str, Any]] = []
-        for item in data:
-            prompt = item.get("prompt", "")
-            explanation = item.get("explanation", "")
-            options = item.get("options", {})
-            correct_letter = item.get("correct_answer")
-            if correct_letter not in options:
-                raise ValueError(f"Letra correta '{correct_letter}' não encontrada em options {options}")
-
-            # Texto da resposta correta
-            correct_text = options[correct_letter]
-            # Converte options em lista de alternativas
-            alternatives = [
-                {"letter": letter, "text": text}
-                for letter, text in options.items()
-            ]
-
-            questions.append({
-                "prompt": prompt,
-                "explanation": explanation,
-                "correct_answer_letter": correct_letter,
-                "correct_answer_text": correct_text,
-                "alternatives": alternatives
-            })
-        return questions
+        return [normalize_quiz_item(item) for item in data]
 
     except json.JSONDecodeError as e:
         raise ValueError(f"Erro ao decodificar JSON do quiz: {e}\nRaw output:\n{raw.content}")
     except Exception:
         raise
+
+def stream_quiz_chain(theme: str, n_questions: int) -> Iterator[Dict[str, Any]]:
+    """
+    Versão em streaming de `run_quiz_chain`: consome os tokens do LLM e
+    entrega cada pergunta normalizada assim que o objeto JSON dela fecha.
+    Perguntas malformadas são puladas em vez de derrubar o quiz inteiro.
+    """
+    parser = JSONArrayStreamParser()
+    produced = 0
+    LLM_CALLS.inc(endpoint="quiz", kind="chat")
+    # A vaga do modelo fica ocupada enquanto o stream estiver aberto
+    with llm_clients.slot(settings.CHAT_MODEL):
+        for chunk in quiz_chain.stream({"theme": theme, "n_questions": n_questions}):
+            for item in parser.feed(chunk.content):
+                try:
+                    question = normalize_quiz_item(item)
+                except ValueError:
+                    continue
+                yield question
+                produced += 1
+                if produced >= n_questions:
+                    return
+            if parser.done:
+                return
+
+def _parse_batch_output(text: str) -> List[Dict[str, Any]]:
+    """
+    Lê a saída de um lote. JSON inválido levanta ValueError (o lote é
+    refeito); itens individuais malformados são só descartados.
+    """
+    text = re.sub(r"^```(?:json)?\s*", "", text.strip())
+    text = re.sub(r"\s*```$", "", text)
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Erro ao decodificar JSON do lote: {e}")
+    if not isinstance(data, list):
+        raise ValueError("Formato esperado é uma lista de perguntas.")
+
+    questions = []
+    for item in data:
+        try:
+            questions.append(normalize_quiz_item(item))
+        except ValueError:
+            continue
+    return questions
+
+def _run_quiz_batch(theme: str, n_questions: int, context: str, avoid: List[str]) -> List[Dict[str, Any]]:
+    LLM_CALLS.inc(endpoint="quiz", kind="chat")
+    with llm_clients.slot(settings.CHAT_MODEL):
+        raw = quiz_batch_chain.invoke({
+            "theme": theme,
+            "n_questions": n_questions,
+            "context": context or "(sem trechos: use seu conhecimento da documentação oficial)",
+            "avoid": "\n".join(f"- {p}" for p in avoid) or "(nenhuma)",
+        })
+    return _parse_batch_output(raw.content)
+
+def iter_quiz_chain_fanout(
+    theme: str,
+    n_questions: int,
+    batch_size: int = settings.QUIZ_FANOUT_BATCH_SIZE,
+    max_concurrency: int = settings.QUIZ_FANOUT_CONCURRENCY,
+    max_retries: int = settings.QUIZ_FANOUT_RETRIES,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Gera o quiz em lotes pequenos e concorrentes, entregando cada pergunta
+    assim que o lote dela termina.
+
+    - Cada lote recebe trechos diferentes da documentação recuperados para o tema.
+    - No máximo `max_concurrency` chamadas ao LLM ficam em voo ao mesmo tempo.
+    - Enunciados repetidos entre lotes são descartados.
+    - Só o lote que falhou é refeito (até `max_retries` vezes); se faltarem
+      perguntas depois das duplicatas, lotes extras completam o total.
+    """
+    n_batches = math.ceil(n_questions / batch_size)
+    with llm_clients.slot(settings.EMBEDDINGS_MODEL):
+        docs = vs.similarity_search(theme, k=n_batches * CHUNKS_PER_BATCH)
+    LLM_CALLS.inc(endpoint="quiz", kind="embedding")
+    contexts = [
+        "\n\n".join(d.page_content for d in docs[i::n_batches])
+        for i in range(n_batches)
+    ]
+    sizes = [batch_size] * (n_questions // batch_size)
+    if n_questions % batch_size:
+        sizes.append(n_questions % batch_size)
+
+    seen_keys: List[str] = []
+    seen_prompts: List[str] = []
+    produced = 0
+    topups = 0
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, n_batches)), thread_name_prefix="quiz-fanout")
+    try:
+        # future -> (índice do lote, tamanho, tentativa)
+        pending = {
+            pool.submit(_run_quiz_batch, theme, size, contexts[i], []): (i, size, 0)
+            for i, size in enumerate(sizes)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                idx, size, attempt = pending.pop(fut)
+                try:
+                    items = fut.result()
+                except Exception as e:
+                    if attempt < max_retries:
+                        logger.warning("Lote %s do quiz falhou (%s); tentando de novo", idx, e)
+                        pending[pool.submit(_run_quiz_batch, theme, size, contexts[idx], list(seen_prompts))] = (idx, size, attempt + 1)
+                    else:
+                        logger.error("Lote %s do quiz falhou após %s tentativas: %s", idx, attempt + 1, e)
+                    continue
+
+                for q in items:
+                    key = normalize_text(q["prompt"])
+                    if is_near_duplicate(key, seen_keys, DUPLICATE_PROMPT_THRESHOLD):
+                        continue
+                    seen_keys.append(key)
+                    seen_prompts.append(q["prompt"])
+                    yield q
+                    produced += 1
+                    if produced >= n_questions:
+                        return
+
+            # Todos os lotes terminaram mas faltam perguntas: completa com um lote extra
+            if not pending and produced < n_questions and topups < max_retries:
+                topups += 1
+                missing = n_questions - produced
+                idx = topups % n_batches
+                pending[pool.submit(_run_quiz_batch, theme, missing, contexts[idx], list(seen_prompts))] = (idx, missing, max_retries)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
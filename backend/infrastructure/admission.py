@@ -0,0 +1,168 @@
+# backend/infrastructure/admission.py
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from backend.infrastructure.config import settings
+from backend.infrastructure.metrics import ADMISSION_REJECTED
+
+# Buckets guardados por chave (sessão ou IP); os mais antigos saem primeiro
+MAX_BUCKETS = 100_000
+
+class RateLimited(Exception):
+    """Requisição recusada pelo controle de admissão; `retry_after` em segundos."""
+    def __init__(self, detail: str, retry_after: float, reason: str):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+        self.reason = reason
+
+def too_many_requests(e: RateLimited) -> HTTPException:
+    """429 com Retry-After (segundos inteiros, arredondados para cima)."""
+    ADMISSION_REJECTED.inc(reason=e.reason)
+    return HTTPException(
+        status_code=429,
+        detail=e.detail,
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+    )
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+class TokenBuckets:
+    """
+    Token buckets medidos em tokens do LLM, um por chave. O saldo enche a
+    `rate` tokens/s até `burst`. Uma requisição só entra com saldo
+    positivo; o custo real é debitado depois (`charge`) e pode deixar o
+    saldo negativo. Aí as próximas esperam a dívida ser paga, e o
+    Retry-After diz quanto tempo falta.
+    """
+    def __init__(self, name: str, reason: str, rate: float, burst: float):
+        self.name = name
+        self.reason = reason
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()   # chave -> [saldo, instante]
+
+    def _level(self, key: str, now: float) -> list:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            while len(self._buckets) > MAX_BUCKETS:
+                self._buckets.popitem(last=False)
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def check(self, key: Optional[str], cost: float = 0) -> None:
+        """
+        Levanta RateLimited se o saldo da chave não cobre `cost` (0 = só
+        exige saldo positivo). Um custo maior que `burst` exige o bucket
+        cheio. Não debita nada.
+        """
+        if self.rate <= 0 or not key:
+            return
+        with self._lock:
+            level = self._level(key, time.monotonic())[0]
+        needed = min(max(cost, 1), self.burst) - level
+        if needed > 0:
+            raise RateLimited(f"Limite de tokens por {self.name} excedido", needed / self.rate, reason=self.reason)
+
+    def charge(self, key: Optional[str], tokens: float) -> None:
+        """Debita `tokens` do saldo da chave (negativo devolve, até `burst`)."""
+        if self.rate <= 0 or not key or not tokens:
+            return
+        with self._lock:
+            bucket = self._level(key, time.monotonic())
+            bucket[0] = min(self.burst, bucket[0] - tokens)
+
+class StreamTicket:
+    """Vaga de stream; `release` é idempotente (chamado no fim do stream e como rede de segurança)."""
+    def __init__(self, gate: "StreamGate"):
+        self._gate = gate
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._gate._release()
+
+class StreamGate:
+    """
+    Limite global de streams do chat em andamento. Acima do limite, até
+    `max_queue` requisições esperam (no máximo `queue_timeout` s) por uma
+    vaga, em ordem de chegada; com a fila cheia a resposta é 429 na hora.
+    Vive no event loop (só corrotinas usam).
+    """
+    def __init__(self, max_active: int, max_queue: int, queue_timeout: float):
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: deque = deque()
+
+    async def admit(self) -> StreamTicket:
+        if self.active < self.max_active and not self._waiters:
+            self.active += 1
+            return StreamTicket(self)
+        if len(self._waiters) >= self.max_queue:
+            raise RateLimited("Servidor ocupado: muitas conversas simultâneas", self.queue_timeout or 1, reason="queue_full")
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(fut)
+            raise RateLimited("Servidor ocupado: tempo de espera por uma vaga esgotado", self.queue_timeout or 1, reason="queue_timeout")
+        except asyncio.CancelledError:
+            self._abandon(fut)
+            raise
+        return StreamTicket(self)
+
+    def _abandon(self, fut: asyncio.Future) -> None:
+        if fut in self._waiters:
+            self._waiters.remove(fut)
+        elif fut.done() and not fut.cancelled():
+            # A vaga chegou junto com o timeout/cancelamento: repassa
+            self._release()
+
+    def _release(self) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)   # a vaga passa direto para o próximo (active não muda)
+                return
+        self.active -= 1
+
+chat_stream_gate = StreamGate(
+    max_active=settings.CHAT_MAX_STREAMS,
+    max_queue=settings.CHAT_MAX_QUEUE,
+    queue_timeout=settings.CHAT_QUEUE_TIMEOUT,
+)
+session_tokens = TokenBuckets(
+    "sessão", "session_tokens",
+    rate=settings.SESSION_TOKENS_PER_MINUTE / 60, burst=settings.SESSION_TOKEN_BURST,
+)
+ip_tokens = TokenBuckets(
+    "IP", "ip_tokens",
+    rate=settings.IP_TOKENS_PER_MINUTE / 60, burst=settings.IP_TOKEN_BURST,
+)
+
+def check_token_budget(session_id: Optional[str], ip: Optional[str], cost: float = 0) -> None:
+    """Confere os buckets da sessão e do IP; levanta RateLimited se algum não cobrir `cost`."""
+    session_tokens.check(session_id, cost)
+    ip_tokens.check(ip, cost)
+
+def charge_tokens(session_id: Optional[str], ip: Optional[str], tokens: float) -> None:
+    """Debita tokens consumidos (ou estimados) dos buckets da sessão e do IP."""
+    session_tokens.charge(session_id, tokens)
+    ip_tokens.charge(ip, tokens)
@@ -0,0 +1,67 @@
+# backend/infrastructure/archive_io.py
+import gzip
+import io
+import logging
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional; sem ele os arquivos saem em gzip
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SUFFIXES = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz"}
+
+def resolve_compression(preferred: str) -> str:
+    """
+    Compressão efetiva: zstd se pedida e disponível, senão gzip.
+    """
+    if preferred == "zstd" and zstandard is None:
+        logger.warning("Pacote zstandard não instalado; arquivando em gzip")
+        return "gzip"
+    return preferred if preferred in SUFFIXES else "gzip"
+
+@contextmanager
+def open_archive_writer(path: str, compression: str) -> Iterator[IO[str]]:
+    """
+    Abre um arquivo JSONL comprimido para escrita, de forma atômica: o
+    conteúdo vai para `path.tmp` e só aparece em `path` se o bloco terminar
+    sem erro.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as raw:
+            if compression == "zstd":
+                with zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False) as zw:
+                    with io.TextIOWrapper(zw, encoding="utf-8") as fh:
+                        yield fh
+            else:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as gz:
+                    with io.TextIOWrapper(gz, encoding="utf-8") as fh:
+                        yield fh
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+@contextmanager
+def open_archive_reader(path: str) -> Iterator[IO[str]]:
+    """
+    Abre um arquivo de arquivo morto (.jsonl.zst ou .jsonl.gz) para leitura
+    em streaming, linha a linha.
+    """
+    with open(path, "rb") as raw:
+        if path.endswith(SUFFIXES["zstd"]):
+            if zstandard is None:
+                raise RuntimeError(f"Pacote zstandard necessário para ler {path}")
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = gzip.GzipFile(fileobj=raw, mode="rb")
+        with io.TextIOWrapper(stream, encoding="utf-8") as fh:
+            yield fh
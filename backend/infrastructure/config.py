@@ -7,11 +7,61 @@ load_dotenv()
 class settings():
     BASE_DIR: str         = Path(__file__).parent.parent
     DB_DIR: str           = BASE_DIR / "db"
-    VS_PATH: str          = str(DB_DIR / "faiss_index")
+    VS_PATH: str          = os.getenv("VS_PATH", str(DB_DIR / "faiss_index"))
     USAGE_DB : str        = str(DB_DIR / "usage.db")
     OPENAI_API_KEY: str   = os.getenv("OPENAI_API_KEY")
+    OPENAI_BASE_URL: str  = os.getenv("OPENAI_BASE_URL")   # ex.: servidor fake dos testes de carga
+    LLM_TIMEOUT: float    = float(os.getenv("LLM_TIMEOUT", "60"))
+    LLM_MAX_RETRIES: int  = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+    LLM_CHAT_CONCURRENCY: int       = int(os.getenv("LLM_CHAT_CONCURRENCY", "16"))     # chamadas em voo por modelo de chat
+    LLM_EMBEDDINGS_CONCURRENCY: int = int(os.getenv("LLM_EMBEDDINGS_CONCURRENCY", "32"))
+    CHAT_COALESCING_ENABLED: bool   = os.getenv("CHAT_COALESCING_ENABLED", "true").lower() == "true"
+    CHAT_MAX_STREAMS: int       = int(os.getenv("CHAT_MAX_STREAMS", "64"))        # streams do chat em andamento
+    CHAT_MAX_QUEUE: int         = int(os.getenv("CHAT_MAX_QUEUE", "128"))         # à espera de vaga; acima disso, 429
+    CHAT_QUEUE_TIMEOUT: float   = float(os.getenv("CHAT_QUEUE_TIMEOUT", "10"))
+    SESSION_TOKENS_PER_MINUTE: int = int(os.getenv("SESSION_TOKENS_PER_MINUTE", "20000"))   # 0 desliga
+    SESSION_TOKEN_BURST: int       = int(os.getenv("SESSION_TOKEN_BURST", "40000"))
+    IP_TOKENS_PER_MINUTE: int      = int(os.getenv("IP_TOKENS_PER_MINUTE", "60000"))        # 0 desliga
+    IP_TOKEN_BURST: int            = int(os.getenv("IP_TOKEN_BURST", "120000"))
+    QUIZ_MAX_QUESTIONS: int        = int(os.getenv("QUIZ_MAX_QUESTIONS", "50"))
+    QUIZ_TOKENS_PER_QUESTION: int  = int(os.getenv("QUIZ_TOKENS_PER_QUESTION", "300"))   # estimativa cobrada do bucket do IP
     CHAT_MODEL: str       = os.getenv("CHAT_MODEL") 
     EMBEDDINGS_MODEL: str = os.getenv("EMBEDDINGS_MODEL")
+    JOB_WORKERS: int      = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_SIZE: int   = int(os.getenv("JOB_QUEUE_SIZE", "20"))
+    FAQ_MATCH_THRESHOLD: float = float(os.getenv("FAQ_MATCH_THRESHOLD", "0.85"))
+    ANSWER_KEY_CACHE_SIZE: int = int(os.getenv("ANSWER_KEY_CACHE_SIZE", "1024"))
+    RESPONSE_CACHE_SIZE: int   = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+    QUESTION_BANK_ENABLED: bool        = os.getenv("QUESTION_BANK_ENABLED", "true").lower() == "true"
+    QUESTION_BANK_TARGET_STOCK: int    = int(os.getenv("QUESTION_BANK_TARGET_STOCK", "30"))
+    QUESTION_BANK_MIN_DEMAND: int      = int(os.getenv("QUESTION_BANK_MIN_DEMAND", "3"))
+    QUESTION_BANK_REFILL_BATCH: int    = int(os.getenv("QUESTION_BANK_REFILL_BATCH", "5"))
+    QUESTION_BANK_REFILL_INTERVAL: float = float(os.getenv("QUESTION_BANK_REFILL_INTERVAL", "60"))
+    QUIZ_FANOUT_THRESHOLD: int   = int(os.getenv("QUIZ_FANOUT_THRESHOLD", "4"))
+    QUIZ_FANOUT_BATCH_SIZE: int  = int(os.getenv("QUIZ_FANOUT_BATCH_SIZE", "2"))
+    QUIZ_FANOUT_CONCURRENCY: int = int(os.getenv("QUIZ_FANOUT_CONCURRENCY", "5"))
+    QUIZ_FANOUT_RETRIES: int     = int(os.getenv("QUIZ_FANOUT_RETRIES", "2"))
+    SQLITE_SYNCHRONOUS: str      = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_CACHE_KB: int         = int(os.getenv("SQLITE_CACHE_KB", "65536"))
+    SQLITE_MMAP_BYTES: int       = int(os.getenv("SQLITE_MMAP_BYTES", str(256 * 1024 * 1024)))
+    SQLITE_BUSY_TIMEOUT_MS: int  = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_POOL_SIZE: int        = int(os.getenv("SQLITE_POOL_SIZE", "10"))
+    SQLITE_MAX_OVERFLOW: int     = int(os.getenv("SQLITE_MAX_OVERFLOW", "20"))
+    SQLITE_POOL_TIMEOUT: float   = float(os.getenv("SQLITE_POOL_TIMEOUT", "30"))
+    AUTO_MIGRATE: bool           = os.getenv("AUTO_MIGRATE", "false").lower() == "true"
+    ARCHIVE_DIR: str             = os.getenv("ARCHIVE_DIR", str(DB_DIR / "archive"))
+    ARCHIVE_COMPRESSION: str     = os.getenv("ARCHIVE_COMPRESSION", "zstd")   # zstd | gzip
+    RETENTION_DAYS: int          = int(os.getenv("RETENTION_DAYS", "90"))
+    RETENTION_BATCH_SIZE: int    = int(os.getenv("RETENTION_BATCH_SIZE", "5000"))
+    RETENTION_INTERVAL: float    = float(os.getenv("RETENTION_INTERVAL", "86400"))   # 0 desliga
+    EMAIL_IMPORT_BATCH_SIZE: int = int(os.getenv("EMAIL_IMPORT_BATCH_SIZE", "500"))
+    EMAIL_IMPORT_MAX_ERRORS: int = int(os.getenv("EMAIL_IMPORT_MAX_ERRORS", "1000"))
+    EMAIL_IMPORT_MAX_RECORD_CHARS: int = int(os.getenv("EMAIL_IMPORT_MAX_RECORD_CHARS", str(256 * 1024)))   # registro CSV com quebras de linha
+    PROFILING_ENABLED: bool      = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_SAMPLE_RATE: float   = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))   # fração das requisições perfiladas sem header
+    PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    PROFILE_STORE_SIZE: int      = int(os.getenv("PROFILE_STORE_SIZE", "20"))
     DOC_URLS              = [
         "https://docs.python.org/3/tutorial/",
         "https://fastapi.tiangolo.com/",
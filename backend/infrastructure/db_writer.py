@@ -0,0 +1,101 @@
+# backend/infrastructure/db_writer.py
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+# O SQLite aceita um único escritor por vez. Serializar as escritas do
+# processo aqui evita que threads disputem o lock do arquivo (e estourem
+# "database is locked"); leituras seguem concorrentes graças ao WAL.
+_write_lock = threading.Lock()
+_local = threading.local()
+
+# Do lado assíncrono, as corrotinas fazem fila num asyncio.Lock do seu
+# loop e só a primeira da fila disputa `_write_lock`; se ele estiver com
+# outra thread, a espera ocupa esta thread dedicada, não o executor padrão.
+_loop_queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+_lock_waiter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write-lock")
+_async_holder: Optional[asyncio.Task] = None
+_async_holder_thread: Optional[int] = None
+
+@contextmanager
+def serialized_write():
+    """
+    Mantém o lock de escrita do processo durante o bloco. É reentrante na
+    mesma thread, então métodos de escrita podem chamar uns aos outros.
+    """
+    depth = getattr(_local, "depth", 0)
+    if depth == 0:
+        if _async_holder_thread == threading.get_ident():
+            # Bloquear aqui travaria o event loop que segura o lock
+            raise RuntimeError(
+                "serialized_write chamado no event loop durante uma escrita "
+                "assíncrona; use async_serialized_write"
+            )
+        _write_lock.acquire()
+    _local.depth = depth + 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+        if _local.depth == 0:
+            _write_lock.release()
+
+def serialized(fn):
+    """
+    Decorator para métodos/funções que escrevem e fazem commit no banco.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with serialized_write():
+            return fn(*args, **kwargs)
+    return wrapper
+
+@asynccontextmanager
+async def async_serialized_write():
+    """
+    Mesmo lock de `serialized_write`, para código assíncrono. É reentrante
+    na mesma task. A espera pelo lock não trava o event loop nem prende
+    threads do executor padrão.
+
+    Enquanto uma corrotina segura o lock, o código síncrono do mesmo loop
+    não pode usar `serialized_write` (levanta RuntimeError em vez de travar).
+    """
+    global _async_holder, _async_holder_thread
+    task = asyncio.current_task()
+    if _async_holder is task:
+        yield
+        return
+
+    loop = asyncio.get_running_loop()
+    queue = _loop_queues.get(loop)
+    if queue is None:
+        queue = _loop_queues[loop] = asyncio.Lock()
+    async with queue:
+        if not _write_lock.acquire(blocking=False):
+            fut = loop.run_in_executor(_lock_waiter, _write_lock.acquire)
+            try:
+                await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                # A thread ainda vai conseguir o lock: devolve assim que conseguir
+                fut.add_done_callback(lambda _: _write_lock.release())
+                raise
+        _async_holder, _async_holder_thread = task, threading.get_ident()
+        try:
+            yield
+        finally:
+            _async_holder = _async_holder_thread = None
+            _write_lock.release()
+
+def async_serialized(fn):
+    """
+    Decorator para corrotinas que escrevem e fazem commit no banco.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        async with async_serialized_write():
+            return await fn(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,64 @@
+# backend/infrastructure/fts.py
+import re
+from sqlalchemy.engine import Connection
+
+# Índice FTS5 "external content": o texto continua só em `faqs`,
+# a tabela virtual guarda apenas o índice invertido.
+FAQ_FTS_TABLE = "faqs_fts"
+
+FAQ_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS faqs_fts USING fts5(
+        question, answer, excerpt,
+        content='faqs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS faqs_fts_ai AFTER INSERT ON faqs BEGIN
+        INSERT INTO faqs_fts(rowid, question, answer, excerpt)
+        VALUES (new.id, new.question, new.answer, new.excerpt);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS faqs_fts_ad AFTER DELETE ON faqs BEGIN
+        INSERT INTO faqs_fts(faqs_fts, rowid, question, answer, excerpt)
+        VALUES ('delete', old.id, old.question, old.answer, old.excerpt);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS faqs_fts_au AFTER UPDATE ON faqs BEGIN
+        INSERT INTO faqs_fts(faqs_fts, rowid, question, answer, excerpt)
+        VALUES ('delete', old.id, old.question, old.answer, old.excerpt);
+        INSERT INTO faqs_fts(rowid, question, answer, excerpt)
+        VALUES (new.id, new.question, new.answer, new.excerpt);
+    END
+    """,
+]
+
+def init_faq_fts(conn: Connection) -> None:
+    """
+    Cria o índice FTS5 das FAQs e os triggers que o mantêm sincronizado.
+    Na primeira criação, indexa as FAQs que já existem na tabela.
+    Roda dentro da transação de quem chama (a migration baseline).
+    """
+    existed = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (FAQ_FTS_TABLE,)
+    ).first() is not None
+    for ddl in FAQ_FTS_DDL:
+        conn.exec_driver_sql(ddl)
+    if not existed:
+        conn.exec_driver_sql(f"INSERT INTO {FAQ_FTS_TABLE}({FAQ_FTS_TABLE}) VALUES ('rebuild')")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def build_match_query(text: str) -> str:
+    """
+    Converte o texto livre do usuário numa expressão MATCH segura:
+    cada palavra vira um termo entre aspas com busca por prefixo,
+    combinados com AND implícito. Operadores FTS digitados pelo usuário
+    (NEAR, aspas, parênteses, *) são neutralizados.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    return " ".join(f'"{tok}"*' for tok in tokens)
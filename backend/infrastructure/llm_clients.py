@@ -0,0 +1,268 @@
+# backend/infrastructure/llm_clients.py
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from backend.infrastructure.config import settings
+
+# Espera máxima imposta a todos por um único Retry-After
+MAX_COOLDOWN = 60.0
+
+class ModelLimiter:
+    """
+    Semáforo compartilhado entre threads e o event loop: no máximo `limit`
+    chamadas em voo. A thread bloqueia em `acquire`; a corrotina espera
+    num future em `aacquire`, sem ocupar threads do executor. A vaga é
+    entregue direto ao próximo da fila (FIFO), sem disputa.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._free = limit
+        self._waiters: deque = deque()   # threading.Event ou (loop, future)
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._free > 0 and not self._waiters:
+                self._free -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free > 0 and not self._waiters:
+                self._free -= 1
+                return
+            fut = loop.create_future()
+            waiter = (loop, fut)
+            self._waiters.append(waiter)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = waiter in self._waiters
+                if queued:
+                    self._waiters.remove(waiter)
+            # Já recebeu a vaga (future resolvido) mas foi cancelado antes de usar: devolve.
+            # Se o future foi cancelado, quem entrega (_grant) repassa a vaga.
+            if not queued and fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def _grant(self, fut: asyncio.Future) -> None:
+        if fut.done():
+            self.release()
+        else:
+            fut.set_result(None)
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._free += 1
+                return
+            waiter = self._waiters.popleft()
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+        else:
+            loop, fut = waiter
+            loop.call_soon_threadsafe(self._grant, fut)
+
+class RateLimitGate:
+    """
+    Lembra o Retry-After do último 429 da API e faz todas as requisições
+    seguintes (de qualquer modelo e thread) esperarem até lá, em vez de
+    cada uma bater no limite e receber o seu próprio 429. O retry da
+    requisição que levou o 429 fica com o SDK da OpenAI, que também
+    respeita o Retry-After.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._until = 0.0
+
+    @staticmethod
+    def retry_after(response: httpx.Response) -> Optional[float]:
+        ms = response.headers.get("retry-after-ms")
+        if ms:
+            try:
+                return float(ms) / 1000
+            except ValueError:
+                pass
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+
+    def note(self, response: httpx.Response) -> None:
+        if response.status_code != 429:
+            return
+        delay = self.retry_after(response)
+        if delay is None or delay <= 0:
+            return
+        with self._lock:
+            self._until = max(self._until, time.monotonic() + min(delay, MAX_COOLDOWN))
+
+    def delay(self) -> float:
+        with self._lock:
+            return max(0.0, self._until - time.monotonic())
+
+class LLMClients:
+    """
+    Registro único dos clientes de LLM e embeddings do processo.
+
+    - Um httpx.Client e um httpx.AsyncClient compartilhados (keep-alive e
+      TLS reaproveitados entre chat, FAQ, quiz e indexação).
+    - Clientes ChatOpenAI/OpenAIEmbeddings criados uma vez por configuração.
+    - Timeout e retries (com backoff que respeita Retry-After) do SDK.
+    - `slot(model)`/`aslot(model)`: limite de chamadas em voo por modelo.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.gate = RateLimitGate()
+        self._http: Optional[httpx.Client] = None
+        self._ahttp: Optional[httpx.AsyncClient] = None
+        self._chats: Dict[Tuple, ChatOpenAI] = {}
+        self._embeddings: Dict[str, OpenAIEmbeddings] = {}
+        self._limiters: Dict[str, ModelLimiter] = {}
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+        )
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(settings.LLM_TIMEOUT, connect=10.0)
+
+    def http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._http is None:
+                gate = self.gate
+
+                def wait_gate(request):
+                    delay = gate.delay()
+                    if delay:
+                        time.sleep(delay)
+
+                self._http = httpx.Client(
+                    limits=self._limits(),
+                    timeout=self._timeout(),
+                    event_hooks={"request": [wait_gate], "response": [gate.note]},
+                )
+            return self._http
+
+    def http_async_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._ahttp is None:
+                gate = self.gate
+
+                async def wait_gate(request):
+                    delay = gate.delay()
+                    if delay:
+                        await asyncio.sleep(delay)
+
+                async def note(response):
+                    gate.note(response)
+
+                self._ahttp = httpx.AsyncClient(
+                    limits=self._limits(),
+                    timeout=self._timeout(),
+                    event_hooks={"request": [wait_gate], "response": [note]},
+                )
+            return self._ahttp
+
+    def chat(self, model: Optional[str] = None, streaming: bool = False) -> ChatOpenAI:
+        model = model or settings.CHAT_MODEL
+        key = (model, streaming)
+        with self._lock:
+            client = self._chats.get(key)
+        if client is None:
+            client = ChatOpenAI(
+                model=model,
+                base_url=settings.OPENAI_BASE_URL,
+                streaming=streaming,
+                timeout=settings.LLM_TIMEOUT,
+                max_retries=settings.LLM_MAX_RETRIES,
+                http_client=self.http_client(),
+                http_async_client=self.http_async_client(),
+            )
+            with self._lock:
+                client = self._chats.setdefault(key, client)
+        return client
+
+    def embeddings(self, model: Optional[str] = None) -> OpenAIEmbeddings:
+        model = model or settings.EMBEDDINGS_MODEL
+        with self._lock:
+            client = self._embeddings.get(model)
+        if client is None:
+            client = OpenAIEmbeddings(
+                model=model,
+                base_url=settings.OPENAI_BASE_URL,
+                timeout=settings.LLM_TIMEOUT,
+                max_retries=settings.LLM_MAX_RETRIES,
+                http_client=self.http_client(),
+                http_async_client=self.http_async_client(),
+            )
+            with self._lock:
+                client = self._embeddings.setdefault(model, client)
+        return client
+
+    def limiter(self, model: Optional[str]) -> ModelLimiter:
+        model = model or ""
+        with self._lock:
+            limiter = self._limiters.get(model)
+            if limiter is None:
+                limit = (
+                    settings.LLM_EMBEDDINGS_CONCURRENCY if model == settings.EMBEDDINGS_MODEL
+                    else settings.LLM_CHAT_CONCURRENCY
+                )
+                limiter = self._limiters[model] = ModelLimiter(limit)
+            return limiter
+
+    @contextmanager
+    def slot(self, model: Optional[str]):
+        """Ocupa uma vaga do modelo durante o bloco (código síncrono)."""
+        limiter = self.limiter(model)
+        limiter.acquire()
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    @asynccontextmanager
+    async def aslot(self, model: Optional[str]):
+        """Versão assíncrona de `slot`; a vaga é a mesma."""
+        limiter = self.limiter(model)
+        await limiter.aacquire()
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    async def aclose(self) -> None:
+        with self._lock:
+            http, ahttp = self._http, self._ahttp
+            self._http = self._ahttp = None
+            self._chats.clear()
+            self._embeddings.clear()
+        if ahttp is not None:
+            await ahttp.aclose()
+        if http is not None:
+            http.close()
+
+llm_clients = LLMClients()
@@ -0,0 +1,45 @@
+# backend/infrastructure/pagination.py
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+from backend.infrastructure.session import AsyncSessionLocal
+
+# Paginação por chave (keyset) na chave primária: a próxima página é
+# "id > último id visto", então o custo não cresce com a posição.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def keyset(stmt, id_column, after_id: Optional[int], limit: Optional[int]):
+    """Aplica o filtro `id > after_id`, a ordem por id e o limite (se houver)."""
+    if after_id is not None:
+        stmt = stmt.where(id_column > after_id)
+    stmt = stmt.order_by(id_column)
+    return stmt.limit(limit) if limit else stmt
+
+def set_next_cursor(response: Response, items: List[Dict[str, Any]], limit: int, key: str = "id") -> None:
+    """
+    Página cheia: o cliente pede a próxima com `after_id` igual ao valor
+    de X-Next-Cursor. Página incompleta: é a última, sem o header.
+    """
+    if len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(items[-1][key])
+
+def ndjson_stream(stmt, to_dict: Callable[[Any], Dict[str, Any]] = lambda row: dict(row._mapping)) -> StreamingResponse:
+    """
+    Resposta NDJSON (um objeto por linha) lida de um cursor no servidor em
+    lotes de STREAM_BATCH_SIZE: a memória não depende do tamanho da tabela.
+    Usa uma sessão própria, porque o stream continua depois que o handler retorna.
+    """
+    async def gen():
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+            async for partition in result.partitions():
+                yield "".join(json.dumps(to_dict(row), ensure_ascii=False) + "\n" for row in partition)
+
+    return StreamingResponse(gen(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,266 @@
+# backend/infrastructure/profiling.py
+import asyncio
+import cProfile
+import json
+import marshal
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.infrastructure.config import settings
+
+# Perfil sob demanda de requisições, ligado por header ou por amostragem.
+#
+# - "sample": uma thread lê as pilhas de todas as threads a cada
+#   PROFILE_SAMPLE_INTERVAL_MS. Pega também o threadpool onde rodam os
+#   endpoints síncronos (/faq/generate, /quiz/generate). Exporta speedscope,
+#   com um perfil por thread.
+# - "cprofile": cProfile determinístico da thread do event loop (handlers
+#   async). Exporta pstats (abre com `python -m pstats` ou snakeviz).
+#
+# Só um perfil roda por vez; requisições que chegam durante um perfil
+# seguem sem ser perfiladas.
+#
+# No modo "sample", pilhas de threads ociosas (threadpool esperando
+# trabalho, event loop no select, workers parados no queue.get) são
+# descartadas: a ponta da pilha é uma espera conhecida e nenhum frame é
+# do backend. Uma thread esperando dentro do nosso código (vaga do
+# modelo, lock de escrita) continua contando.
+
+MODES = ("sample", "cprofile")
+PROFILE_HEADER = b"x-profile"
+SUMMARY_SIZE = 25
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+# (arquivo, função) na ponta de pilhas de threads paradas esperando
+IDLE_WAITS = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),        # concurrent.futures (SimpleQueue.get é C)
+    ("socket.py", "accept"),
+}
+
+def is_idle(codes) -> bool:
+    """A pilha (da raiz à ponta) é de uma thread parada numa espera, fora do código do backend."""
+    leaf = codes[-1]
+    if (os.path.basename(leaf.co_filename), leaf.co_name) not in IDLE_WAITS:
+        return False
+    return not any(code.co_filename.startswith(BACKEND_DIR) for code in codes)
+
+class SamplingProfiler:
+    """
+    Amostrador de pilhas de todas as threads (exceto a dele) via
+    sys._current_frames. Amostras ociosas (`is_idle`) só são contadas.
+    """
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._frames: Dict[Tuple[str, str, int], int] = {}
+        self._samples: Dict[int, List[List[int]]] = {}
+        self.idle_samples = 0
+        self.started = self.elapsed = 0.0
+
+    def _frame_index(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        idx = self._frames.get(key)
+        if idx is None:
+            idx = self._frames[key] = len(self._frames)
+        return idx
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                codes.reverse()
+                if is_idle(codes):
+                    self.idle_samples += 1
+                    continue
+                self._samples.setdefault(tid, []).append([self._frame_index(c) for c in codes])
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Sinaliza a thread de amostragem; `export` espera ela terminar."""
+        self._stop.set()
+        self.elapsed = time.perf_counter() - self.started
+
+    def export(self, name: str) -> Tuple[bytes, List[Dict[str, Any]]]:
+        """
+        (arquivo speedscope, funções com mais amostras inclusivas). As
+        frações são sobre as amostras de trabalho, sem as ociosas.
+        """
+        self._thread.join()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        frames = [{"name": n, "file": f, "line": line} for (n, f, line) in self._frames]
+        profiles = []
+        inclusive: Counter = Counter()
+        total = 0
+        for tid, samples in self._samples.items():
+            total += len(samples)
+            for stack in samples:
+                inclusive.update(set(stack))
+            profiles.append({
+                "type": "sampled",
+                "name": names.get(tid, str(tid)),
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": len(samples) * self.interval,
+                "samples": samples,
+                "weights": [self.interval] * len(samples),
+            })
+        doc = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "backend.infrastructure.profiling",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+        summary = [
+            {**frames[idx], "samples": n, "fraction": round(n / total, 4) if total else 0.0}
+            for idx, n in inclusive.most_common(SUMMARY_SIZE)
+        ]
+        return json.dumps(doc).encode("utf-8"), summary
+
+class CProfileProfiler:
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def export(self, name: str) -> Tuple[bytes, List[Dict[str, Any]]]:
+        """(conteúdo de um arquivo .pstats, funções com maior tempo acumulado)."""
+        stats = pstats.Stats(self._profile)
+        rows = sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:SUMMARY_SIZE]
+        summary = [
+            {"name": func, "file": file, "line": line, "calls": nc, "tottime": round(tt, 6), "cumtime": round(ct, 6)}
+            for (file, line, func), (_cc, nc, tt, ct, _callers) in rows
+        ]
+        # Mesmo formato que Stats.dump_stats grava em disco
+        return marshal.dumps(stats.stats), summary
+
+class ProfileStore:
+    """Últimos `max_profiles` perfis em memória (os mais antigos saem primeiro)."""
+    def __init__(self, max_profiles: int):
+        self._lock = threading.Lock()
+        self._profiles: deque = deque(maxlen=max_profiles)
+
+    def add(self, profile: Dict[str, Any]) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self, route: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            {k: v for k, v in p.items() if k not in ("data", "summary")}
+            for p in reversed(profiles)
+            if route is None or p["route"] == route
+        ]
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for p in self._profiles:
+                if p["id"] == profile_id:
+                    return p
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+profile_store = ProfileStore(max_profiles=settings.PROFILE_STORE_SIZE)
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila a requisição inteira, incluindo respostas
+    em streaming (o perfil só fecha quando o último pedaço do corpo sai).
+
+    Liga quando PROFILING_ENABLED e: o header `X-Profile: sample|cprofile`
+    está presente, ou o sorteio com PROFILE_SAMPLE_RATE cai (modo "sample").
+    """
+    def __init__(self, app, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+        self._busy = threading.Lock()
+
+    def _mode(self, scope) -> Optional[str]:
+        if not settings.PROFILING_ENABLED:
+            return None
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                value = value.decode("latin-1").strip().lower()
+                return value if value in MODES else "sample"
+        if settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        mode = self._mode(scope) if scope["type"] == "http" else None
+        if mode is None or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profiler = (
+            CProfileProfiler() if mode == "cprofile"
+            else SamplingProfiler(settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+        )
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Barato e na thread que ligou o perfil (o cProfile exige)
+            profiler.stop()
+            duration = time.perf_counter() - started
+            # O roteador grava a rota casada no scope; sem ela (404), usa o path
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            try:
+                # Esperar o amostrador e serializar o perfil fica fora do event loop
+                data, summary = await asyncio.to_thread(profiler.export, f"{scope['method']} {route}")
+            finally:
+                self._busy.release()
+            self.store.add({
+                "id": uuid.uuid4().hex[:12],
+                "route": route,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "mode": mode,
+                "duration_ms": round(duration * 1000, 2),
+                "created_at": datetime.now(timezone.utc),
+                "format": "pstats" if mode == "cprofile" else "speedscope",
+                "summary": summary,
+                "data": data,
+            })
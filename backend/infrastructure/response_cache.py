@@ -0,0 +1,129 @@
+# backend/infrastructure/response_cache.py
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+
+from backend.infrastructure.config import settings
+
+# Headers da resposta original que são guardados junto com o corpo
+_SKIPPED_HEADERS = {"content-length", "content-type"}
+
+class TableGenerations:
+    """
+    Contador de geração por tabela, incrementado pelos métodos de escrita
+    dos repositórios. Uma leitura em cache é válida enquanto as gerações
+    das tabelas de que ela depende não mudarem.
+
+    Os contadores vivem no processo; o `nonce` muda a cada inicialização,
+    para que um ETag emitido antes de um restart nunca seja reaproveitado.
+    """
+    def __init__(self):
+        self.nonce = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._gens: Dict[str, int] = {}
+
+    def bump(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self._gens[table] = self._gens.get(table, 0) + 1
+
+    def current(self, table: str) -> int:
+        with self._lock:
+            return self._gens.get(table, 0)
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._gens.get(t, 0) for t in tables)
+
+table_generations = TableGenerations()
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+class ResponseCache:
+    """
+    Cache (LRU) das respostas JSON dos endpoints de leitura, com ETag.
+
+    A chave é a rota mais os parâmetros de query; o ETag sai da chave, das
+    gerações das tabelas envolvidas e do nonce do processo. Por isso um
+    `If-None-Match` igual ao ETag atual responde 304 sem ler o banco e sem
+    nem olhar a entrada em cache. Com vários workers, cada processo tem o
+    seu cache e só enxerga as escritas feitas por ele.
+    """
+    def __init__(self, max_entries: int, generations: TableGenerations):
+        self.max_entries = max_entries
+        self.generations = generations
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[str, bytes, Dict[str, str]]]" = OrderedDict()
+
+    def etag(self, key: Tuple, tables: Tuple[str, ...], gens: Tuple[int, ...]) -> str:
+        raw = repr((self.generations.nonce, key, tables, gens)).encode()
+        return '"' + hashlib.blake2b(raw, digest_size=12).hexdigest() + '"'
+
+    async def respond(
+        self,
+        request: Request,
+        response: Response,
+        tables: Tuple[str, ...],
+        model: Any,
+        build: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """
+        Responde a leitura a partir do cache quando possível.
+
+        Args:
+            request (Request): requisição; rota, query e If-None-Match.
+            response (Response): resposta injetada no handler; headers que
+                `build` colocar nela (ex.: X-Next-Cursor) são guardados também.
+            tables (Tuple[str, ...]): tabelas das quais o resultado depende.
+            model (Any): response_model do endpoint, aplicado antes de serializar.
+            build (Callable): corrotina que consulta o banco e devolve os dados.
+
+        Returns:
+            Response: 304 se o cliente já tem a versão atual, senão o JSON.
+        """
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+        gens = self.generations.snapshot(tables)
+        etag = self.etag(key, tables, gens)
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if _matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == etag:
+                self._entries.move_to_end(key)
+            else:
+                entry = None
+
+        if entry is None:
+            data = await build()
+            body = json.dumps(jsonable_encoder(parse_obj_as(model, data)), ensure_ascii=False).encode("utf-8")
+            headers = {k: v for k, v in response.headers.items() if k not in _SKIPPED_HEADERS}
+            entry = (etag, body, headers)
+            # Se houve escrita durante a consulta, o resultado pode já estar velho: não guarda
+            if self.generations.snapshot(tables) == gens:
+                with self._lock:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+
+        _, body, headers = entry
+        return Response(content=body, media_type="application/json", headers={**headers, **cache_headers})
+
+response_cache = ResponseCache(max_entries=settings.RESPONSE_CACHE_SIZE, generations=table_generations)
@@ -1,16 +1,77 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 
+from backend.infrastructure.config import settings
+
 # Define o caminho para o banco SQLite (no diretório backend/db/usage.db)
 db_path = os.path.join(os.path.dirname(__file__), "../db/usage.db")
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{db_path}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{db_path}"
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Ajustes aplicados a cada conexão nova:
+      - WAL: leitores não bloqueiam o escritor e vice-versa;
+      - synchronous=NORMAL: seguro com WAL e bem menos fsyncs por commit;
+      - cache/mmap maiores para leituras quentes;
+      - busy_timeout: espera o lock em vez de falhar com "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_BYTES}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def create_sqlite_engine(url: str, tuned: bool = True) -> Engine:
+    """
+    Cria um engine SQLite com pool explícito e, se `tuned`, com os PRAGMAs
+    de concorrência aplicados em toda conexão. `tuned=False` reproduz a
+    configuração padrão (usado no benchmark de comparação).
+    """
+    if not tuned:
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    engine = create_engine(
+        url,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+        pool_size=settings.SQLITE_POOL_SIZE,
+        max_overflow=settings.SQLITE_MAX_OVERFLOW,
+        pool_timeout=settings.SQLITE_POOL_TIMEOUT,
+    )
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+def create_async_sqlite_engine(url: str, tuned: bool = True) -> AsyncEngine:
+    """
+    Versão assíncrona (aiosqlite) de `create_sqlite_engine`, com o mesmo
+    pool e os mesmos PRAGMAs. Usada pelos repositórios Async* nos handlers
+    `async def`, para que o I/O do banco não bloqueie o event loop.
+    """
+    if not tuned:
+        return create_async_engine(url)
+
+    engine = create_async_engine(
+        url,
+        connect_args={"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        pool_size=settings.SQLITE_POOL_SIZE,
+        max_overflow=settings.SQLITE_MAX_OVERFLOW,
+        pool_timeout=settings.SQLITE_POOL_TIMEOUT,
+    )
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    return engine
 
 # Cria o engine de conexão com SQLite
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  
-)
+engine = create_sqlite_engine(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_sqlite_engine(ASYNC_DATABASE_URL)
 
 # Cria uma classe base para os modelos ORM
 Base = declarative_base()
@@ -22,6 +83,16 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Sessões assíncronas; expire_on_commit=False evita lazy-load implícito
+# (que não é permitido no modo async) ao ler objetos depois do commit
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Função auxiliar para obter sessão no FastAPI Dependency
 def get_db():
     """
@@ -32,3 +103,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """
+    Versão assíncrona de `get_db`, para handlers `async def`.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
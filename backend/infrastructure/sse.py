@@ -0,0 +1,24 @@
+# backend/infrastructure/sse.py
+import json
+from typing import Any, Optional
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Cabeçalhos que evitam buffering em proxies (nginx) e caches intermediários
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """
+    Formata um evento Server-Sent Events. `data` é serializado em JSON
+    numa única linha, então o cliente pode fazer json.loads direto.
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
@@ -1,19 +1,35 @@
 # backend/infra/vectorstore.py
+import os
+import threading
+
 from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
 from backend.infrastructure.config     import settings
+from backend.infrastructure.llm_clients import llm_clients
 from backend.services.docs_loader import load_and_index
 
-import os
+_lock = threading.Lock()
+_vs = None
 
 def get_vectorstore_client():
-    embeddings = OpenAIEmbeddings(model=settings.EMBEDDINGS_MODEL)
-
-    if os.path.exists(settings.VS_PATH):
-        return FAISS.load_local(
-            settings.VS_PATH,
-            embeddings,
-            allow_dangerous_deserialization=True
-        )
+    """
+    Vectorstore do processo, carregado do disco (ou indexado) só na primeira
+    chamada; os embeddings vêm do registro compartilhado de clientes.
+    """
+    global _vs
+    with _lock:
+        if _vs is None:
+            if os.path.exists(settings.VS_PATH):
+                _vs = FAISS.load_local(
+                    settings.VS_PATH,
+                    llm_clients.embeddings(),
+                    allow_dangerous_deserialization=True
+                )
+            else:
+                _vs = load_and_index()
+        return _vs
 
-    return load_and_index()
+def reset_vectorstore_client() -> None:
+    """Descarta o vectorstore em memória; a próxima chamada recarrega do disco."""
+    global _vs
+    with _lock:
+        _vs = None
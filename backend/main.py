@@ -1,37 +1,62 @@
 # backend/api/main.py
-import tiktoken
-from fastapi import FastAPI, Request, Depends
+import logging
+import time
+import weakref
+from typing import Optional
+from fastapi import FastAPI, Request, Depends, Response
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.background import BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
-from backend.infrastructure.session import engine, Base, get_db
+from backend.infrastructure.session import engine, async_engine, get_async_db, AsyncSessionLocal
 from backend.infrastructure.vectorstore import get_vectorstore_client
 from backend.infrastructure.config import settings
-from backend.services.db_logger import new_session_id, log_message
+from backend.infrastructure.profiling import ProfilingMiddleware
+from backend.infrastructure.llm_clients import llm_clients
+from backend.infrastructure.sse import format_sse, SSE_MEDIA_TYPE, SSE_HEADERS
+from backend.infrastructure.admission import (
+    RateLimited, StreamTicket, too_many_requests, client_ip, chat_stream_gate, check_token_budget, charge_tokens,
+)
+from backend.infrastructure.metrics import (
+    registry, PROMETHEUS_CONTENT_TYPE, CHAT_STAGE_SECONDS, CHAT_TTFT_SECONDS,
+    CHAT_STREAM_SECONDS, CHAT_TOKENS_PER_SECOND, CHAT_ANSWERS, LLM_CALLS,
+)
+from backend.services.db_logger import new_session_id, alog_message, alog_faq_hit, afaq_hit_stats
+from backend.services.faq_index import faq_index
+from backend.services.token_counter import count_tokens
+from backend.services.chat_coalescer import chat_coalescer
 
 from backend.models.faq import FAQ
-from backend.models.message import Message
+from backend.models.message import Message, FAQHit
 from backend.models.email import Email
+from backend.models.job import Job
+from backend.models.question_bank import BankQuestion, ThemeDemand
+from backend.models.usage import UsageHourly, UsageDaily, UsageSession, UsageModel
 
 from backend.routers.faq_router import router as faq_router
 from backend.routers.email_router import router as email_router
 from backend.routers.quiz_router import router as quiz_router
+from backend.routers.job_router import router as job_router
+from backend.routers.usage_router import router as usage_router
+from backend.routers.archive_router import router as archive_router
+from backend.routers.profile_router import router as profile_router
+from backend.services.job_service import job_manager
+from backend.services.question_bank_service import bank_refiller
+from backend.services.retention_service import retention_worker
+from backend.migrations.runner import migrate, pending_migrations
 
-# Cria tabelas no startup
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Prova IA Generativa – Backend Starter", version="0.0.1")
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_methods=["POST", "GET"],
+    allow_methods=["POST", "GET", "DELETE"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware)
 
 from contextlib import asynccontextmanager
 @asynccontextmanager
@@ -40,89 +65,268 @@ async def lifespan(app: FastAPI):
     # from backend.services.docs_loader import load_and_index
     # load_and_index()
     get_vectorstore_client
+    # O esquema é migrado no deploy (python -m backend.migrations.runner);
+    # AUTO_MIGRATE=true faz isso aqui, útil em desenvolvimento
+    if settings.AUTO_MIGRATE:
+        migrate(engine)
+    else:
+        pending = pending_migrations(engine)
+        if pending:
+            logger.warning(
+                "Banco com %s migration(s) pendente(s); rode `python -m backend.migrations.runner`",
+                len(pending)
+            )
+    job_manager.start()
+    bank_refiller.start()
+    retention_worker.start()
     yield
+    retention_worker.stop()
+    bank_refiller.stop()
+    job_manager.shutdown()
+    await llm_clients.aclose()
+    await async_engine.dispose()
 
 app.router.lifespan_context = lifespan
 
-# Função para contar tokens
-def count_tokens(text: str, model: str = "gpt-4"):
-    try:
-        enc = tiktoken.encoding_for_model(model)
-    except KeyError:
-        enc = tiktoken.get_encoding("cl100k_base")
-    return len(enc.encode(text))
+SYSTEM_PROMPT = "Você é um assistente que responde com base em documentações técnicas."
+
+# Tamanho do trecho de cada fonte enviado no evento `sources`
+SOURCE_EXCERPT_CHARS = 300
+
+def build_prompt(context: str, question: str) -> str:
+    return (
+        "Use os trechos abaixo para responder à pergunta."
+        "Inclua sempre o trecho de origem.\n\n"
+        f"{context}\n\nPergunta: {question}\nResposta:"
+    )
+
+async def faq_answer_response(db: AsyncSession, session_id: str, user_q: str, faq: dict) -> StreamingResponse:
+    """
+    Responde a pergunta com a FAQ encontrada, sem retrieval nem LLM,
+    registrando no log de uso a economia estimada de tokens.
+    """
+    answer = f"{faq['answer']}\n\n**Fonte:** {faq['excerpt']}  \n{faq['link'] or ''}"
+
+    # Estimativa conservadora: o prompt sem o contexto recuperado e a resposta armazenada
+    saved_prompt = count_tokens(SYSTEM_PROMPT + build_prompt("", user_q), model=settings.CHAT_MODEL)
+    saved_completion = count_tokens(answer, model=settings.CHAT_MODEL)
+
+    await alog_message(db, session_id, role="user", content=user_q, prompt_tokens=0, completion_tokens=0, model="faq")
+    await alog_message(db, session_id, role="assistant", content=answer, prompt_tokens=0, completion_tokens=0, model="faq")
+    await alog_faq_hit(
+        db,
+        session_id,
+        faq_id=faq["id"],
+        score=faq["score"],
+        saved_prompt_tokens=saved_prompt,
+        saved_completion_tokens=saved_completion,
+    )
+    CHAT_ANSWERS.inc(source="faq")
+    events = [
+        format_sse({"answer_source": "faq", "session_id": session_id, "sources": [
+            {"faq_id": faq["id"], "source": faq["link"], "excerpt": faq["excerpt"]},
+        ]}, event="sources"),
+        format_sse({"text": answer}, event="token"),
+        format_sse({"prompt_tokens": 0, "completion_tokens": 0, "model": "faq"}, event="usage"),
+        format_sse({"session_id": session_id}, event="done"),
+    ]
+    return StreamingResponse(iter(events), media_type=SSE_MEDIA_TYPE, headers={**SSE_HEADERS, "X-Answer-Source": "faq"})
 
 @app.post("/chat/stream")
 async def chat_stream(
     request: Request,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
+    """
+    Responde uma pergunta sobre a documentação em Server-Sent Events.
+
+    Eventos, nesta ordem: `sources` (origem da resposta e trechos usados
+    como contexto), `token` (um por pedaço da resposta, `{"text": ...}`),
+    `usage` (tokens de prompt e de resposta cobrados) e `done`. Se o LLM
+    falhar no meio, vem `error` no lugar de `usage`/`done`; o texto já
+    enviado fica como está. Sessão ou IP sem saldo de tokens e servidor
+    lotado recebem 429 com Retry-After antes do stream começar.
+    """
     payload = await request.json()
     user_q = payload.get("question", "")
-    session_id = payload.get("session_id") or new_session_id()
+    client_session_id = payload.get("session_id")
+    session_id = client_session_id or new_session_id()
 
-    vs = get_vectorstore_client()
-    docs = vs.as_retriever().invoke(user_q)
-    context = "\n\n".join(d.page_content for d in docs)
+    # Atalho: pergunta que já tem resposta curada nas FAQs não passa pelo LLM
+    with CHAT_STAGE_SECONDS.time(stage="faq_lookup"):
+        faq = await faq_index.alookup(db, user_q)
+    if faq:
+        return await faq_answer_response(db, session_id, user_q, faq)
 
-    prompt = (
-        "Use os trechos abaixo para responder à pergunta."
-        "Inclua sempre o trecho de origem.\n\n"
-        f"{context}\n\nPergunta: {user_q}\nResposta:"
-    )
+    # Admissão: sessão/IP sem saldo de tokens e servidor lotado recebem 429 antes de qualquer chamada ao LLM.
+    # Sem session_id do cliente, só o bucket do IP vale (um id novo a cada
+    # requisição seria um bucket cheio a cada vez)
+    ip = client_ip(request)
+    try:
+        check_token_budget(client_session_id, ip)
+        ticket = await chat_stream_gate.admit()
+    except RateLimited as e:
+        raise too_many_requests(e)
+
+    try:
+        response = await _llm_answer_response(db, session_id, client_session_id, ip, user_q, ticket)
+    except BaseException:
+        ticket.release()
+        raise
+    # Rede de segurança: se o corpo nunca chegar a ser lido, a vaga volta quando ele for coletado
+    weakref.finalize(response.body_iterator, ticket.release)
+    return response
+
+async def _llm_answer_response(
+    db: AsyncSession,
+    session_id: str,
+    client_session_id: Optional[str],
+    ip: str,
+    user_q: str,
+    ticket: StreamTicket,
+) -> StreamingResponse:
+    """Retrieval, prompt e stream do LLM (ou carona num stream igual em andamento)."""
+    with CHAT_STAGE_SECONDS.time(stage="vectorstore_load"):
+        vs = get_vectorstore_client()
+    # Retrieval em duas etapas (embedding da pergunta e busca no FAISS) para medir cada uma
+    with CHAT_STAGE_SECONDS.time(stage="embedding"):
+        async with llm_clients.aslot(settings.EMBEDDINGS_MODEL):
+            embedding = await vs.embeddings.aembed_query(user_q)
+    LLM_CALLS.inc(endpoint="chat", kind="embedding")
+    with CHAT_STAGE_SECONDS.time(stage="vector_search"):
+        docs = await vs.asimilarity_search_by_vector(embedding)
+
+    with CHAT_STAGE_SECONDS.time(stage="prompt_build"):
+        context = "\n\n".join(d.page_content for d in docs)
+        prompt = build_prompt(context, user_q)
+        # Contagem dos tokens do prompt
+        prompt_tokens = count_tokens(prompt, model=settings.CHAT_MODEL)
+
+    llm = llm_clients.chat(streaming=True)
+
+    async def upstream():
+        collected = ""
+        started = time.perf_counter()
+        first_token_at = None
+
+        LLM_CALLS.inc(endpoint="chat", kind="chat")
+        # TTFT inclui a espera pela vaga do modelo, que é o que o aluno sente
+        async with llm_clients.aslot(settings.CHAT_MODEL):
+            stream = llm.astream([
+                SystemMessage(content=SYSTEM_PROMPT),
+                HumanMessage(content=prompt),
+            ])
 
-    # Contagem dos tokens do prompt
-    prompt_tokens = count_tokens(prompt, model=settings.CHAT_MODEL)
+            async for chunk in stream:
+                content = chunk.content
+                if first_token_at is None and content:
+                    first_token_at = time.perf_counter()
+                    CHAT_TTFT_SECONDS.observe(first_token_at - started)
+                collected += content
+                yield content
+
+        finished = time.perf_counter()
+        CHAT_STREAM_SECONDS.observe(finished - started)
+        if first_token_at is not None and finished > first_token_at:
+            tokens = count_tokens(collected, model=settings.CHAT_MODEL)
+            CHAT_TOKENS_PER_SECOND.observe(tokens / (finished - first_token_at))
+
+    # Mesma pergunta com o mesmo contexto já sendo respondida: acompanha aquele stream
+    if settings.CHAT_COALESCING_ENABLED:
+        chunks, leader = chat_coalescer.join(chat_coalescer.key(user_q, context), upstream)
+    else:
+        chunks, leader = upstream(), True
+    # Quem pega carona não gasta tokens: fica registrado com o modelo "coalesced"
+    log_model = settings.CHAT_MODEL if leader else "coalesced"
+
+    if leader:
+        charge_tokens(client_session_id, ip, prompt_tokens)
 
     # Loga pergunta do usuário
-    log_message(
+    await alog_message(
         db,
         session_id,
         role="user",
         content=user_q,
-        prompt_tokens=prompt_tokens,
-        completion_tokens=0
+        prompt_tokens=prompt_tokens if leader else 0,
+        completion_tokens=0,
+        model=log_model
     )
 
-    llm = ChatOpenAI(
-        model=settings.CHAT_MODEL,
-        streaming=True,
-    )
+    answer_source = "llm" if leader else "coalesced"
+    sources = [
+        {"source": d.metadata.get("source"), "excerpt": d.page_content[:SOURCE_EXCERPT_CHARS]}
+        for d in docs
+    ]
 
-    def gen():
+    async def gen():
         collected = ""
+        failed = False
+        yield format_sse({"answer_source": answer_source, "session_id": session_id, "sources": sources}, event="sources")
+        try:
+            async for content in chunks:
+                if not content:
+                    continue
+                collected += content
+                yield format_sse({"text": content}, event="token")
+        except Exception:
+            logger.exception("Falha no stream do LLM (sessão %s)", session_id)
+            failed = True
+        finally:
+            ticket.release()
+            # Contagem dos tokens da resposta, debitados do saldo da sessão e do
+            # IP mesmo se o cliente desistir no meio do stream
+            completion_tokens = count_tokens(collected, model=settings.CHAT_MODEL) if leader else 0
+            charge_tokens(client_session_id, ip, completion_tokens)
 
-        stream = llm.stream([
-            SystemMessage(content="Você é um assistente que responde com base em documentações técnicas."),
-            HumanMessage(content=prompt),
-        ])
-
-        for chunk in stream:
-            content = chunk.content
-            collected += content
-            yield content
-
-        # Contagem dos tokens da resposta
-        completion_tokens = count_tokens(collected, model=settings.CHAT_MODEL)
-
-        # Loga mensagem da IA junto com tokens
-        background_tasks.add_task(
-            log_message,
-            db,
-            session_id,
-            role="assistant",
-            content=collected,
-            prompt_tokens=0,
-            completion_tokens=completion_tokens,
+        if failed:
+            yield format_sse({"detail": "Falha ao gerar a resposta; tente novamente"}, event="error")
+            return
+        yield format_sse(
+            {"prompt_tokens": prompt_tokens if leader else 0, "completion_tokens": completion_tokens, "model": log_model},
+            event="usage",
         )
 
-    return StreamingResponse(gen(), media_type="text/plain")
+        CHAT_ANSWERS.inc(source=answer_source)
+
+        # Loga mensagem da IA junto com tokens (sessão própria: a do
+        # request pode já ter sido fechada quando o stream termina)
+        async with AsyncSessionLocal() as log_db:
+            await alog_message(
+                log_db,
+                session_id,
+                role="assistant",
+                content=collected,
+                prompt_tokens=0,
+                completion_tokens=completion_tokens,
+                model=log_model,
+            )
+        yield format_sse({"session_id": session_id}, event="done")
+
+    return StreamingResponse(
+        gen(),
+        media_type=SSE_MEDIA_TYPE,
+        headers={**SSE_HEADERS, "X-Answer-Source": answer_source},
+    )
 
 @app.get("/health", tags=["Utils"])
 def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", tags=["Utils"])
+def metrics():
+    """Métricas do processo (latência por etapa do chat, TTFT, chamadas ao LLM) no formato do Prometheus."""
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.get("/chat/faq-stats", tags=["Utils"])
+async def chat_faq_stats(db: AsyncSession = Depends(get_async_db)):
+    """Taxa de perguntas do chat respondidas por FAQ e tokens economizados."""
+    return await afaq_hit_stats(db)
+
 app.include_router(email_router)
 app.include_router(faq_router)
-app.include_router(quiz_router)
\ No newline at end of file
+app.include_router(quiz_router)
+app.include_router(job_router)
+app.include_router(usage_router)
+app.include_router(archive_router)
+app.include_router(profile_router)
\ No newline at end of file
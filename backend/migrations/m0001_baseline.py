@@ -0,0 +1,220 @@
+# backend/migrations/m0001_baseline.py
+"""
+Esquema consolidado no momento em que as migrations foram introduzidas
+(o que o `create_all` gerava até então); as mudanças seguintes vêm nas
+próximas migrations. Tudo é IF NOT EXISTS: em bancos já criados pelo
+`create_all` esta migration só registra a versão.
+"""
+from backend.infrastructure.fts import init_faq_fts
+
+VERSION = 1
+DESCRIPTION = "baseline do esquema"
+
+DDL = [
+    # Chat
+    """
+    CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER NOT NULL,
+        session_id VARCHAR NOT NULL,
+        role VARCHAR NOT NULL,
+        content TEXT NOT NULL,
+        timestamp DATETIME NOT NULL,
+        prompt_tokens INTEGER NOT NULL,
+        completion_tokens INTEGER NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_messages_id ON messages (id)",
+    "CREATE INDEX IF NOT EXISTS ix_messages_session_id ON messages (session_id)",
+    """
+    CREATE TABLE IF NOT EXISTS faq_hits (
+        id INTEGER NOT NULL,
+        session_id VARCHAR NOT NULL,
+        faq_id INTEGER NOT NULL,
+        score FLOAT NOT NULL,
+        timestamp DATETIME NOT NULL,
+        saved_prompt_tokens INTEGER NOT NULL,
+        saved_completion_tokens INTEGER NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_faq_hits_id ON faq_hits (id)",
+    "CREATE INDEX IF NOT EXISTS ix_faq_hits_session_id ON faq_hits (session_id)",
+
+    # E-mails e FAQs
+    """
+    CREATE TABLE IF NOT EXISTS emails (
+        id INTEGER NOT NULL,
+        sender VARCHAR(255) NOT NULL,
+        subject VARCHAR(255) NOT NULL,
+        body TEXT NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_emails_id ON emails (id)",
+    """
+    CREATE TABLE IF NOT EXISTS faqs (
+        id INTEGER NOT NULL,
+        question VARCHAR,
+        answer TEXT NOT NULL,
+        excerpt TEXT NOT NULL,
+        link VARCHAR,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_faqs_id ON faqs (id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_faqs_question ON faqs (question)",
+
+    # Quizzes
+    """
+    CREATE TABLE IF NOT EXISTS quizzes (
+        id INTEGER NOT NULL,
+        theme VARCHAR NOT NULL,
+        n_questions INTEGER NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_quizzes_id ON quizzes (id)",
+    """
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER NOT NULL,
+        quiz_id INTEGER NOT NULL,
+        prompt TEXT NOT NULL,
+        correct_answer VARCHAR(1) NOT NULL,
+        explanation TEXT NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(quiz_id) REFERENCES quizzes (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_questions_id ON questions (id)",
+    """
+    CREATE TABLE IF NOT EXISTS options (
+        id INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        letter VARCHAR(1) NOT NULL,
+        text TEXT NOT NULL,
+        is_correct BOOLEAN,
+        PRIMARY KEY (id),
+        FOREIGN KEY(question_id) REFERENCES questions (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_options_id ON options (id)",
+    """
+    CREATE TABLE IF NOT EXISTS answers (
+        id INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        given_answer VARCHAR(1) NOT NULL,
+        text TEXT NOT NULL,
+        is_correct BOOLEAN NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(question_id) REFERENCES questions (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_answers_id ON answers (id)",
+    """
+    CREATE TABLE IF NOT EXISTS quiz_attempts (
+        id INTEGER NOT NULL,
+        quiz_id INTEGER NOT NULL,
+        n_answered INTEGER NOT NULL,
+        n_correct INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(quiz_id) REFERENCES quizzes (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_quiz_attempts_id ON quiz_attempts (id)",
+    """
+    CREATE TABLE IF NOT EXISTS attempt_answers (
+        id INTEGER NOT NULL,
+        attempt_id INTEGER,
+        quiz_id INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        given_answer VARCHAR(1) NOT NULL,
+        is_correct BOOLEAN NOT NULL,
+        time_spent_ms INTEGER,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(attempt_id) REFERENCES quiz_attempts (id),
+        FOREIGN KEY(quiz_id) REFERENCES quizzes (id),
+        FOREIGN KEY(question_id) REFERENCES questions (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_attempt_answers_id ON attempt_answers (id)",
+    """
+    CREATE TABLE IF NOT EXISTS question_stats (
+        question_id INTEGER NOT NULL,
+        quiz_id INTEGER NOT NULL,
+        attempts INTEGER NOT NULL,
+        correct INTEGER NOT NULL,
+        timed_attempts INTEGER NOT NULL,
+        total_time_ms INTEGER NOT NULL,
+        PRIMARY KEY (question_id),
+        FOREIGN KEY(question_id) REFERENCES questions (id),
+        FOREIGN KEY(quiz_id) REFERENCES quizzes (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_question_stats_quiz_id ON question_stats (quiz_id)",
+    """
+    CREATE TABLE IF NOT EXISTS theme_stats (
+        theme_key VARCHAR NOT NULL,
+        theme VARCHAR NOT NULL,
+        attempts INTEGER NOT NULL,
+        correct INTEGER NOT NULL,
+        timed_attempts INTEGER NOT NULL,
+        total_time_ms INTEGER NOT NULL,
+        PRIMARY KEY (theme_key)
+    )
+    """,
+
+    # Banco de perguntas
+    """
+    CREATE TABLE IF NOT EXISTS question_bank (
+        id INTEGER NOT NULL,
+        theme_key VARCHAR NOT NULL,
+        prompt_key VARCHAR NOT NULL,
+        prompt TEXT NOT NULL,
+        explanation TEXT NOT NULL,
+        correct_answer VARCHAR(1) NOT NULL,
+        alternatives TEXT NOT NULL,
+        times_served INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (theme_key, prompt_key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_question_bank_id ON question_bank (id)",
+    "CREATE INDEX IF NOT EXISTS ix_question_bank_theme_key ON question_bank (theme_key)",
+    """
+    CREATE TABLE IF NOT EXISTS theme_demand (
+        theme_key VARCHAR NOT NULL,
+        theme VARCHAR NOT NULL,
+        requests INTEGER NOT NULL,
+        last_requested_at DATETIME NOT NULL,
+        PRIMARY KEY (theme_key)
+    )
+    """,
+
+    # Jobs
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id VARCHAR(36) NOT NULL,
+        kind VARCHAR NOT NULL,
+        status VARCHAR NOT NULL,
+        progress INTEGER NOT NULL,
+        message TEXT,
+        payload TEXT,
+        result TEXT,
+        error TEXT,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_id ON jobs (id)",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs (status)",
+]
+
+def upgrade(conn) -> None:
+    for ddl in DDL:
+        conn.exec_driver_sql(ddl)
+    init_faq_fts(conn)
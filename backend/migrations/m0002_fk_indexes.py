@@ -0,0 +1,26 @@
+# backend/migrations/m0002_fk_indexes.py
+"""
+Índices nas chaves estrangeiras (carregamento das relações e deletes em
+cascata faziam SCAN) e índice composto do histórico do chat.
+"""
+
+VERSION = 2
+DESCRIPTION = "índices de chaves estrangeiras e (session_id, timestamp) em messages"
+
+DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_questions_quiz_id ON questions (quiz_id)",
+    "CREATE INDEX IF NOT EXISTS ix_answers_question_id ON answers (question_id)",
+    "CREATE INDEX IF NOT EXISTS ix_options_question_id ON options (question_id)",
+    "CREATE INDEX IF NOT EXISTS ix_quiz_attempts_quiz_id ON quiz_attempts (quiz_id)",
+    "CREATE INDEX IF NOT EXISTS ix_attempt_answers_attempt_id ON attempt_answers (attempt_id)",
+    "CREATE INDEX IF NOT EXISTS ix_attempt_answers_quiz_id ON attempt_answers (quiz_id)",
+    "CREATE INDEX IF NOT EXISTS ix_attempt_answers_question_id ON attempt_answers (question_id)",
+    # O composto cobre as buscas só por session_id, então o índice simples sai
+    "CREATE INDEX IF NOT EXISTS ix_messages_session_id_timestamp ON messages (session_id, timestamp)",
+    "DROP INDEX IF EXISTS ix_messages_session_id",
+    "ANALYZE",
+]
+
+def upgrade(conn) -> None:
+    for ddl in DDL:
+        conn.exec_driver_sql(ddl)
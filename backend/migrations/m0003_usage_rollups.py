@@ -0,0 +1,92 @@
+# backend/migrations/m0003_usage_rollups.py
+"""
+Modelo usado em cada mensagem e agregados de uso de tokens (por hora e
+por dia, por sessão e modelo; totais por sessão e por modelo). Os
+agregados são preenchidos aqui a partir do histórico existente e depois
+mantidos pelo `log_message`.
+"""
+
+VERSION = 3
+DESCRIPTION = "agregados de uso de tokens"
+
+_ROLLUP_COLUMNS = """
+        messages INTEGER NOT NULL,
+        prompt_tokens INTEGER NOT NULL,
+        completion_tokens INTEGER NOT NULL
+"""
+
+DDL = [
+    "ALTER TABLE messages ADD COLUMN model VARCHAR",
+    f"""
+    CREATE TABLE IF NOT EXISTS usage_hourly (
+        bucket VARCHAR NOT NULL,
+        session_id VARCHAR NOT NULL,
+        model VARCHAR NOT NULL,
+        {_ROLLUP_COLUMNS},
+        PRIMARY KEY (bucket, session_id, model)
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS usage_daily (
+        bucket VARCHAR NOT NULL,
+        session_id VARCHAR NOT NULL,
+        model VARCHAR NOT NULL,
+        {_ROLLUP_COLUMNS},
+        PRIMARY KEY (bucket, session_id, model)
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS usage_sessions (
+        session_id VARCHAR NOT NULL,
+        {_ROLLUP_COLUMNS},
+        total_tokens INTEGER NOT NULL,
+        first_at DATETIME NOT NULL,
+        last_at DATETIME NOT NULL,
+        PRIMARY KEY (session_id)
+    )
+    """,
+    # Séries temporais filtradas por sessão
+    "CREATE INDEX IF NOT EXISTS ix_usage_hourly_session_id_bucket ON usage_hourly (session_id, bucket)",
+    "CREATE INDEX IF NOT EXISTS ix_usage_daily_session_id_bucket ON usage_daily (session_id, bucket)",
+    "CREATE INDEX IF NOT EXISTS ix_usage_sessions_total_tokens ON usage_sessions (total_tokens)",
+    f"""
+    CREATE TABLE IF NOT EXISTS usage_models (
+        model VARCHAR NOT NULL,
+        {_ROLLUP_COLUMNS},
+        PRIMARY KEY (model)
+    )
+    """,
+]
+
+# Mesmo formato de bucket usado em backend/repository/usage_repo.py
+BACKFILL = [
+    """
+    INSERT INTO usage_hourly (bucket, session_id, model, messages, prompt_tokens, completion_tokens)
+    SELECT strftime('%Y-%m-%d %H:00', timestamp), session_id, '', count(*), sum(prompt_tokens), sum(completion_tokens)
+    FROM messages GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO usage_daily (bucket, session_id, model, messages, prompt_tokens, completion_tokens)
+    SELECT strftime('%Y-%m-%d', timestamp), session_id, '', count(*), sum(prompt_tokens), sum(completion_tokens)
+    FROM messages GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO usage_sessions
+        (session_id, messages, prompt_tokens, completion_tokens, total_tokens, first_at, last_at)
+    SELECT session_id, count(*), sum(prompt_tokens), sum(completion_tokens),
+           sum(prompt_tokens) + sum(completion_tokens), min(timestamp), max(timestamp)
+    FROM messages GROUP BY session_id
+    """,
+    """
+    INSERT INTO usage_models (model, messages, prompt_tokens, completion_tokens)
+    SELECT '', count(*), sum(prompt_tokens), sum(completion_tokens)
+    FROM messages HAVING count(*) > 0
+    """,
+]
+
+def upgrade(conn) -> None:
+    for ddl in DDL:
+        conn.exec_driver_sql(ddl)
+    # Mensagens antigas não registravam o modelo: entram com model = ''
+    for sql in BACKFILL:
+        conn.exec_driver_sql(sql)
@@ -0,0 +1,28 @@
+# backend/migrations/m0004_message_archive.py
+"""
+Índice dos arquivos de mensagens arquivadas (retenção): qual arquivo
+contém mensagens de qual sessão, para reproduzir uma sessão sem varrer
+todo o arquivo morto.
+"""
+
+VERSION = 4
+DESCRIPTION = "índice do arquivo morto de mensagens"
+
+DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS message_archive (
+        session_id VARCHAR NOT NULL,
+        path VARCHAR NOT NULL,
+        day VARCHAR NOT NULL,
+        messages INTEGER NOT NULL,
+        first_id INTEGER NOT NULL,
+        last_id INTEGER NOT NULL,
+        archived_at DATETIME NOT NULL,
+        PRIMARY KEY (session_id, path)
+    )
+    """,
+]
+
+def upgrade(conn) -> None:
+    for ddl in DDL:
+        conn.exec_driver_sql(ddl)
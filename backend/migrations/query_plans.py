@@ -0,0 +1,86 @@
+# backend/migrations/query_plans.py
+"""
+Consultas quentes do sistema e o índice que cada uma deve usar. Serve
+para conferir, depois de migrar, que nenhuma delas voltou a fazer SCAN
+(`python -m backend.migrations.runner --check-plans` e
+tests/test_migrations.py).
+"""
+from typing import List, Tuple
+
+# (descrição, SQL com parâmetros posicionais, parâmetros, índice esperado)
+HOT_QUERIES: List[Tuple[str, str, tuple, str]] = [
+    (
+        "perguntas de um quiz (selectinload / cascade)",
+        "SELECT id FROM questions WHERE quiz_id = ?",
+        (1,),
+        "ix_questions_quiz_id",
+    ),
+    (
+        "alternativas das perguntas (selectinload / cascade)",
+        "SELECT id FROM answers WHERE question_id IN (?, ?, ?)",
+        (1, 2, 3),
+        "ix_answers_question_id",
+    ),
+    (
+        "opções das perguntas (cascade)",
+        "SELECT id FROM options WHERE question_id = ?",
+        (1,),
+        "ix_options_question_id",
+    ),
+    (
+        "respostas de um quiz (delete do quiz)",
+        "DELETE FROM attempt_answers WHERE quiz_id = ?",
+        (1,),
+        "ix_attempt_answers_quiz_id",
+    ),
+    (
+        "tentativas de um quiz (delete do quiz)",
+        "DELETE FROM quiz_attempts WHERE quiz_id = ?",
+        (1,),
+        "ix_quiz_attempts_quiz_id",
+    ),
+    (
+        "histórico de uma sessão do chat, em ordem",
+        "SELECT role, content FROM messages WHERE session_id = ? ORDER BY timestamp",
+        ("s",),
+        "ix_messages_session_id_timestamp",
+    ),
+    (
+        "mensagens de uma sessão num intervalo",
+        "SELECT count(*) FROM messages WHERE session_id = ? AND timestamp >= ?",
+        ("s", "2024-01-01"),
+        "ix_messages_session_id_timestamp",
+    ),
+    (
+        "uso diário de uma sessão",
+        "SELECT bucket, sum(prompt_tokens) FROM usage_daily WHERE session_id = ? AND bucket >= ? GROUP BY bucket",
+        ("s", "2024-01-01"),
+        "ix_usage_daily_session_id_bucket",
+    ),
+    (
+        "sessões com maior consumo",
+        "SELECT session_id FROM usage_sessions ORDER BY total_tokens DESC LIMIT 10",
+        (),
+        "ix_usage_sessions_total_tokens",
+    ),
+]
+
+def explain(conn, sql: str, params: tuple) -> List[str]:
+    """Linhas do EXPLAIN QUERY PLAN (coluna `detail`)."""
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+    return [r[-1] for r in rows]
+
+def check_query_plans(conn) -> List[str]:
+    """
+    Roda EXPLAIN QUERY PLAN em cada consulta quente e devolve a lista de
+    problemas (vazia se todas usam o índice esperado e nenhuma faz SCAN).
+    """
+    problems = []
+    for description, sql, params, index in HOT_QUERIES:
+        plan = explain(conn, sql, params)
+        text = " | ".join(plan)
+        if index not in text:
+            problems.append(f"{description}: esperado {index}, plano: {text}")
+        elif any(step.startswith("SCAN") and "USING" not in step for step in plan):
+            problems.append(f"{description}: SCAN sem índice, plano: {text}")
+    return problems
@@ -0,0 +1,120 @@
+# backend/migrations/runner.py
+"""
+Migrations versionadas do esquema SQLite.
+
+Cada migration é um módulo `mNNNN_*.py` com VERSION, DESCRIPTION e
+`upgrade(conn)`. As versões aplicadas ficam em `schema_migrations`. Cada
+migration roda numa transação explícita (BEGIN/COMMIT emitidos aqui, com
+o driver em autocommit), junto com o registro da versão: se falhar no
+meio, DDL, backfill e versão são desfeitos juntos.
+
+Uso (no deploy, antes de subir a API):
+    python -m backend.migrations.runner              # aplica as pendentes
+    python -m backend.migrations.runner --status     # só lista
+    python -m backend.migrations.runner --check-plans
+"""
+import argparse
+import logging
+import sys
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy.engine import Engine
+
+from backend.infrastructure.db_writer import serialized_write
+from backend.migrations import m0001_baseline, m0002_fk_indexes, m0003_usage_rollups, m0004_message_archive
+from backend.migrations.query_plans import check_query_plans
+
+logger = logging.getLogger(__name__)
+
+# Em ordem de versão; novas migrations entram no fim
+MIGRATIONS = [
+    m0001_baseline,
+    m0002_fk_indexes,
+    m0003_usage_rollups,
+    m0004_message_archive,
+]
+
+VERSION_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER NOT NULL PRIMARY KEY,
+        description VARCHAR NOT NULL,
+        applied_at DATETIME NOT NULL
+    )
+"""
+
+def applied_versions(engine: Engine) -> List[int]:
+    with engine.begin() as conn:
+        conn.exec_driver_sql(VERSION_TABLE_DDL)
+        rows = conn.exec_driver_sql("SELECT version FROM schema_migrations ORDER BY version").all()
+    return [r[0] for r in rows]
+
+def pending_migrations(engine: Engine) -> list:
+    done = set(applied_versions(engine))
+    return [m for m in MIGRATIONS if m.VERSION not in done]
+
+def apply_migration(engine: Engine, migration) -> None:
+    """
+    Aplica uma migration e registra a versão numa única transação.
+
+    O pysqlite só abre transação antes de INSERT/UPDATE/DELETE: um ALTER
+    ou CREATE no começo da migration seria gravado na hora, fora do
+    `engine.begin()`. Com o driver em autocommit e o BEGIN emitido aqui, o
+    SQLite trata o DDL como qualquer outra escrita e o ROLLBACK desfaz tudo.
+    """
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.exec_driver_sql("BEGIN")
+        try:
+            migration.upgrade(conn)
+            conn.exec_driver_sql(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.VERSION, migration.DESCRIPTION, datetime.now(timezone.utc).isoformat())
+            )
+        except BaseException:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+        conn.exec_driver_sql("COMMIT")
+
+def migrate(engine: Engine) -> List[int]:
+    """
+    Aplica as migrations pendentes, em ordem. Retorna as versões aplicadas.
+    """
+    applied = []
+    with serialized_write():
+        for migration in pending_migrations(engine):
+            apply_migration(engine, migration)
+            logger.info("Migration %04d aplicada: %s", migration.VERSION, migration.DESCRIPTION)
+            applied.append(migration.VERSION)
+    return applied
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Migrations do banco SQLite")
+    parser.add_argument("--status", action="store_true", help="lista as migrations pendentes sem aplicar")
+    parser.add_argument("--check-plans", action="store_true", help="confere que as consultas quentes usam índices")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    from backend.infrastructure.session import engine
+
+    if args.status:
+        for m in pending_migrations(engine):
+            print(f"pendente: {m.VERSION:04d} {m.DESCRIPTION}")
+        return 0
+
+    applied = migrate(engine)
+    if not applied:
+        print("Esquema já está na versão mais recente.")
+
+    if args.check_plans:
+        with engine.connect() as conn:
+            problems = check_query_plans(conn)
+        for p in problems:
+            print(f"FALHA: {p}")
+        if problems:
+            return 1
+        print("Planos de consulta OK.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
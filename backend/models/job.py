@@ -0,0 +1,24 @@
+# backend/models/job.py
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime, timezone
+from backend.infrastructure.session import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(String(36), primary_key=True, index=True)  # UUID do job
+    kind = Column(String, nullable=False)                  # "faq" | "quiz"
+    status = Column(String, nullable=False, index=True)    # pending, running, succeeded, failed, cancelled
+    progress = Column(Integer, default=0, nullable=False)  # 0..100
+    message = Column(Text)                                 # Etapa atual em texto livre
+    payload = Column(Text)                                 # JSON de entrada
+    result = Column(Text)                                  # JSON de saída (quando concluído)
+    error = Column(Text)
+
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
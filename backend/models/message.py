@@ -1,16 +1,45 @@
 # backend/models/message.py
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Index
 from datetime import datetime, timezone
 from backend.infrastructure.session import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    # Histórico de uma sessão em ordem; também atende buscas só por session_id
+    __table_args__ = (Index("ix_messages_session_id_timestamp", "session_id", "timestamp"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(String, index=True, nullable=False)
+    session_id = Column(String, nullable=False)
     role = Column(String, nullable=False)       
     content = Column(Text, nullable=False)
     timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
 
     prompt_tokens     = Column(Integer, default=0, nullable=False)
-    completion_tokens = Column(Integer, default=0, nullable=False)
\ No newline at end of file
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    model             = Column(String, nullable=True)   # modelo que gerou/consumiu os tokens
+
+class FAQHit(Base):
+    """Pergunta do chat respondida direto por uma FAQ, sem chamar o LLM."""
+    __tablename__ = "faq_hits"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String, index=True, nullable=False)
+    faq_id = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)      # similaridade da pergunta com a FAQ
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    # Estimativa de tokens que o LLM teria consumido
+    saved_prompt_tokens     = Column(Integer, default=0, nullable=False)
+    saved_completion_tokens = Column(Integer, default=0, nullable=False)
+
+class MessageArchive(Base):
+    """Arquivo comprimido (JSONL) que contém mensagens antigas de uma sessão."""
+    __tablename__ = "message_archive"
+
+    session_id = Column(String, primary_key=True)
+    path = Column(String, primary_key=True)     # relativo a settings.ARCHIVE_DIR
+    day = Column(String, nullable=False)        # "YYYY-MM-DD" das mensagens do arquivo
+    messages = Column(Integer, nullable=False)  # mensagens da sessão neste arquivo
+    first_id = Column(Integer, nullable=False)
+    last_id = Column(Integer, nullable=False)
+    archived_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
@@ -0,0 +1,28 @@
+# backend/models/question_bank.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from datetime import datetime, timezone
+from backend.infrastructure.session import Base
+
+class BankQuestion(Base):
+    """Pergunta pré-gerada, pronta para compor quizzes sem chamar o LLM."""
+    __tablename__ = "question_bank"
+    __table_args__ = (UniqueConstraint("theme_key", "prompt_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    theme_key = Column(String, nullable=False, index=True)  # tema normalizado
+    prompt_key = Column(String, nullable=False)              # enunciado normalizado (deduplicação)
+    prompt = Column(Text, nullable=False)
+    explanation = Column(Text, nullable=False)
+    correct_answer = Column(String(1), nullable=False)
+    alternatives = Column(Text, nullable=False)              # JSON: [{"letter": ..., "text": ...}]
+    times_served = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+class ThemeDemand(Base):
+    """Quantas vezes cada tema foi pedido; guia o reabastecimento do banco."""
+    __tablename__ = "theme_demand"
+
+    theme_key = Column(String, primary_key=True)
+    theme = Column(String, nullable=False)       # última forma digitada, usada no prompt do LLM
+    requests = Column(Integer, default=0, nullable=False)
+    last_requested_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
@@ -14,14 +14,15 @@ class Quiz(Base):
     questions = relationship(
         "Question",
         back_populates="quiz",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        order_by="Question.id"
     )
 
 class Question(Base):
     __tablename__ = 'questions'
 
     id = Column(Integer, primary_key=True, index=True)
-    quiz_id = Column(Integer, ForeignKey('quizzes.id'), nullable=False)
+    quiz_id = Column(Integer, ForeignKey('quizzes.id'), nullable=False, index=True)
     prompt = Column(Text, nullable=False)
     correct_answer = Column(String(1), nullable=False)
     explanation = Column(Text, nullable=False)
@@ -31,7 +32,8 @@ class Question(Base):
     answers = relationship(
         "Answer",
         back_populates="question",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        order_by="Answer.id"
     )
     options = relationship(
         "Option",
@@ -43,7 +45,7 @@ class Option(Base):
     __tablename__ = 'options'
 
     id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(Integer, ForeignKey('questions.id'), nullable=False)
+    question_id = Column(Integer, ForeignKey('questions.id'), nullable=False, index=True)
     letter = Column(String(1), nullable=False)
     text = Column(Text, nullable=False)
     is_correct = Column(Boolean, default=False)
@@ -55,9 +57,58 @@ class Answer(Base):
     __tablename__ = 'answers'
 
     id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(Integer, ForeignKey('questions.id'), nullable=False)
+    question_id = Column(Integer, ForeignKey('questions.id'), nullable=False, index=True)
     given_answer = Column(String(1), nullable=False) 
     text = Column(Text, nullable=False)  
     is_correct = Column(Boolean, nullable=False)
 
-    question = relationship("Question", back_populates="answers")
\ No newline at end of file
+    question = relationship("Question", back_populates="answers")
+
+class QuizAttempt(Base):
+    """Tentativa completa de um quiz, gravada pelo endpoint de correção em lote."""
+    __tablename__ = 'quiz_attempts'
+
+    id = Column(Integer, primary_key=True, index=True)
+    quiz_id = Column(Integer, ForeignKey('quizzes.id'), nullable=False, index=True)
+    n_answered = Column(Integer, nullable=False)
+    n_correct = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc), nullable=False)
+
+    responses = relationship("AttemptAnswer", back_populates="attempt")
+
+class AttemptAnswer(Base):
+    """Resposta de um aluno a uma pergunta (avulsa ou dentro de uma tentativa)."""
+    __tablename__ = 'attempt_answers'
+
+    id = Column(Integer, primary_key=True, index=True)
+    attempt_id = Column(Integer, ForeignKey('quiz_attempts.id'), nullable=True, index=True)  # None = resposta avulsa
+    quiz_id = Column(Integer, ForeignKey('quizzes.id'), nullable=False, index=True)
+    question_id = Column(Integer, ForeignKey('questions.id'), nullable=False, index=True)
+    given_answer = Column(String(1), nullable=False)
+    is_correct = Column(Boolean, nullable=False)
+    time_spent_ms = Column(Integer, nullable=True)  # tempo até responder, se o cliente informar
+    created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc), nullable=False)
+
+    attempt = relationship("QuizAttempt", back_populates="responses")
+
+class QuestionStats(Base):
+    """Agregado por pergunta, atualizado a cada resposta corrigida."""
+    __tablename__ = 'question_stats'
+
+    question_id = Column(Integer, ForeignKey('questions.id'), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey('quizzes.id'), nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    correct = Column(Integer, default=0, nullable=False)
+    timed_attempts = Column(Integer, default=0, nullable=False)  # respostas com tempo informado
+    total_time_ms = Column(Integer, default=0, nullable=False)
+
+class ThemeStats(Base):
+    """Agregado por tema normalizado, atualizado a cada resposta corrigida."""
+    __tablename__ = 'theme_stats'
+
+    theme_key = Column(String, primary_key=True)
+    theme = Column(String, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    correct = Column(Integer, default=0, nullable=False)
+    timed_attempts = Column(Integer, default=0, nullable=False)
+    total_time_ms = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,47 @@
+# backend/models/usage.py
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from backend.infrastructure.session import Base
+
+# Agregados de uso de tokens, mantidos a cada mensagem gravada
+# (ver backend/repository/usage_repo.py). model = '' quando desconhecido.
+
+class UsageHourly(Base):
+    __tablename__ = "usage_hourly"
+    __table_args__ = (Index("ix_usage_hourly_session_id_bucket", "session_id", "bucket"),)
+
+    bucket = Column(String, primary_key=True)        # "YYYY-MM-DD HH:00" (UTC)
+    session_id = Column(String, primary_key=True)
+    model = Column(String, primary_key=True)
+    messages = Column(Integer, default=0, nullable=False)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+
+class UsageDaily(Base):
+    __tablename__ = "usage_daily"
+    __table_args__ = (Index("ix_usage_daily_session_id_bucket", "session_id", "bucket"),)
+
+    bucket = Column(String, primary_key=True)        # "YYYY-MM-DD" (UTC)
+    session_id = Column(String, primary_key=True)
+    model = Column(String, primary_key=True)
+    messages = Column(Integer, default=0, nullable=False)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+
+class UsageSession(Base):
+    __tablename__ = "usage_sessions"
+
+    session_id = Column(String, primary_key=True)
+    messages = Column(Integer, default=0, nullable=False)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    total_tokens = Column(Integer, default=0, nullable=False, index=True)  # ranking de sessões
+    first_at = Column(DateTime, nullable=False)
+    last_at = Column(DateTime, nullable=False)
+
+class UsageModel(Base):
+    __tablename__ = "usage_models"
+
+    model = Column(String, primary_key=True)
+    messages = Column(Integer, default=0, nullable=False)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
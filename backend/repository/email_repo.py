@@ -1,12 +1,18 @@
 # backend/repository/email_repo.py
 
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from backend.models.email import Email
+from backend.infrastructure.db_writer import serialized, async_serialized
+from backend.infrastructure.pagination import keyset, DEFAULT_PAGE_SIZE
 
 class EmailRepo:
     def __init__(self, db_session: Session):
         self.db = db_session
 
+    @serialized
     def create(self, sender: str, subject: str, body: str):
         email = Email(sender=sender, subject=subject, body=body)
         self.db.add(email)
@@ -15,4 +21,38 @@ class EmailRepo:
         return email
 
     def list_all(self):
-        return self.db.query(Email).all()
\ No newline at end of file
+        return self.db.query(Email).all()
+
+class AsyncEmailRepo:
+    """Versão assíncrona do EmailRepo, para os handlers `async def`."""
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+
+    @async_serialized
+    async def create(self, sender: str, subject: str, body: str):
+        email = Email(sender=sender, subject=subject, body=body)
+        self.db.add(email)
+        await self.db.commit()
+        await self.db.refresh(email)
+        return email
+
+    @async_serialized
+    async def bulk_create(self, rows: List[Dict[str, str]]) -> int:
+        """
+        Insere vários e-mails num único INSERT (executemany) e um único
+        commit. rows: dicts com sender, subject e body. Retorna quantos entraram.
+        """
+        if not rows:
+            return 0
+        await self.db.execute(insert(Email), rows)
+        await self.db.commit()
+        return len(rows)
+
+    @staticmethod
+    def page_query(after_id: Optional[int] = None, limit: Optional[int] = None):
+        """Colunas do e-mail em ordem de id, a partir de `after_id` (keyset)."""
+        return keyset(select(Email.id, Email.sender, Email.subject, Email.body), Email.id, after_id, limit)
+
+    async def list_page(self, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+        result = await self.db.execute(self.page_query(after_id, limit))
+        return [dict(r) for r in result.mappings().all()]
@@ -1,12 +1,39 @@
 # backend/repository/faq_repo.py
 
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from backend.infrastructure.fts import build_match_query
 from backend.models.faq import FAQ
+from backend.infrastructure.response_cache import table_generations
+from backend.infrastructure.db_writer import serialized, async_serialized
+from backend.infrastructure.pagination import keyset, DEFAULT_PAGE_SIZE
+
+_SEARCH_COUNT_SQL = text("SELECT count(*) FROM faqs_fts WHERE faqs_fts MATCH :match")
+
+_SEARCH_PAGE_SQL = text("""
+    SELECT
+        f.id,
+        f.question,
+        f.answer,
+        f.excerpt,
+        f.link,
+        bm25(faqs_fts, 10.0, 5.0, 1.0) AS rank,
+        snippet(faqs_fts, 0, :hl_open, :hl_close, '…', 16) AS question_snippet,
+        snippet(faqs_fts, 1, :hl_open, :hl_close, '…', 32) AS answer_snippet
+    FROM faqs_fts
+    JOIN faqs f ON f.id = faqs_fts.rowid
+    WHERE faqs_fts MATCH :match
+    ORDER BY rank
+    LIMIT :limit OFFSET :offset
+""")
 
 class FAQRepo:
     def __init__(self, db_session: Session):
         self.db = db_session
 
+    @serialized
     def upsert(self, question: str, answer: str, excerpt: str, link: str):
         """
         Atualiza uma FAQ se a pergunta já existir, senão cria uma nova.
@@ -14,13 +41,14 @@ class FAQRepo:
         faq = self.db.query(FAQ).filter(FAQ.question == question).first()
         if faq:
             faq.answer = answer
-            faq.source = excerpt
+            faq.excerpt = excerpt
         else:
             faq = FAQ(question=question, answer=answer, excerpt=excerpt, link=link)
             self.db.add(faq)
         
         self.db.commit()
         self.db.refresh(faq)
+        table_generations.bump("faqs")
         return faq
 
     def list_all(self):
@@ -35,6 +63,7 @@ class FAQRepo:
         """
         return self.db.query(FAQ).filter(FAQ.question == question).first()
 
+    @serialized
     def delete(self, question: str):
         """
         Remove uma FAQ pelo texto da pergunta.
@@ -43,4 +72,116 @@ class FAQRepo:
         if faq:
             self.db.delete(faq)
             self.db.commit()
-        return faq
\ No newline at end of file
+            table_generations.bump("faqs")
+        return faq
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        highlight: Tuple[str, str] = ("**", "**")
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Busca textual nas FAQs via índice FTS5 (pergunta, resposta e trecho).
+
+        Os resultados vêm ordenados por relevância (bm25, com peso maior
+        para a pergunta) e com trechos destacados por `highlight`.
+        Retorna (total de resultados, página de resultados).
+        """
+        match = build_match_query(query)
+        if not match:
+            return 0, []
+
+        total = self.db.execute(_SEARCH_COUNT_SQL, {"match": match}).scalar()
+        rows = self.db.execute(_SEARCH_PAGE_SQL, {
+            "match": match,
+            "hl_open": highlight[0],
+            "hl_close": highlight[1],
+            "limit": limit,
+            "offset": offset,
+        }).mappings().all()
+
+        return total, [dict(r) for r in rows]
+
+class AsyncFAQRepo:
+    """Versão assíncrona do FAQRepo, para os handlers `async def`."""
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+
+    @async_serialized
+    async def upsert(self, question: str, answer: str, excerpt: str, link: str):
+        """
+        Atualiza uma FAQ se a pergunta já existir, senão cria uma nova.
+        """
+        faq = await self.get_by_question(question)
+        if faq:
+            faq.answer = answer
+            faq.excerpt = excerpt
+        else:
+            faq = FAQ(question=question, answer=answer, excerpt=excerpt, link=link)
+            self.db.add(faq)
+
+        await self.db.commit()
+        await self.db.refresh(faq)
+        table_generations.bump("faqs")
+        return faq
+
+    @staticmethod
+    def page_query(after_id: Optional[int] = None, limit: Optional[int] = None):
+        """Colunas da FAQ em ordem de id, a partir de `after_id` (keyset)."""
+        return keyset(
+            select(FAQ.id, FAQ.question, FAQ.answer, FAQ.excerpt, FAQ.link),
+            FAQ.id, after_id, limit
+        )
+
+    async def list_page(self, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """
+        Uma página de FAQs (dicts), sem materializar objetos ORM.
+        """
+        result = await self.db.execute(self.page_query(after_id, limit))
+        return [dict(r) for r in result.mappings().all()]
+
+    async def get_by_question(self, question: str):
+        """
+        Busca uma FAQ específica pela pergunta.
+        """
+        result = await self.db.execute(select(FAQ).where(FAQ.question == question))
+        return result.scalars().first()
+
+    @async_serialized
+    async def delete(self, question: str):
+        """
+        Remove uma FAQ pelo texto da pergunta.
+        """
+        faq = await self.get_by_question(question)
+        if faq:
+            await self.db.delete(faq)
+            await self.db.commit()
+            table_generations.bump("faqs")
+        return faq
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        highlight: Tuple[str, str] = ("**", "**")
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Mesma busca FTS5 de `FAQRepo.search`.
+        """
+        match = build_match_query(query)
+        if not match:
+            return 0, []
+
+        total = (await self.db.execute(_SEARCH_COUNT_SQL, {"match": match})).scalar()
+        rows = (await self.db.execute(_SEARCH_PAGE_SQL, {
+            "match": match,
+            "hl_open": highlight[0],
+            "hl_close": highlight[1],
+            "limit": limit,
+            "offset": offset,
+        })).mappings().all()
+
+        return total, [dict(r) for r in rows]
@@ -0,0 +1,54 @@
+# backend/repository/job_repo.py
+
+from typing import Optional, Iterable
+from sqlalchemy.orm import Session
+from backend.models.job import Job
+from backend.infrastructure.db_writer import serialized
+
+class JobRepo:
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    @serialized
+    def create(self, job_id: str, kind: str, payload: str, status: str) -> Job:
+        """
+        Registra um novo job com o payload de entrada já serializado.
+        """
+        job = Job(id=job_id, kind=kind, payload=payload, status=status, progress=0)
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Busca um job pelo ID.
+        """
+        return self.db.query(Job).filter(Job.id == job_id).first()
+
+    @serialized
+    def update(self, job_id: str, **fields) -> Optional[Job]:
+        """
+        Atualiza os campos informados (status, progress, message, result, error).
+        """
+        job = self.get(job_id)
+        if not job:
+            return None
+        for name, value in fields.items():
+            setattr(job, name, value)
+        self.db.commit()
+        return job
+
+    @serialized
+    def fail_unfinished(self, statuses: Iterable[str], error: str) -> int:
+        """
+        Marca como falhos os jobs que ficaram nos status informados,
+        por exemplo após um reinício do processo. Retorna quantos foram afetados.
+        """
+        count = (
+            self.db.query(Job)
+                   .filter(Job.status.in_(list(statuses)))
+                   .update({Job.status: "failed", Job.error: error}, synchronize_session=False)
+        )
+        self.db.commit()
+        return count
@@ -0,0 +1,119 @@
+# backend/repository/question_bank_repo.py
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from backend.models.question_bank import BankQuestion, ThemeDemand
+from backend.services.text_utils import normalize_text, is_near_duplicate
+from backend.infrastructure.db_writer import serialized
+
+# Enunciados com similaridade acima disso são considerados a mesma pergunta
+PROMPT_SIMILARITY_THRESHOLD = 0.9
+
+class QuestionBankRepo:
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def count(self, theme_key: str) -> int:
+        """
+        Quantas perguntas há em estoque para o tema.
+        """
+        return self.db.query(func.count(BankQuestion.id)).filter(BankQuestion.theme_key == theme_key).scalar()
+
+    @serialized
+    def sample(self, theme_key: str, n: int) -> List[Dict[str, Any]]:
+        """
+        Sorteia `n` perguntas do tema, priorizando as menos servidas,
+        e já contabiliza o uso. Retorna no formato do QuizRepo.
+        """
+        rows = (
+            self.db.query(BankQuestion)
+                   .filter(BankQuestion.theme_key == theme_key)
+                   .order_by(BankQuestion.times_served, func.random())
+                   .limit(n)
+                   .all()
+        )
+        for row in rows:
+            row.times_served += 1
+        self.db.commit()
+        return [
+            {
+                "prompt": row.prompt,
+                "explanation": row.explanation,
+                "correct_answer": row.correct_answer,
+                "alternatives": json.loads(row.alternatives),
+            }
+            for row in rows
+        ]
+
+    @serialized
+    def add_questions(self, theme_key: str, questions: List[Dict[str, Any]]) -> int:
+        """
+        Adiciona perguntas (formato do QuizRepo) ao estoque do tema,
+        descartando as que repetem ou quase repetem enunciados existentes.
+        Retorna quantas foram efetivamente adicionadas.
+        """
+        known = [
+            key for (key,) in
+            self.db.query(BankQuestion.prompt_key).filter(BankQuestion.theme_key == theme_key).all()
+        ]
+        added = 0
+        for q in questions:
+            key = normalize_text(q["prompt"])
+            if not key or is_near_duplicate(key, known, PROMPT_SIMILARITY_THRESHOLD):
+                continue
+            self.db.add(BankQuestion(
+                theme_key=theme_key,
+                prompt_key=key,
+                prompt=q["prompt"],
+                explanation=q["explanation"],
+                correct_answer=q["correct_answer"],
+                alternatives=json.dumps(q["alternatives"], ensure_ascii=False),
+            ))
+            known.append(key)
+            added += 1
+        self.db.commit()
+        return added
+
+    @serialized
+    def record_demand(self, theme_key: str, theme: str) -> None:
+        """
+        Conta mais um pedido para o tema (upsert atômico).
+        """
+        now = datetime.now(timezone.utc)
+        stmt = insert(ThemeDemand).values(theme_key=theme_key, theme=theme, requests=1, last_requested_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ThemeDemand.theme_key],
+            set_={
+                "theme": theme,
+                "requests": ThemeDemand.requests + 1,
+                "last_requested_at": now,
+            }
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+    def low_stock_themes(self, min_requests: int, target_stock: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Temas mais pedidos (>= min_requests) com estoque abaixo do alvo,
+        do mais popular para o menos popular.
+        """
+        rows = self.db.execute(
+            text("""
+                SELECT d.theme_key, d.theme, d.requests, count(b.id) AS stock
+                FROM theme_demand d
+                LEFT JOIN question_bank b ON b.theme_key = d.theme_key
+                WHERE d.requests >= :min_requests
+                GROUP BY d.theme_key
+                HAVING stock < :target_stock
+                ORDER BY d.requests DESC
+                LIMIT :limit
+            """),
+            {"min_requests": min_requests, "target_stock": target_stock, "limit": limit}
+        ).mappings().all()
+        return [dict(r) for r in rows]
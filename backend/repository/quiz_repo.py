@@ -1,15 +1,114 @@
 from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 import random
-from sqlalchemy import text
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.schemas.quiz_schema import QuizOut
-from backend.models.quiz import Quiz, Question, Answer
+from backend.models.quiz import Quiz, Question, Answer, QuizAttempt, AttemptAnswer, QuestionStats, ThemeStats
+from backend.services.answer_key_cache import answer_key_cache
+from backend.services.text_utils import normalize_theme
+from backend.infrastructure.db_writer import serialized, async_serialized
+from backend.infrastructure.pagination import keyset, DEFAULT_PAGE_SIZE
+from backend.infrastructure.response_cache import table_generations
+
+def _quiz_to_dict(quiz: Quiz) -> Dict[str, Any]:
+    """
+    Monta o formato QuizOut a partir de um Quiz com perguntas e
+    alternativas já carregadas.
+    """
+    # monta a lista de perguntas já incluindo a explicação
+    questions = []
+    for q in quiz.questions:
+        questions.append({
+            "id": q.id,
+            "prompt": q.prompt,
+            "explanation": q.explanation,       # <-- aqui!
+            "answers": [
+                {
+                    "given_answer": a.given_answer,
+                    "text":         a.text,       # texto da alternativa
+                    "is_correct":   a.is_correct
+                }
+                for a in q.answers
+            ]
+        })
+
+    return {
+        "id":         quiz.id,
+        "theme":      quiz.theme,
+        "n_questions": quiz.n_questions,
+        "questions":  questions
+    }
+
+def _stats_upserts(quiz_id: int, theme: str, graded: List[Dict[str, Any]]) -> list:
+    """
+    Statements que somam as respostas corrigidas nos agregados por
+    pergunta e por tema (upsert incremental, sem reler o histórico).
+    """
+    def counts(items):
+        timed = [g["time_spent_ms"] for g in items if g.get("time_spent_ms") is not None]
+        return {
+            "attempts": len(items),
+            "correct": sum(1 for g in items if g["is_correct"]),
+            "timed_attempts": len(timed),
+            "total_time_ms": sum(timed),
+        }
+
+    def increments(model, stmt):
+        return {
+            "attempts": model.attempts + stmt.excluded.attempts,
+            "correct": model.correct + stmt.excluded.correct,
+            "timed_attempts": model.timed_attempts + stmt.excluded.timed_attempts,
+            "total_time_ms": model.total_time_ms + stmt.excluded.total_time_ms,
+        }
+
+    statements = []
+    for g in graded:
+        stmt = insert(QuestionStats).values(question_id=g["question_id"], quiz_id=quiz_id, **counts([g]))
+        statements.append(stmt.on_conflict_do_update(
+            index_elements=[QuestionStats.question_id],
+            set_=increments(QuestionStats, stmt)
+        ))
+
+    stmt = insert(ThemeStats).values(theme_key=normalize_theme(theme), theme=theme, **counts(graded))
+    statements.append(stmt.on_conflict_do_update(
+        index_elements=[ThemeStats.theme_key],
+        set_=increments(ThemeStats, stmt)
+    ))
+    return statements
+
+def _attempt_rows(quiz_id: int, graded: List[Dict[str, Any]]):
+    """
+    Cabeçalho da tentativa e função que cria as respostas depois que o
+    cabeçalho tiver ID.
+    """
+    attempt = QuizAttempt(
+        quiz_id=quiz_id,
+        n_answered=len(graded),
+        n_correct=sum(1 for g in graded if g["is_correct"])
+    )
+
+    def answers():
+        return [
+            AttemptAnswer(
+                attempt_id=attempt.id,
+                quiz_id=quiz_id,
+                question_id=g["question_id"],
+                given_answer=g["given_answer"],
+                is_correct=g["is_correct"],
+                time_spent_ms=g.get("time_spent_ms")
+            )
+            for g in graded
+        ]
+    return attempt, answers
 
 class QuizRepo:
     def __init__(self, db_session: Session):
         self.db = db_session
 
+    @serialized
     def create_quiz(self, theme: str, n_questions: int, questions: List[Dict[str, Any]]) -> int:
         """
         Cria um novo Quiz e suas perguntas associadas.
@@ -21,29 +120,79 @@ class QuizRepo:
         self.db.flush()  
 
         for q in questions:
-            question = Question(
-                prompt=q["prompt"],
-                correct_answer=q["correct_answer"],
-                explanation=q["explanation"],
-                quiz_id=quiz.id
-            )
-            self.db.add(question)
-            self.db.flush() 
-
-            # Criar respostas (alternativas)
-            for alt in q["alternatives"]:
-                answer = Answer(
-                    question_id=question.id,
-                    given_answer=alt["letter"], 
-                    text=alt["text"],           
-                    is_correct=(alt["letter"] == q["correct_answer"])
-                )
-                self.db.add(answer)
+            self._add_question_rows(quiz.id, q)
 
         self.db.commit()
+        table_generations.bump("quizzes")
         self.db.refresh(quiz)
         return quiz.id
 
+    def _add_question_rows(self, quiz_id: int, q: Dict[str, Any]) -> Question:
+        question = Question(
+            prompt=q["prompt"],
+            correct_answer=q["correct_answer"],
+            explanation=q["explanation"],
+            quiz_id=quiz_id
+        )
+        self.db.add(question)
+        self.db.flush() 
+
+        # Criar respostas (alternativas)
+        for alt in q["alternatives"]:
+            answer = Answer(
+                question_id=question.id,
+                given_answer=alt["letter"], 
+                text=alt["text"],           
+                is_correct=(alt["letter"] == q["correct_answer"])
+            )
+            self.db.add(answer)
+        return question
+
+    @serialized
+    def create_empty_quiz(self, theme: str, n_questions: int) -> int:
+        """
+        Cria o Quiz sem perguntas, para que elas sejam adicionadas
+        uma a uma conforme são geradas (ver `add_question`).
+        """
+        quiz = Quiz(theme=theme, n_questions=n_questions)
+        self.db.add(quiz)
+        self.db.commit()
+        table_generations.bump("quizzes")
+        return quiz.id
+
+    @serialized
+    def add_question(self, quiz_id: int, q: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Persiste uma pergunta (com alternativas) num quiz existente e
+        retorna no mesmo formato de `get_quiz_with_questions`.
+        """
+        question = self._add_question_rows(quiz_id, q)
+        self.db.commit()
+        table_generations.bump("quizzes")
+        answer_key_cache.invalidate(quiz_id)
+        return {
+            "id": question.id,
+            "prompt": q["prompt"],
+            "explanation": q["explanation"],
+            "answers": [
+                {
+                    "given_answer": alt["letter"],
+                    "text": alt["text"],
+                    "is_correct": alt["letter"] == q["correct_answer"],
+                }
+                for alt in q["alternatives"]
+            ],
+        }
+
+    @serialized
+    def set_n_questions(self, quiz_id: int, n_questions: int) -> None:
+        """
+        Ajusta o total de perguntas após uma geração incremental.
+        """
+        self.db.query(Quiz).filter(Quiz.id == quiz_id).update({Quiz.n_questions: n_questions})
+        self.db.commit()
+        table_generations.bump("quizzes")
+
     def generate_options(self, question: Question, correct_text: str):
         """
         Gera 4 opções (A, B, C, D) para a questão, incluindo a correta.
@@ -72,74 +221,40 @@ class QuizRepo:
         question.correct_answer = letters[correct_position]
 
     def get_quiz_with_questions(self, quiz_id: int) -> QuizOut:
+        """
+        Carrega o quiz com perguntas e alternativas em número constante de
+        queries (quiz, perguntas, alternativas), independente do tamanho.
+        """
         quiz: Quiz = (
             self.db.query(Quiz)
+                   .options(selectinload(Quiz.questions).selectinload(Question.answers))
                    .filter(Quiz.id == quiz_id)
                    .first()
         )
         if not quiz:
             return None
+        return _quiz_to_dict(quiz)
 
-        # monta a lista de perguntas já incluindo a explicação
-        questions = []
-        for q in quiz.questions:
-            questions.append({
-                "id": q.id,
-                "prompt": q.prompt,
-                "explanation": q.explanation,       # <-- aqui!
-                "answers": [
-                    {
-                        "given_answer": a.given_answer,
-                        "text":         a.text,       # texto da alternativa
-                        "is_correct":   a.is_correct
-                    }
-                    for a in q.answers
-                ]
-            })
-
-        return {
-            "id":         quiz.id,
-            "theme":      quiz.theme,
-            "n_questions": quiz.n_questions,
-            "questions":  questions
-        }
-
-    def save_and_check_answer(self, question_id: int, given_answer: str) -> Optional[Dict[str, Any]]:
+    def list_quizzes(self) -> List[Quiz]:
         """
-        Salva a resposta dada para a pergunta especificada,
-        verifica se está correta e retorna:
-          - question_id
-          - is_correct
-          - explanation
+        Lista todos os quizzes existentes, com perguntas e alternativas
+        já carregadas (sem lazy-load por item na serialização).
         """
-        # Busca a pergunta
-        question = self.db.query(Question).filter(Question.id == question_id).first()
-        if not question:
-            return None
-
-        # Verifica correção (case-insensitive)
-        is_correct = (given_answer.strip().upper() == question.correct_answer.strip().upper())
-        answer = Answer(
-            question_id=question.id,
-            given_answer=given_answer,
-            is_correct=is_correct
+        return (
+            self.db.query(Quiz)
+                   .options(selectinload(Quiz.questions).selectinload(Question.answers))
+                   .all()
         )
-        self.db.add(answer)
-        self.db.commit()
-        self.db.refresh(answer)
 
-        return {
-            "question_id": question.id,
-            "is_correct": is_correct,
-            "explanation": question.explanation
-        }
-
-    def list_quizzes(self) -> List[Quiz]:
+    def list_quiz_summaries(self) -> List[Dict[str, Any]]:
         """
-        Lista todos os quizzes existentes.
+        Lista resumida dos quizzes (id, tema, nº de perguntas) numa única
+        query, sem carregar perguntas nem alternativas.
         """
-        return self.db.query(Quiz).all()
+        rows = self.db.query(Quiz.id, Quiz.theme, Quiz.n_questions).order_by(Quiz.id).all()
+        return [{"id": r.id, "theme": r.theme, "n_questions": r.n_questions} for r in rows]
 
+    @serialized
     def delete_quiz(self, quiz_id: int) -> Optional[Quiz]:
         """
         Remove um Quiz pelo ID (e em cascade suas perguntas e respostas).
@@ -147,9 +262,93 @@ class QuizRepo:
         """
         quiz = self.db.query(Quiz).filter(Quiz.id == quiz_id).first()
         if quiz:
+            # Histórico de respostas sai junto, em bulk (sem carregar linha a linha)
+            self.db.query(AttemptAnswer).filter(AttemptAnswer.quiz_id == quiz_id).delete(synchronize_session=False)
+            self.db.query(QuizAttempt).filter(QuizAttempt.quiz_id == quiz_id).delete(synchronize_session=False)
+            self.db.query(QuestionStats).filter(QuestionStats.quiz_id == quiz_id).delete(synchronize_session=False)
             self.db.delete(quiz)
             self.db.commit()
+            table_generations.bump("quizzes")
+            answer_key_cache.invalidate(quiz_id)
         return quiz
+
+    @serialized
+    def record_answer(
+        self,
+        quiz_id: int,
+        theme: str,
+        question_id: int,
+        given_answer: str,
+        is_correct: bool,
+        time_spent_ms: Optional[int] = None
+    ) -> int:
+        """
+        Grava uma resposta avulsa já corrigida e atualiza os agregados
+        na mesma transação. Retorna o ID do registro.
+        """
+        response = AttemptAnswer(
+            quiz_id=quiz_id,
+            question_id=question_id,
+            given_answer=given_answer,
+            is_correct=is_correct,
+            time_spent_ms=time_spent_ms
+        )
+        self.db.add(response)
+        self._bump_stats(quiz_id, theme, [{
+            "question_id": question_id,
+            "is_correct": is_correct,
+            "time_spent_ms": time_spent_ms,
+        }])
+        self.db.commit()
+        return response.id
+
+    @serialized
+    def record_attempt(self, quiz_id: int, theme: str, graded: List[Dict[str, Any]]) -> int:
+        """
+        Grava uma tentativa completa (cabeçalho + todas as respostas
+        corrigidas) e atualiza os agregados numa única transação.
+        Retorna o ID da tentativa.
+        graded: lista de dicts com question_id, given_answer, is_correct
+                e time_spent_ms (opcional)
+        """
+        attempt, answers = _attempt_rows(quiz_id, graded)
+        self.db.add(attempt)
+        self.db.flush()
+        self.db.add_all(answers())
+        self._bump_stats(quiz_id, theme, graded)
+        self.db.commit()
+        return attempt.id
+
+    def _bump_stats(self, quiz_id: int, theme: str, graded: List[Dict[str, Any]]) -> None:
+        """
+        Soma as respostas corrigidas nos agregados por pergunta e por tema
+        (upsert incremental, sem reler o histórico). Não faz commit.
+        """
+        for stmt in _stats_upserts(quiz_id, theme, graded):
+            self.db.execute(stmt)
+
+    def get_question_stats(self, question_id: int) -> Optional[QuestionStats]:
+        """
+        Agregado de uma pergunta (busca por chave primária).
+        """
+        return self.db.query(QuestionStats).filter(QuestionStats.question_id == question_id).first()
+
+    def list_quiz_question_stats(self, quiz_id: int) -> List[QuestionStats]:
+        """
+        Agregados de todas as perguntas de um quiz (via índice em quiz_id).
+        """
+        return (
+            self.db.query(QuestionStats)
+                   .filter(QuestionStats.quiz_id == quiz_id)
+                   .order_by(QuestionStats.question_id)
+                   .all()
+        )
+
+    def get_theme_stats(self, theme: str) -> Optional[ThemeStats]:
+        """
+        Agregado de um tema, pela chave normalizada (busca por chave primária).
+        """
+        return self.db.query(ThemeStats).filter(ThemeStats.theme_key == normalize_theme(theme)).first()
     
     def get_question_by_id(self, question_id: int):
         query = text("""
@@ -174,4 +373,107 @@ class QuizRepo:
             "prompt": result["prompt"],
             "correct_answer": result["correct_answer"],
             "explanation": result["explanation"],
-        }
\ No newline at end of file
+        }
+
+class AsyncQuizRepo:
+    """
+    Versão assíncrona das leituras e gravações do QuizRepo usadas pelos
+    handlers `async def`. A criação de quizzes continua no QuizRepo
+    síncrono: ela roda junto com a geração pelo LLM, fora do event loop.
+    """
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+
+    async def get_quiz_with_questions(self, quiz_id: int) -> QuizOut:
+        result = await self.db.execute(
+            select(Quiz)
+            .options(selectinload(Quiz.questions).selectinload(Question.answers))
+            .where(Quiz.id == quiz_id)
+        )
+        quiz = result.scalars().first()
+        if not quiz:
+            return None
+        return _quiz_to_dict(quiz)
+
+    @staticmethod
+    def summary_page_query(after_id: Optional[int] = None, limit: Optional[int] = None):
+        """Resumo dos quizzes (id, tema, nº de perguntas) em ordem de id, a partir de `after_id`."""
+        return keyset(select(Quiz.id, Quiz.theme, Quiz.n_questions), Quiz.id, after_id, limit)
+
+    async def list_summary_page(self, after_id: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+        result = await self.db.execute(self.summary_page_query(after_id, limit))
+        return [dict(r) for r in result.mappings().all()]
+
+    @async_serialized
+    async def delete_quiz(self, quiz_id: int) -> Optional[Quiz]:
+        # O cascade do ORM precisa das coleções carregadas (sem lazy-load no modo async)
+        result = await self.db.execute(
+            select(Quiz)
+            .options(
+                selectinload(Quiz.questions).selectinload(Question.answers),
+                selectinload(Quiz.questions).selectinload(Question.options),
+            )
+            .where(Quiz.id == quiz_id)
+        )
+        quiz = result.scalars().first()
+        if quiz:
+            await self.db.execute(delete(AttemptAnswer).where(AttemptAnswer.quiz_id == quiz_id))
+            await self.db.execute(delete(QuizAttempt).where(QuizAttempt.quiz_id == quiz_id))
+            await self.db.execute(delete(QuestionStats).where(QuestionStats.quiz_id == quiz_id))
+            await self.db.delete(quiz)
+            await self.db.commit()
+            table_generations.bump("quizzes")
+            answer_key_cache.invalidate(quiz_id)
+        return quiz
+
+    @async_serialized
+    async def record_answer(
+        self,
+        quiz_id: int,
+        theme: str,
+        question_id: int,
+        given_answer: str,
+        is_correct: bool,
+        time_spent_ms: Optional[int] = None
+    ) -> int:
+        response = AttemptAnswer(
+            quiz_id=quiz_id,
+            question_id=question_id,
+            given_answer=given_answer,
+            is_correct=is_correct,
+            time_spent_ms=time_spent_ms
+        )
+        self.db.add(response)
+        for stmt in _stats_upserts(quiz_id, theme, [{
+            "question_id": question_id,
+            "is_correct": is_correct,
+            "time_spent_ms": time_spent_ms,
+        }]):
+            await self.db.execute(stmt)
+        await self.db.commit()
+        return response.id
+
+    @async_serialized
+    async def record_attempt(self, quiz_id: int, theme: str, graded: List[Dict[str, Any]]) -> int:
+        attempt, answers = _attempt_rows(quiz_id, graded)
+        self.db.add(attempt)
+        await self.db.flush()
+        self.db.add_all(answers())
+        for stmt in _stats_upserts(quiz_id, theme, graded):
+            await self.db.execute(stmt)
+        await self.db.commit()
+        return attempt.id
+
+    async def get_question_stats(self, question_id: int) -> Optional[QuestionStats]:
+        return await self.db.get(QuestionStats, question_id)
+
+    async def list_quiz_question_stats(self, quiz_id: int) -> List[QuestionStats]:
+        result = await self.db.execute(
+            select(QuestionStats)
+            .where(QuestionStats.quiz_id == quiz_id)
+            .order_by(QuestionStats.question_id)
+        )
+        return result.scalars().all()
+
+    async def get_theme_stats(self, theme: str) -> Optional[ThemeStats]:
+        return await self.db.get(ThemeStats, normalize_theme(theme))
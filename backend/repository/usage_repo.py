@@ -0,0 +1,164 @@
+# backend/repository/usage_repo.py
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.usage import UsageHourly, UsageDaily, UsageSession, UsageModel
+
+HOUR_FORMAT = "%Y-%m-%d %H:00"
+DAY_FORMAT = "%Y-%m-%d"
+
+def usage_rollup_statements(
+    session_id: str,
+    model: Optional[str],
+    prompt_tokens: int,
+    completion_tokens: int,
+    timestamp: datetime
+) -> list:
+    """
+    Upserts que somam uma mensagem nos agregados de uso. Devem rodar na
+    mesma transação que grava a mensagem (ver `log_message`).
+    """
+    model = model or ""
+    counts = {"messages": 1, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+
+    def increments(table, stmt):
+        return {
+            "messages": table.messages + stmt.excluded.messages,
+            "prompt_tokens": table.prompt_tokens + stmt.excluded.prompt_tokens,
+            "completion_tokens": table.completion_tokens + stmt.excluded.completion_tokens,
+        }
+
+    statements = []
+    for table, bucket in ((UsageHourly, timestamp.strftime(HOUR_FORMAT)), (UsageDaily, timestamp.strftime(DAY_FORMAT))):
+        stmt = insert(table).values(bucket=bucket, session_id=session_id, model=model, **counts)
+        statements.append(stmt.on_conflict_do_update(
+            index_elements=[table.bucket, table.session_id, table.model],
+            set_=increments(table, stmt)
+        ))
+
+    stmt = insert(UsageSession).values(
+        session_id=session_id,
+        total_tokens=prompt_tokens + completion_tokens,
+        first_at=timestamp,
+        last_at=timestamp,
+        **counts
+    )
+    statements.append(stmt.on_conflict_do_update(
+        index_elements=[UsageSession.session_id],
+        set_={
+            **increments(UsageSession, stmt),
+            "total_tokens": UsageSession.total_tokens + stmt.excluded.total_tokens,
+            "last_at": stmt.excluded.last_at,
+        }
+    ))
+
+    stmt = insert(UsageModel).values(model=model, **counts)
+    statements.append(stmt.on_conflict_do_update(
+        index_elements=[UsageModel.model],
+        set_=increments(UsageModel, stmt)
+    ))
+    return statements
+
+def _counts(row) -> Dict[str, int]:
+    prompt, completion = row.prompt_tokens or 0, row.completion_tokens or 0
+    return {
+        "messages": row.messages or 0,
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+    }
+
+class AsyncUsageRepo:
+    """
+    Leituras de uso de tokens. Tudo sai dos agregados: o custo depende
+    do número de buckets/sessões pedidos, não do tamanho de `messages`.
+    """
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+
+    async def totals(self) -> Dict[str, Any]:
+        """Totais gerais e por modelo (uma linha por modelo)."""
+        rows = (await self.db.execute(select(UsageModel).order_by(UsageModel.model))).scalars().all()
+        by_model = [{"model": r.model, **_counts(r)} for r in rows]
+        overall = {
+            key: sum(m[key] for m in by_model)
+            for key in ("messages", "prompt_tokens", "completion_tokens", "total_tokens")
+        }
+        return {**overall, "by_model": by_model}
+
+    async def session_totals(self, session_id: str) -> Optional[Dict[str, Any]]:
+        row = await self.db.get(UsageSession, session_id)
+        if row is None:
+            return None
+        return {"session_id": row.session_id, "first_at": row.first_at, "last_at": row.last_at, **_counts(row)}
+
+    async def top_sessions(
+        self,
+        limit: int = 10,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Sessões que mais consumiram tokens. Sem intervalo, usa o índice
+        de `usage_sessions.total_tokens`; com intervalo (datas
+        YYYY-MM-DD, inclusivas), soma os agregados diários do período.
+        """
+        if since is None and until is None:
+            rows = (await self.db.execute(
+                select(UsageSession).order_by(UsageSession.total_tokens.desc()).limit(limit)
+            )).scalars().all()
+            return [{"session_id": r.session_id, **_counts(r)} for r in rows]
+
+        prompt = func.sum(UsageDaily.prompt_tokens)
+        completion = func.sum(UsageDaily.completion_tokens)
+        stmt = select(
+            UsageDaily.session_id,
+            func.sum(UsageDaily.messages).label("messages"),
+            prompt.label("prompt_tokens"),
+            completion.label("completion_tokens"),
+        )
+        if since:
+            stmt = stmt.where(UsageDaily.bucket >= since)
+        if until:
+            stmt = stmt.where(UsageDaily.bucket <= until)
+        stmt = stmt.group_by(UsageDaily.session_id).order_by((prompt + completion).desc()).limit(limit)
+        rows = (await self.db.execute(stmt)).all()
+        return [{"session_id": r.session_id, **_counts(r)} for r in rows]
+
+    async def timeseries(
+        self,
+        granularity: str = "day",
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        session_id: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Série temporal por hora ("YYYY-MM-DD HH:00") ou dia ("YYYY-MM-DD"),
+        opcionalmente filtrada por sessão e/ou modelo. `since`/`until`
+        são comparados com o bucket (inclusivos).
+        """
+        table = UsageHourly if granularity == "hour" else UsageDaily
+        if granularity == "hour" and until and len(until) == len("YYYY-MM-DD"):
+            until += " 23:59"   # dia inteiro
+        stmt = select(
+            table.bucket,
+            func.sum(table.messages).label("messages"),
+            func.sum(table.prompt_tokens).label("prompt_tokens"),
+            func.sum(table.completion_tokens).label("completion_tokens"),
+        )
+        if since:
+            stmt = stmt.where(table.bucket >= since)
+        if until:
+            stmt = stmt.where(table.bucket <= until)
+        if session_id:
+            stmt = stmt.where(table.session_id == session_id)
+        if model is not None:
+            stmt = stmt.where(table.model == model)
+        rows = (await self.db.execute(stmt.group_by(table.bucket).order_by(table.bucket))).all()
+        return [{"bucket": r.bucket, **_counts(r)} for r in rows]
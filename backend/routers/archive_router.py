@@ -0,0 +1,76 @@
+import json
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from backend.infrastructure.config import settings
+from backend.infrastructure.session import SessionLocal
+from backend.models.message import Message
+from backend.schemas.job_schema import JobSubmitted
+from backend.services.job_service import job_manager, JobQueueFull, PENDING
+from backend.services.retention_service import iter_archived_session, message_record
+
+router = APIRouter(prefix="/archive", tags=["Archive"])
+
+@router.post("/run", response_model=JobSubmitted, status_code=202)
+def run_retention(
+    older_than_days: int = Query(settings.RETENTION_DAYS, ge=1, description="Idade mínima das mensagens arquivadas")
+) -> JobSubmitted:
+    """
+    Enfileira a retenção: mensagens mais antigas que `older_than_days`
+    saem do banco para arquivos JSONL comprimidos, seguidas de um vacuum
+    incremental. Os agregados de uso não mudam.
+
+    Args:
+        older_than_days (int): Idade mínima, em dias, das mensagens a arquivar.
+
+    Returns:
+        JobSubmitted: ID do job criado e seu status inicial.
+
+    Raises:
+        HTTPException 503: Se a fila de jobs estiver cheia.
+    """
+    try:
+        job_id = job_manager.submit("retention", {"older_than_days": older_than_days})
+    except JobQueueFull:
+        raise HTTPException(status_code=503, detail="Fila de jobs cheia", headers={"Retry-After": "30"})
+    return {"job_id": job_id, "status": PENDING}
+
+@router.get("/sessions/{session_id}", summary="Reproduz uma sessão arquivada (NDJSON)")
+def replay_session(
+    session_id: str,
+    include_live: bool = Query(False, description="Inclui também as mensagens que ainda estão no banco")
+) -> StreamingResponse:
+    """
+    Reproduz as mensagens de uma sessão de chat que já foram arquivadas,
+    em ordem, lendo os arquivos comprimidos em streaming.
+
+    Cada linha do NDJSON é uma mensagem (id, role, content, timestamp,
+    tokens e modelo). Com `include_live`, as mensagens que ainda estão no
+    banco vêm em seguida, formando o histórico completo.
+
+    Args:
+        session_id (str): Identificador da sessão.
+        include_live (bool): Se deve anexar as mensagens não arquivadas.
+
+    Returns:
+        StreamingResponse: stream `application/x-ndjson` com as mensagens.
+    """
+    def gen():
+        # Sessão própria: o stream continua depois que o handler retorna
+        db = SessionLocal()
+        try:
+            for record in iter_archived_session(db, session_id):
+                yield json.dumps(record, ensure_ascii=False) + "\n"
+            if include_live:
+                live = (
+                    db.query(Message)
+                      .filter(Message.session_id == session_id)
+                      .order_by(Message.timestamp, Message.id)
+                      .yield_per(500)
+                )
+                for m in live:
+                    yield json.dumps(message_record(m), ensure_ascii=False) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(gen(), media_type="application/x-ndjson")
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from backend.infrastructure.session import get_db
-from backend.repository.email_repo import EmailRepo
-from backend.schemas.email_schema import EmailCreate, EmailRead
+from backend.infrastructure.session import get_async_db
+from backend.infrastructure.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_stream, set_next_cursor
+from backend.repository.email_repo import AsyncEmailRepo
+from backend.schemas.email_schema import EmailCreate, EmailRead, EmailImportReport
+from backend.services.email_import import FORMATS, detect_format, import_emails
 
 router = APIRouter(prefix="/emails", tags=["Emails"])
 
 @router.post("/", response_model=EmailRead)
-def create_email(e: EmailCreate, db: Session = Depends(get_db)):
+async def create_email(e: EmailCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Cria um novo e-mail no banco de dados.
 
@@ -18,13 +20,13 @@ def create_email(e: EmailCreate, db: Session = Depends(get_db)):
 
     Args:
         e (EmailCreate): objeto com os campos necessários para criação do e-mail,
-        db (Session, optional): sessão de banco de dados injetada pelo Depends.
+        db (AsyncSession, optional): sessão assíncrona de banco de dados injetada pelo Depends.
 
     Returns:
         EmailRead: modelo de leitura do e-mail recém-criado, contendo id, sender,
                    subject, body e timestamps (created_at, updated_at).
     """
-    email = EmailRepo(db).create(
+    email = await AsyncEmailRepo(db).create(
         sender=e.sender,
         subject=e.subject,
         body=e.body
@@ -32,18 +34,72 @@ def create_email(e: EmailCreate, db: Session = Depends(get_db)):
     return email
 
 @router.get("/", response_model=List[EmailRead])
-def list_emails(db: Session = Depends(get_db)):
+async def list_emails(
+    response: Response,
+    after_id: Optional[int] = Query(None, ge=0, description="Cursor: devolve itens com id maior que este"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Retorna a lista de todos os e-mails cadastrados.
+    Retorna os e-mails cadastrados, paginados por id (keyset).
 
-    Este endpoint busca no banco de dados todos os registros de e-mail
-    e devolve uma lista formatada segundo o modelo EmailRead.
+    Cada página traz até `limit` e-mails em ordem de id; quando a página vem
+    cheia, o header X-Next-Cursor traz o `after_id` da próxima. Com
+    `format=ndjson` a resposta é um stream lido de um cursor no servidor.
 
     Args:
-        db (Session, optional): sessão de banco de dados injetada pelo Depends.
+        response (Response): resposta, onde vai o header X-Next-Cursor.
+        after_id (int, optional): cursor da página; só itens com id maior que ele.
+        limit (int, optional): tamanho da página (padrão 100, máximo 1000);
+            no modo ndjson, sem limite o stream percorre a tabela inteira.
+        format (str): "json" (página) ou "ndjson" (stream, um objeto por linha).
+        db (AsyncSession, optional): sessão assíncrona de banco de dados injetada pelo Depends.
 
     Returns:
-        List[EmailRead]: lista de objetos de leitura de e-mail, cada um contendo
-                         id, sender, subject, body e timestamps.
+        List[EmailRead]: página de e-mails, cada um com id, sender, subject e body.
     """
-    return EmailRepo(db).list_all()
+    if format == "ndjson":
+        return ndjson_stream(AsyncEmailRepo.page_query(after_id, limit))
+    limit = limit or DEFAULT_PAGE_SIZE
+    emails = await AsyncEmailRepo(db).list_page(after_id, limit)
+    set_next_cursor(response, emails, limit)
+    return emails
+
+@router.post("/bulk", response_model=EmailImportReport)
+async def import_emails_bulk(
+    request: Request,
+    format: Optional[str] = Query(None, description="ndjson, csv ou mbox (padrão: deduzido do Content-Type)"),
+    db: AsyncSession = Depends(get_async_db),
+) -> EmailImportReport:
+    """
+    Importa e-mails em massa a partir do corpo da requisição.
+
+    O corpo é lido em streaming (sem carregar o arquivo inteiro) e pode ser:
+    - NDJSON: um objeto {sender, subject, body} por linha;
+    - CSV: com cabeçalho contendo as colunas sender, subject e body;
+    - mbox: remetente e assunto dos cabeçalhos, corpo da parte text/plain.
+
+    As linhas válidas são gravadas em lotes, uma transação por lote; as
+    inválidas não interrompem a importação e aparecem no relatório.
+
+    Args:
+        request (Request): requisição cujo corpo é o arquivo a importar.
+        format (str, optional): formato do arquivo; se omitido, usa o Content-Type
+            (application/x-ndjson, text/csv ou application/mbox).
+        db (AsyncSession, optional): sessão assíncrona de banco de dados injetada pelo Depends.
+
+    Returns:
+        EmailImportReport: totais recebidos, inseridos e com falha, e os erros por linha.
+
+    Raises:
+        HTTPException 415: Se o formato não for informado nem reconhecido.
+        HTTPException 400: Se o cabeçalho do CSV não tiver as colunas obrigatórias.
+    """
+    fmt = detect_format(format, request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail=f"Formato não suportado; use um de: {', '.join(FORMATS)}")
+    try:
+        return await import_emails(db, request.stream(), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
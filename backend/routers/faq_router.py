@@ -1,33 +1,97 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from backend.infrastructure.session import get_db
-from backend.repository.faq_repo import FAQRepo
-from backend.schemas.faq_schema import FAQRead, FAQCreate
+from backend.infrastructure.session import get_db, get_async_db
+from backend.infrastructure.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_stream, set_next_cursor
+from backend.infrastructure.response_cache import response_cache
+from backend.repository.faq_repo import AsyncFAQRepo
+from backend.schemas.faq_schema import FAQRead, FAQCreate, FAQSearchPage
+from backend.schemas.job_schema import JobSubmitted
+from backend.services.job_service import job_manager, JobQueueFull, PENDING
 
 router = APIRouter(prefix="/faq", tags=["FAQ"])
 
 @router.get("/", response_model=List[FAQRead])
-def list_faqs(db: Session = Depends(get_db)):
+async def list_faqs(
+    request: Request,
+    response: Response,
+    after_id: Optional[int] = Query(None, ge=0, description="Cursor: devolve itens com id maior que este"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Recupera todas as FAQs cadastradas no sistema.
+    Recupera as FAQs cadastradas no sistema, paginadas por id (keyset).
 
-    Este endpoint consulta o repositório de FAQs e retorna
-    a lista completa de perguntas e respostas no formato definido
-    pelo modelo FAQRead.
+    Cada página traz até `limit` FAQs em ordem de id; quando a página vem
+    cheia, o header X-Next-Cursor traz o `after_id` da próxima. Com
+    `format=ndjson` todas as FAQs (a partir de `after_id`) são enviadas em
+    stream, uma por linha, sem carregar a tabela na memória.
+
+    As páginas JSON ficam em cache e levam ETag: com `If-None-Match` igual
+    ao ETag atual a resposta é 304, sem acesso ao banco.
 
     Args:
-        db (Session, optional): sessão de banco de dados fornecida pelo Depends.
+        request (Request): requisição, usada como chave do cache e para o If-None-Match.
+        response (Response): resposta, onde vai o header X-Next-Cursor.
+        after_id (int, optional): cursor da página; só itens com id maior que ele.
+        limit (int, optional): tamanho da página (padrão 100, máximo 1000);
+            no modo ndjson, sem limite o stream percorre a tabela inteira.
+        format (str): "json" (página) ou "ndjson" (stream, um objeto por linha).
+        db (AsyncSession, optional): sessão assíncrona de banco de dados fornecida pelo Depends.
 
     Returns:
-        List[FAQRead]: lista de objetos FAQRead.
+        List[FAQRead]: página de objetos FAQRead.
+    """
+    if format == "ndjson":
+        return ndjson_stream(AsyncFAQRepo.page_query(after_id, limit))
+    limit = limit or DEFAULT_PAGE_SIZE
+
+    async def build():
+        faqs = await AsyncFAQRepo(db).list_page(after_id, limit)
+        set_next_cursor(response, faqs, limit)
+        return faqs
+
+    return await response_cache.respond(request, response, ("faqs",), List[FAQRead], build)
+
+@router.get("/search", response_model=FAQSearchPage)
+async def search_faqs(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description="Texto a buscar na pergunta, resposta e trecho"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+) -> FAQSearchPage:
     """
-    faqs = FAQRepo(db).list_all()
-    return faqs
+    Busca textual nas FAQs usando o índice FTS5 do SQLite.
+
+    A busca é feita inteiramente no banco: os resultados vêm ordenados por
+    relevância, paginados por `limit`/`offset` e com os termos encontrados
+    destacados em negrito (markdown) nos campos de snippet. Os resultados
+    ficam em cache (com ETag) até a próxima escrita em FAQs.
+
+    Args:
+        request (Request): requisição, usada como chave do cache e para o If-None-Match.
+        response (Response): resposta injetada pelo FastAPI.
+        q (str): Texto livre da busca; cada palavra é buscada por prefixo.
+        limit (int): Tamanho da página (1 a 100).
+        offset (int): Quantos resultados pular.
+        db (AsyncSession, optional): sessão assíncrona de banco de dados fornecida pelo Depends.
+
+    Returns:
+        FAQSearchPage: total de resultados e a página solicitada.
+    """
+    async def build():
+        total, items = await AsyncFAQRepo(db).search(q, limit=limit, offset=offset)
+        return {"total": total, "limit": limit, "offset": offset, "items": items}
+
+    return await response_cache.respond(request, response, ("faqs",), FAQSearchPage, build)
 
 @router.post("/", response_model=FAQRead)
-def create_or_update_faq(f: FAQCreate, db: Session = Depends(get_db)):
+async def create_or_update_faq(f: FAQCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Cria uma nova FAQ ou atualiza uma existente no sistema.
 
@@ -38,27 +102,28 @@ def create_or_update_faq(f: FAQCreate, db: Session = Depends(get_db)):
 
     Args:
         f (FAQCreate): objeto com os campos necessários para criação ou atualização da FAQ,
-        db (Session, optional): sessão de banco de dados fornecida pelo Depends.
+        db (AsyncSession, optional): sessão assíncrona de banco de dados fornecida pelo Depends.
 
     Returns:
         FAQRead: objeto contendo os dados da FAQ criada ou atualizada.
     """
-    faq = FAQRepo(db).upsert(
+    faq = await AsyncFAQRepo(db).upsert(
         question=f.question,
         answer=f.answer,
-        source=f.source
+        excerpt=f.excerpt,
+        link=f.link
     )
     return faq
 
 @router.delete("/", response_model=dict)
-def delete_faq(question: str, db: Session = Depends(get_db)):
+async def delete_faq(question: str, db: AsyncSession = Depends(get_async_db)):
     """
     Remove uma entrada de FAQ com base na pergunta fornecida.
 
     Args:
         question (str): A pergunta exata da FAQ a ser removida do banco de dados.
-        db (Session, optional): Sessão do SQLAlchemy para interação com o banco.  
-            Obtida automaticamente via Depends(get_db).
+        db (AsyncSession, optional): Sessão assíncrona do SQLAlchemy para interação com o banco.  
+            Obtida automaticamente via Depends(get_async_db).
 
     Returns:
         dict: Um dicionário contendo uma chave "message" com uma mensagem de sucesso
@@ -68,7 +133,7 @@ def delete_faq(question: str, db: Session = Depends(get_db)):
         - Se não houver FAQ correspondente à pergunta, retorna:
             {"message": "FAQ não encontrada"}
     """
-    deleted = FAQRepo(db).delete(question)
+    deleted = await AsyncFAQRepo(db).delete(question)
     if deleted:
         return {"message": "FAQ deletada com sucesso"}
     return {"message": "FAQ não encontrada"}
@@ -88,3 +153,23 @@ def generate_faqs(db: Session = Depends(get_db)):
     """
     from backend.services.faq_service import generate_and_save_faqs
     return generate_and_save_faqs()
+
+@router.post("/generate/async", response_model=JobSubmitted, status_code=202)
+def generate_faqs_async() -> JobSubmitted:
+    """
+    Enfileira a geração de FAQs e retorna imediatamente o ID do job.
+
+    O progresso pode ser acompanhado em `GET /jobs/{job_id}` ou pelo stream
+    SSE `GET /jobs/{job_id}/events`; o resultado fica em `GET /jobs/{job_id}/result`.
+
+    Returns:
+        JobSubmitted: ID do job criado e seu status inicial.
+
+    Raises:
+        HTTPException 503: Se a fila de jobs estiver cheia.
+    """
+    try:
+        job_id = job_manager.submit("faq", {})
+    except JobQueueFull:
+        raise HTTPException(status_code=503, detail="Fila de jobs cheia", headers={"Retry-After": "30"})
+    return {"job_id": job_id, "status": PENDING}
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.infrastructure.sse import format_sse, SSE_MEDIA_TYPE, SSE_HEADERS
+from backend.schemas.job_schema import JobOut, JobResult
+from backend.services.job_service import job_manager, TERMINAL_STATUSES, SUCCEEDED
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(job_id: str) -> JobOut:
+    """
+    Retorna o status e o progresso de um job de geração.
+
+    Args:
+        job_id (str): Identificador retornado na submissão do job.
+
+    Returns:
+        JobOut: Status (pending, running, succeeded, failed, cancelled),
+        progresso de 0 a 100 e a etapa atual.
+
+    Raises:
+        HTTPException 404: Se o job não existir.
+    """
+    snap = job_manager.snapshot(job_id)
+    if snap is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    return snap
+
+@router.get("/{job_id}/result", response_model=JobResult)
+def get_job_result(job_id: str) -> JobResult:
+    """
+    Retorna o resultado persistido de um job finalizado.
+
+    Args:
+        job_id (str): Identificador do job.
+
+    Returns:
+        JobResult: Status final e o resultado (FAQs geradas ou quiz completo).
+        Em caso de falha, `error` traz a mensagem.
+
+    Raises:
+        HTTPException 404: Se o job não existir.
+        HTTPException 409: Se o job ainda não terminou.
+    """
+    snap = job_manager.snapshot(job_id)
+    if snap is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    if snap["status"] not in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job ainda em andamento ({snap['status']})")
+    return job_manager.result(job_id)
+
+@router.get("/{job_id}/events", summary="Stream SSE de progresso do job")
+async def stream_job_events(job_id: str):
+    """
+    Envia eventos Server-Sent Events a cada mudança de progresso do job.
+
+    Cada evento `progress` carrega o mesmo conteúdo de `GET /jobs/{job_id}`.
+    Quando o job termina é enviado um evento final `done` (ou `error`),
+    e o stream é encerrado.
+
+    Args:
+        job_id (str): Identificador do job.
+
+    Raises:
+        HTTPException 404: Se o job não existir.
+    """
+    if job_manager.snapshot(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+
+    async def gen():
+        async for snap in job_manager.events(job_id):
+            if snap["status"] in TERMINAL_STATUSES:
+                event = "done" if snap["status"] == SUCCEEDED else "error"
+                yield format_sse(snap, event=event)
+            else:
+                yield format_sse(snap, event="progress")
+
+    return StreamingResponse(gen(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
+@router.delete("/{job_id}", response_model=JobOut, summary="Cancela um job")
+def cancel_job(job_id: str) -> JobOut:
+    """
+    Solicita o cancelamento de um job.
+
+    Jobs ainda na fila são cancelados na hora; jobs em execução param no
+    próximo ponto de checagem (entre as etapas da geração).
+
+    Args:
+        job_id (str): Identificador do job.
+
+    Returns:
+        JobOut: Estado do job logo após o pedido de cancelamento.
+
+    Raises:
+        HTTPException 404: Se o job não existir.
+        HTTPException 409: Se o job já tiver terminado.
+    """
+    if job_manager.cancel(job_id) is None:
+        snap = job_manager.snapshot(job_id)
+        if snap is None:
+            raise HTTPException(status_code=404, detail="Job não encontrado")
+        raise HTTPException(status_code=409, detail=f"Job já finalizado ({snap['status']})")
+    return job_manager.snapshot(job_id)
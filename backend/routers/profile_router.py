@@ -0,0 +1,81 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Dict, List, Optional
+
+from backend.infrastructure.profiling import profile_store
+from backend.schemas.profile_schema import ProfileInfo, ProfileDetail
+
+router = APIRouter(prefix="/admin/profiles", tags=["Admin"])
+
+_MEDIA_TYPES = {"speedscope": "application/json", "pstats": "application/octet-stream"}
+
+@router.get("/", response_model=List[ProfileInfo])
+def list_profiles(route: Optional[str] = Query(None, description="Filtra pela rota, ex.: /quiz/generate")) -> List[ProfileInfo]:
+    """
+    Lista os perfis guardados, do mais recente para o mais antigo.
+
+    Perfis são capturados com o header `X-Profile: sample|cprofile` ou por
+    amostragem (PROFILE_SAMPLE_RATE), quando PROFILING_ENABLED está ligado.
+
+    Args:
+        route (str, optional): Rota (template) cujos perfis devem ser listados.
+
+    Returns:
+        List[ProfileInfo]: Metadados de cada perfil.
+    """
+    return profile_store.list(route)
+
+@router.get("/{profile_id}", response_model=ProfileDetail)
+def get_profile(profile_id: str) -> ProfileDetail:
+    """
+    Retorna os metadados de um perfil e o resumo das funções mais pesadas.
+
+    Args:
+        profile_id (str): Identificador do perfil.
+
+    Returns:
+        ProfileDetail: Metadados e resumo do perfil.
+
+    Raises:
+        HTTPException 404: Se o perfil não existir (ou já tiver saído do buffer).
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado")
+    return profile
+
+@router.get("/{profile_id}/download", summary="Baixa o perfil (speedscope ou pstats)")
+def download_profile(profile_id: str) -> Response:
+    """
+    Baixa o perfil no formato nativo do modo de captura: JSON do speedscope
+    (modo sample; abra em https://www.speedscope.app) ou arquivo pstats
+    (modo cprofile; abra com `python -m pstats` ou snakeviz).
+
+    Args:
+        profile_id (str): Identificador do perfil.
+
+    Returns:
+        Response: Arquivo do perfil como anexo.
+
+    Raises:
+        HTTPException 404: Se o perfil não existir.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado")
+    ext = "speedscope.json" if profile["format"] == "speedscope" else "pstats"
+    return Response(
+        content=profile["data"],
+        media_type=_MEDIA_TYPES[profile["format"]],
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.{ext}"'},
+    )
+
+@router.delete("/", response_model=Dict[str, str])
+def clear_profiles() -> Dict[str, str]:
+    """
+    Descarta todos os perfis guardados.
+
+    Returns:
+        Dict[str, str]: Mensagem de confirmação.
+    """
+    profile_store.clear()
+    return {"message": "Perfis removidos"}
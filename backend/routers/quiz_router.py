@@ -1,38 +1,193 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from backend.infrastructure.session import get_db
-from backend.repository.quiz_repo import QuizRepo
-from backend.schemas.quiz_schema import QuizCreate, QuizOut, AnswerIn, AnswerOut
-from backend.services.quiz_service import generate_and_save_quiz, save_and_check_answer
+from backend.infrastructure.config import settings
+from backend.infrastructure.session import get_db, get_async_db, SessionLocal
+from backend.infrastructure.admission import RateLimited, too_many_requests, client_ip, check_token_budget, charge_tokens
+from backend.infrastructure.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_stream, set_next_cursor
+from backend.infrastructure.response_cache import response_cache
+from backend.repository.quiz_repo import QuizRepo, AsyncQuizRepo
+from backend.schemas.quiz_schema import (
+    QuizCreate, QuizOut, QuizSummary, AnswerIn, AnswerOut, AttemptIn, AttemptOut,
+    QuestionStatsOut, QuizStatsOut, ThemeStatsOut,
+)
+from backend.schemas.job_schema import JobSubmitted
+from backend.services.quiz_service import (
+    generate_and_save_quiz, asave_and_check_answer, stream_and_save_quiz, agrade_attempt, stats_to_dict,
+)
+from backend.services.job_service import job_manager, JobQueueFull, PENDING
 
 router = APIRouter(prefix="/quiz", tags=["Quiz"])
 
-@router.get("/", response_model=List[QuizOut])
-def list_quizzes(db: Session = Depends(get_db)) -> List[QuizOut]:
+def admit_quiz_generation(request: Request, q: QuizCreate) -> int:
     """
-    Recupera e retorna todos os quizzes registrados no sistema.
+    Cobra do saldo de tokens do IP uma estimativa do custo da geração
+    (n_questions × QUIZ_TOKENS_PER_QUESTION); sem saldo, 429 com Retry-After.
+    Retorna o valor cobrado.
+    """
+    ip = client_ip(request)
+    cost = q.n_questions * settings.QUIZ_TOKENS_PER_QUESTION
+    try:
+        check_token_budget(None, ip, cost)
+    except RateLimited as e:
+        raise too_many_requests(e)
+    charge_tokens(None, ip, cost)
+    return cost
+
+@router.get("/", response_model=List[QuizSummary])
+async def list_quizzes(
+    request: Request,
+    response: Response,
+    after_id: Optional[int] = Query(None, ge=0, description="Cursor: devolve itens com id maior que este"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[QuizSummary]:
+    """
+    Recupera a lista resumida dos quizzes registrados no sistema, paginada por id (keyset).
+
+    Apenas id, tema e número de perguntas são retornados;
+    o quiz completo fica em `GET /quiz/{quiz_id}`. Quando a página vem
+    cheia, o header X-Next-Cursor traz o `after_id` da próxima; com
+    `format=ndjson` os resumos vêm em stream, um por linha. As páginas JSON
+    ficam em cache e levam ETag (304 com `If-None-Match`).
+
+    Args:
+        request (Request): requisição, usada como chave do cache e para o If-None-Match.
+        response (Response): resposta, onde vai o header X-Next-Cursor.
+        after_id (int, optional): cursor da página; só itens com id maior que ele.
+        limit (int, optional): tamanho da página (padrão 100, máximo 1000);
+            no modo ndjson, sem limite o stream percorre a tabela inteira.
+        format (str): "json" (página) ou "ndjson" (stream, um objeto por linha).
+        db (AsyncSession, optional): Sessão assíncrona do SQLAlchemy utilizada para acesso
+            ao banco de dados. Obtida automaticamente via Depends(get_async_db).
+
+    Returns:
+        List[QuizSummary]: Página com o resumo de cada quiz.
+    """
+    if format == "ndjson":
+        return ndjson_stream(AsyncQuizRepo.summary_page_query(after_id, limit))
+    limit = limit or DEFAULT_PAGE_SIZE
+
+    async def build():
+        quizzes = await AsyncQuizRepo(db).list_summary_page(after_id, limit)
+        set_next_cursor(response, quizzes, limit)
+        return quizzes
+
+    return await response_cache.respond(request, response, ("quizzes",), List[QuizSummary], build)
+
+@router.get("/stats/theme", response_model=ThemeStatsOut, summary="Estatísticas de um tema")
+async def get_theme_stats(theme: str, db: AsyncSession = Depends(get_async_db)) -> ThemeStatsOut:
+    """
+    Retorna as estatísticas acumuladas de um tema (todas as respostas de
+    todos os quizzes do tema), lidas do agregado mantido a cada correção.
+
+    Args:
+        theme (str): Tema do quiz; é normalizado (caixa, acentos, stopwords).
+        db (AsyncSession, optional): Sessão assíncrona do SQLAlchemy utilizada para acesso
+            ao banco de dados. Obtida automaticamente via Depends(get_async_db).
+
+    Returns:
+        ThemeStatsOut: Nº de respostas, acertos, taxa de acerto e tempo médio.
+
+    Raises:
+        HTTPException 404: Se o tema ainda não tiver respostas.
+    """
+    stats = await AsyncQuizRepo(db).get_theme_stats(theme)
+    if not stats:
+        raise HTTPException(status_code=404, detail="Sem estatísticas para este tema")
+    return {"theme": stats.theme, "theme_key": stats.theme_key, **stats_to_dict(stats)}
+
+@router.get("/questions/{question_id}/stats", response_model=QuestionStatsOut, summary="Estatísticas de uma pergunta")
+async def get_question_stats(question_id: int, db: AsyncSession = Depends(get_async_db)) -> QuestionStatsOut:
+    """
+    Retorna as estatísticas acumuladas de uma pergunta.
+
+    Args:
+        question_id (int): Identificador da pergunta.
+        db (AsyncSession, optional): Sessão assíncrona do SQLAlchemy utilizada para acesso
+            ao banco de dados. Obtida automaticamente via Depends(get_async_db).
+
+    Returns:
+        QuestionStatsOut: Nº de respostas, acertos, taxa de acerto e tempo médio.
+
+    Raises:
+        HTTPException 404: Se a pergunta ainda não tiver respostas.
+    """
+    stats = await AsyncQuizRepo(db).get_question_stats(question_id)
+    if not stats:
+        raise HTTPException(status_code=404, detail="Sem estatísticas para esta pergunta")
+    return {"question_id": stats.question_id, "quiz_id": stats.quiz_id, **stats_to_dict(stats)}
+
+@router.get("/{quiz_id}/stats", response_model=QuizStatsOut, summary="Estatísticas por pergunta de um quiz")
+async def get_quiz_stats(quiz_id: int, db: AsyncSession = Depends(get_async_db)) -> QuizStatsOut:
+    """
+    Retorna as estatísticas de cada pergunta já respondida de um quiz.
+
+    Args:
+        quiz_id (int): Identificador do quiz.
+        db (AsyncSession, optional): Sessão assíncrona do SQLAlchemy utilizada para acesso
+            ao banco de dados. Obtida automaticamente via Depends(get_async_db).
+
+    Returns:
+        QuizStatsOut: Lista de estatísticas por pergunta (vazia se ninguém respondeu).
+    """
+    rows = await AsyncQuizRepo(db).list_quiz_question_stats(quiz_id)
+    return {
+        "quiz_id": quiz_id,
+        "questions": [
+            {"question_id": s.question_id, "quiz_id": s.quiz_id, **stats_to_dict(s)}
+            for s in rows
+        ],
+    }
+
+@router.get("/{quiz_id}", response_model=QuizOut)
+async def get_quiz(
+    quiz_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+) -> QuizOut:
+    """
+    Retorna um quiz completo, com perguntas e alternativas.
+
+    A resposta fica em cache e leva ETag; com `If-None-Match` igual ao ETag
+    atual a resposta é 304, sem acesso ao banco.
 
     Args:
-        db (Session, optional): Sessão do SQLAlchemy utilizada para acesso
-            ao banco de dados. Obtida automaticamente via Depends(get_db).
+        quiz_id (int): Identificador do quiz.
+        request (Request): requisição, usada como chave do cache e para o If-None-Match.
+        response (Response): resposta injetada pelo FastAPI.
+        db (AsyncSession, optional): Sessão assíncrona do SQLAlchemy utilizada para acesso
+            ao banco de dados. Obtida automaticamente via Depends(get_async_db).
 
     Returns:
-        List[QuizOut]: Uma lista de instâncias de QuizOut, cada uma representando
-        um quiz disponível.
+        QuizOut: Quiz com todas as perguntas e alternativas.
+
+    Raises:
+        HTTPException 404: Se o quiz não existir.
     """
-    quizzes = QuizRepo(db).list_quizzes()
-    return quizzes
+    async def build():
+        quiz = await AsyncQuizRepo(db).get_quiz_with_questions(quiz_id)
+        if not quiz:
+            raise HTTPException(status_code=404, detail="Quiz não encontrado")
+        return quiz
+
+    return await response_cache.respond(request, response, ("quizzes",), QuizOut, build)
 
 @router.post("/generate", response_model=QuizOut)
-def create_quiz(q: QuizCreate, db: Session = Depends(get_db)) -> QuizOut:
+def create_quiz(q: QuizCreate, request: Request, db: Session = Depends(get_db)) -> QuizOut:
     """
     Cria um novo quiz com base nos dados fornecidos, salva-o no banco de dados
     e retorna o quiz completo, incluindo as perguntas.
 
     Args:
         q (QuizCreate): Dados necessários para criar o quiz.
+        request (Request): requisição, usada para identificar o IP no limite de tokens.
         db (Session, optional): Sessão do SQLAlchemy para operação no banco de dados.
             Obtida automaticamente via Depends(get_db).
 
@@ -42,23 +197,90 @@ def create_quiz(q: QuizCreate, db: Session = Depends(get_db)) -> QuizOut:
     Raises:
         HTTPException: Lança um erro 500 se não for possível recuperar o quiz
             gerado após a criação.
+        HTTPException 429: Se o IP estiver sem saldo de tokens.
     """
+    admit_quiz_generation(request, q)
     quiz_id = generate_and_save_quiz(db, q)
     quiz = QuizRepo(db).get_quiz_with_questions(quiz_id)
     if not quiz:
         raise HTTPException(status_code=500, detail="Falha ao recuperar quiz gerado")
     return quiz
+
+@router.post("/generate/stream", summary="Gera um quiz em streaming (NDJSON)")
+def create_quiz_stream(q: QuizCreate, request: Request) -> StreamingResponse:
+    """
+    Gera um quiz e envia cada pergunta assim que ela fica pronta.
+
+    A resposta é NDJSON (um objeto JSON por linha). A primeira linha traz o
+    quiz criado (`event: quiz`), depois vem uma linha `event: question` por
+    pergunta, já salva no banco e pronta para ser respondida, e por fim
+    `event: done` com o total gerado. Em caso de falha é enviado
+    `event: error`; as perguntas já emitidas continuam válidas.
+
+    Args:
+        q (QuizCreate): Tema e número de perguntas do quiz.
+        request (Request): requisição, usada para identificar o IP no limite de tokens.
+
+    Returns:
+        StreamingResponse: stream `application/x-ndjson` com os eventos acima.
+
+    Raises:
+        HTTPException 429: Se o IP estiver sem saldo de tokens.
+    """
+    admit_quiz_generation(request, q)
+
+    def gen():
+        # Sessão própria: o stream continua depois que o handler retorna
+        db = SessionLocal()
+        try:
+            for event in stream_and_save_quiz(db, q):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(gen(), media_type="application/x-ndjson")
+
+@router.post("/generate/async", response_model=JobSubmitted, status_code=202)
+def create_quiz_async(q: QuizCreate, request: Request) -> JobSubmitted:
+    """
+    Enfileira a geração de um quiz e retorna imediatamente o ID do job.
+
+    O progresso pode ser acompanhado em `GET /jobs/{job_id}` ou pelo stream
+    SSE `GET /jobs/{job_id}/events`; o quiz completo fica em `GET /jobs/{job_id}/result`.
+
+    Args:
+        q (QuizCreate): Tema e número de perguntas do quiz.
+        request (Request): requisição, usada para identificar o IP no limite de tokens.
+
+    Returns:
+        JobSubmitted: ID do job criado e seu status inicial.
+
+    Raises:
+        HTTPException 429: Se o IP estiver sem saldo de tokens.
+        HTTPException 503: Se a fila de jobs estiver cheia.
+    """
+    cost = admit_quiz_generation(request, q)
+    try:
+        job_id = job_manager.submit("quiz", {"theme": q.theme, "n_questions": q.n_questions})
+    except JobQueueFull:
+        # O job não vai rodar: devolve a estimativa cobrada
+        charge_tokens(None, client_ip(request), -cost)
+        raise HTTPException(status_code=503, detail="Fila de jobs cheia", headers={"Retry-After": "30"})
+    return {"job_id": job_id, "status": PENDING}
  
 @router.post("/{quiz_id}/answer", response_model=AnswerOut, summary="Registra e avalia uma resposta de quiz")
-def answer_question(quiz_id: int, ans: AnswerIn, db: Session = Depends(get_db)) -> AnswerOut:
+async def answer_question(quiz_id: int, ans: AnswerIn, db: AsyncSession = Depends(get_async_db)) -> AnswerOut:
     """
     Registra a resposta de uma pergunta de um quiz e retorna o resultado da avaliação.
 
+    A correção usa o gabarito do quiz em cache: depois da primeira resposta
+    do quiz, nenhuma leitura no banco é feita, apenas a gravação da resposta.
+
     Args:
         quiz_id (int): Identificador do quiz no qual a resposta está sendo registrada.
         ans (AnswerIn): Dados da resposta.
-        db (Session, optional): Sessão do SQLAlchemy para operações de banco de dados.
-            Obtida automaticamente via Depends(get_db).
+        db (AsyncSession, optional): Sessão assíncrona do SQLAlchemy para operações de banco de dados.
+            Obtida automaticamente via Depends(get_async_db).
 
     Returns:
         AnswerOut: Objeto contendo o resultado da avaliação.
@@ -68,26 +290,53 @@ def answer_question(quiz_id: int, ans: AnswerIn, db: Session = Depends(get_db))
         HTTPException 404: Se a pergunta especificada por `ans.question_id` não for encontrada
             dentro do quiz.
     """
-    # Verifica se o quiz existe
-    if not QuizRepo(db).get_quiz_with_questions(quiz_id):
-        raise HTTPException(status_code=404, detail="Quiz não encontrado")
-
-    # Chama o serviço que salva e avalia
-    result = save_and_check_answer(quiz_id=quiz_id,question_id=ans.question_id, given_answer=ans.given_answer, db=db)
+    # Chama o serviço que avalia (via gabarito em cache) e salva
+    result = await asave_and_check_answer(
+        quiz_id=quiz_id,
+        question_id=ans.question_id,
+        given_answer=ans.given_answer,
+        db=db,
+        time_spent_ms=ans.time_spent_ms
+    )
     if result is None:
         raise HTTPException(status_code=404, detail="Pergunta não encontrada")
     
     return result
 
+@router.post("/{quiz_id}/attempts", response_model=AttemptOut, summary="Corrige e registra uma tentativa completa")
+async def submit_attempt(quiz_id: int, attempt: AttemptIn, db: AsyncSession = Depends(get_async_db)) -> AttemptOut:
+    """
+    Corrige todas as respostas de uma tentativa de quiz de uma só vez e
+    grava a tentativa e as respostas numa única transação.
+
+    Args:
+        quiz_id (int): Identificador do quiz.
+        attempt (AttemptIn): Lista de respostas (question_id e given_answer).
+        db (AsyncSession, optional): Sessão assíncrona do SQLAlchemy para operações de banco de dados.
+            Obtida automaticamente via Depends(get_async_db).
+
+    Returns:
+        AttemptOut: ID da tentativa, placar e o resultado de cada resposta.
+
+    Raises:
+        HTTPException 404: Se o quiz não existir ou alguma pergunta não pertencer a ele.
+        HTTPException 400: Se a mesma pergunta aparecer mais de uma vez.
+    """
+    answers = [
+        {"question_id": a.question_id, "given_answer": a.given_answer, "time_spent_ms": a.time_spent_ms}
+        for a in attempt.answers
+    ]
+    return await agrade_attempt(quiz_id, answers, db)
+
 @router.delete("/{quiz_id}", response_model=Dict[str, str], summary="Deleta um quiz")
-def delete_quiz(quiz_id: int, db: Session = Depends(get_db)) -> Dict[str, str]:
+async def delete_quiz(quiz_id: int, db: AsyncSession = Depends(get_async_db)) -> Dict[str, str]:
     """
     Exclui um quiz pelo seu identificador e retorna uma mensagem de confirmação.
 
     Args:
         quiz_id (int): Identificador do quiz a ser removido.
-        db (Session, optional): Sessão do SQLAlchemy para operações no banco de dados.
-            Obtida automaticamente via Depends(get_db).
+        db (AsyncSession, optional): Sessão assíncrona do SQLAlchemy para operações no banco de dados.
+            Obtida automaticamente via Depends(get_async_db).
 
     Returns:
         Dict[str, str]: Dicionário contendo a chave "message" com a mensagem de sucesso:
@@ -96,7 +345,7 @@ def delete_quiz(quiz_id: int, db: Session = Depends(get_db)) -> Dict[str, str]:
     Raises:
         HTTPException 404: Se não existir quiz correspondente ao `quiz_id` informado.
     """
-    deleted = QuizRepo(db).delete_quiz(quiz_id)
+    deleted = await AsyncQuizRepo(db).delete_quiz(quiz_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Quiz não encontrado")
     return {"message": "Quiz deletado com sucesso"}
@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from backend.infrastructure.session import get_async_db
+from backend.repository.usage_repo import AsyncUsageRepo
+from backend.schemas.usage_schema import UsageTotals, SessionUsage, SessionUsageDetail, UsagePoint
+
+router = APIRouter(prefix="/usage", tags=["Usage"])
+
+@router.get("/totals", response_model=UsageTotals)
+async def usage_totals(db: AsyncSession = Depends(get_async_db)) -> UsageTotals:
+    """
+    Retorna o total de mensagens e tokens consumidos, geral e por modelo.
+
+    Args:
+        db (AsyncSession, optional): sessão assíncrona de banco de dados fornecida pelo Depends.
+
+    Returns:
+        UsageTotals: totais gerais e a lista por modelo.
+    """
+    return await AsyncUsageRepo(db).totals()
+
+@router.get("/sessions/top", response_model=List[SessionUsage])
+async def top_sessions(
+    limit: int = Query(10, ge=1, le=100),
+    since: Optional[str] = Query(None, description="Data inicial YYYY-MM-DD (inclusiva)"),
+    until: Optional[str] = Query(None, description="Data final YYYY-MM-DD (inclusiva)"),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[SessionUsage]:
+    """
+    Retorna as sessões de chat que mais consumiram tokens.
+
+    Sem período, o ranking considera todo o histórico; com `since`/`until`,
+    apenas os dias do intervalo.
+
+    Args:
+        limit (int): Quantas sessões retornar (1 a 100).
+        since (str, optional): Primeiro dia do período.
+        until (str, optional): Último dia do período.
+        db (AsyncSession, optional): sessão assíncrona de banco de dados fornecida pelo Depends.
+
+    Returns:
+        List[SessionUsage]: sessões em ordem decrescente de tokens.
+    """
+    return await AsyncUsageRepo(db).top_sessions(limit=limit, since=since, until=until)
+
+@router.get("/sessions/{session_id}", response_model=SessionUsageDetail)
+async def session_usage(session_id: str, db: AsyncSession = Depends(get_async_db)) -> SessionUsageDetail:
+    """
+    Retorna o consumo acumulado de uma sessão de chat.
+
+    Args:
+        session_id (str): Identificador da sessão.
+        db (AsyncSession, optional): sessão assíncrona de banco de dados fornecida pelo Depends.
+
+    Returns:
+        SessionUsageDetail: totais da sessão e as datas da primeira e última mensagem.
+
+    Raises:
+        HTTPException 404: Se a sessão não tiver mensagens registradas.
+    """
+    usage = await AsyncUsageRepo(db).session_totals(session_id)
+    if usage is None:
+        raise HTTPException(status_code=404, detail="Sessão não encontrada")
+    return usage
+
+@router.get("/timeseries", response_model=List[UsagePoint])
+async def usage_timeseries(
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+    since: Optional[str] = Query(None, description="Bucket inicial (YYYY-MM-DD ou YYYY-MM-DD HH:00)"),
+    until: Optional[str] = Query(None, description="Bucket final (YYYY-MM-DD ou YYYY-MM-DD HH:00)"),
+    session_id: Optional[str] = None,
+    model: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> List[UsagePoint]:
+    """
+    Retorna o consumo de tokens por hora ou por dia.
+
+    Args:
+        granularity (str): "hour" ou "day".
+        since (str, optional): Primeiro bucket do período (inclusivo).
+        until (str, optional): Último bucket do período (inclusivo).
+        session_id (str, optional): Restringe a uma sessão.
+        model (str, optional): Restringe a um modelo.
+        db (AsyncSession, optional): sessão assíncrona de banco de dados fornecida pelo Depends.
+
+    Returns:
+        List[UsagePoint]: um ponto por bucket com uso, em ordem cronológica.
+    """
+    return await AsyncUsageRepo(db).timeseries(
+        granularity=granularity, since=since, until=until, session_id=session_id, model=model
+    )
@@ -1,5 +1,6 @@
 # backend/schemas/email_schema.py
 from pydantic import BaseModel
+from typing import List
 
 class EmailBase(BaseModel):
     sender: str
@@ -14,3 +15,15 @@ class EmailRead(EmailBase):
 
     class Config:
         orm_mode = True
+
+class EmailImportError(BaseModel):
+    row: int        # nº do registro no arquivo (linha, registro CSV ou mensagem mbox)
+    error: str
+
+class EmailImportReport(BaseModel):
+    format: str
+    received: int
+    inserted: int
+    failed: int
+    errors: List[EmailImportError]
+    errors_truncated: bool = False
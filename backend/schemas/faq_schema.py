@@ -1,5 +1,6 @@
 # backend/schemas/faq_schema.py
 from pydantic import BaseModel
+from typing import List, Optional
 
 class FAQBase(BaseModel):
     question: str
@@ -15,3 +16,14 @@ class FAQRead(FAQBase):
 
     class Config:
         orm_mode = True
+
+class FAQSearchHit(FAQRead):
+    rank: float                        # bm25: quanto menor, mais relevante
+    question_snippet: Optional[str] = None
+    answer_snippet: Optional[str] = None
+
+class FAQSearchPage(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    items: List[FAQSearchHit]
@@ -0,0 +1,21 @@
+# backend/schemas/job_schema.py
+from pydantic import BaseModel
+from typing import Any, Optional
+
+class JobSubmitted(BaseModel):
+    job_id: str
+    status: str
+
+class JobOut(BaseModel):
+    id: str
+    kind: str
+    status: str
+    progress: int          # 0..100
+    message: Optional[str] = None
+    error: Optional[str] = None
+
+class JobResult(BaseModel):
+    id: str
+    status: str
+    result: Any = None     # lista de FAQs ou quiz completo, conforme o tipo do job
+    error: Optional[str] = None
@@ -0,0 +1,18 @@
+# backend/schemas/profile_schema.py
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Any, Dict, List
+
+class ProfileInfo(BaseModel):
+    id: str
+    route: str             # rota casada (ex.: /quiz/{quiz_id}) ou o path, se não casou
+    method: str
+    path: str
+    status: int
+    mode: str              # sample | cprofile
+    format: str            # speedscope | pstats
+    duration_ms: float
+    created_at: datetime
+
+class ProfileDetail(ProfileInfo):
+    summary: List[Dict[str, Any]]   # funções mais pesadas (amostras ou tempo acumulado)
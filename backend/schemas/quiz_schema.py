@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from backend.infrastructure.config import settings
 
 class Answer(BaseModel):
     given_answer: str
@@ -19,6 +21,11 @@ class Question(BaseModel):
         orm_mode = True
 
 class QuizCreate(BaseModel):
+    theme: str
+    n_questions: int = Field(..., ge=1, le=settings.QUIZ_MAX_QUESTIONS)
+
+class QuizSummary(BaseModel):
+    id: int
     theme: str
     n_questions: int
 
@@ -34,6 +41,7 @@ class QuizOut(BaseModel):
 class AnswerIn(BaseModel):
     question_id: int
     given_answer: str
+    time_spent_ms: Optional[int] = None   # tempo que o aluno levou para responder
  
 class AnswerOut(BaseModel):
     question_id: int
@@ -44,3 +52,31 @@ class AnswerOut(BaseModel):
 
     class Config:
         orm_mode = True
+
+class AttemptIn(BaseModel):
+    answers: List[AnswerIn]
+
+class AttemptOut(BaseModel):
+    attempt_id: int
+    quiz_id: int
+    n_answered: int
+    n_correct: int
+    results: List[AnswerOut]
+
+class StatsOut(BaseModel):
+    attempts: int
+    correct: int
+    correct_rate: float
+    mean_time_ms: Optional[float] = None   # None se nenhuma resposta informou tempo
+
+class QuestionStatsOut(StatsOut):
+    question_id: int
+    quiz_id: int
+
+class QuizStatsOut(BaseModel):
+    quiz_id: int
+    questions: List[QuestionStatsOut]
+
+class ThemeStatsOut(StatsOut):
+    theme: str
+    theme_key: str
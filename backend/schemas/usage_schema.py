@@ -0,0 +1,26 @@
+# backend/schemas/usage_schema.py
+from datetime import datetime
+from pydantic import BaseModel
+from typing import List
+
+class UsageCounts(BaseModel):
+    messages: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+class ModelUsage(UsageCounts):
+    model: str                 # "" para mensagens antigas, sem modelo registrado
+
+class UsageTotals(UsageCounts):
+    by_model: List[ModelUsage]
+
+class SessionUsage(UsageCounts):
+    session_id: str
+
+class SessionUsageDetail(SessionUsage):
+    first_at: datetime
+    last_at: datetime
+
+class UsagePoint(UsageCounts):
+    bucket: str                # "YYYY-MM-DD HH:00" ou "YYYY-MM-DD" (UTC)
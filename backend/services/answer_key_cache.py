@@ -0,0 +1,121 @@
+# backend/services/answer_key_cache.py
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.infrastructure.config import settings
+from backend.models.quiz import Quiz, Question
+
+# {"theme": tema do quiz, "questions": {question_id: {"correct": letra, "explanation": ..., "prompt": ...}}}
+AnswerKey = Dict[str, Any]
+
+class AnswerKeyCache:
+    """
+    Gabarito por quiz em memória (LRU), carregado com uma única query na
+    primeira correção. Depois disso, corrigir uma resposta não lê o banco.
+    O QuizRepo invalida a entrada quando o quiz muda ou é removido.
+
+    Enquanto um gabarito está sendo lido, as invalidações do quiz são
+    contadas; um gabarito lido antes de uma invalidação (ex.: pergunta
+    adicionada durante a geração em stream) é devolvido a quem leu, mas não
+    entra no cache. Só quizzes com leitura em andamento ficam em `_reads`.
+    """
+    def __init__(self, max_quizzes: int):
+        self.max_quizzes = max_quizzes
+        self._lock = threading.Lock()
+        self._keys: "OrderedDict[int, AnswerKey]" = OrderedDict()
+        self._reads: Dict[int, List[int]] = {}   # quiz_id -> [geração, leituras em andamento]
+
+    def get(self, db: Session, quiz_id: int) -> Optional[AnswerKey]:
+        """
+        Retorna o gabarito do quiz, ou None se o quiz não existir.
+        """
+        key = self._cached(quiz_id)
+        if key is None:
+            generation = self._begin_read(quiz_id)
+            try:
+                key = self._build(db.execute(self._query(quiz_id)).all())
+            finally:
+                self._finish_read(quiz_id, generation, key)
+        return key
+
+    async def aget(self, db: AsyncSession, quiz_id: int) -> Optional[AnswerKey]:
+        """
+        Versão assíncrona de `get`; o cache é o mesmo.
+        """
+        key = self._cached(quiz_id)
+        if key is None:
+            generation = self._begin_read(quiz_id)
+            try:
+                key = self._build((await db.execute(self._query(quiz_id))).all())
+            finally:
+                self._finish_read(quiz_id, generation, key)
+        return key
+
+    def invalidate(self, quiz_id: int) -> None:
+        with self._lock:
+            self._keys.pop(quiz_id, None)
+            read = self._reads.get(quiz_id)
+            if read is not None:
+                read[0] += 1
+
+    def _begin_read(self, quiz_id: int) -> int:
+        """Registra uma leitura do banco e retorna a geração atual do quiz."""
+        with self._lock:
+            read = self._reads.setdefault(quiz_id, [0, 0])
+            read[1] += 1
+            return read[0]
+
+    def _cached(self, quiz_id: int) -> Optional[AnswerKey]:
+        with self._lock:
+            key = self._keys.get(quiz_id)
+            if key is not None:
+                self._keys.move_to_end(quiz_id)
+            return key
+
+    def _finish_read(self, quiz_id: int, generation: int, key: Optional[AnswerKey]) -> None:
+        """Encerra a leitura e guarda `key` se o quiz não foi invalidado nesse meio-tempo."""
+        with self._lock:
+            read = self._reads[quiz_id]
+            read[1] -= 1
+            if read[1] == 0:
+                del self._reads[quiz_id]
+            if key is None or read[0] != generation:
+                # Invalidado durante a leitura: o gabarito pode estar velho
+                return
+            self._keys[quiz_id] = key
+            self._keys.move_to_end(quiz_id)
+            while len(self._keys) > self.max_quizzes:
+                self._keys.popitem(last=False)
+
+    @staticmethod
+    def _query(quiz_id: int):
+        return (
+            select(Quiz.theme, Question.id, Question.correct_answer, Question.explanation, Question.prompt)
+            .outerjoin(Question, Question.quiz_id == Quiz.id)
+            .where(Quiz.id == quiz_id)
+        )
+
+    @staticmethod
+    def _build(rows) -> Optional[AnswerKey]:
+        if not rows:
+            return None
+        return {
+            "theme": rows[0].theme,
+            "questions": {
+                r.id: {
+                    "correct": r.correct_answer.strip().upper(),
+                    "explanation": r.explanation,
+                    "prompt": r.prompt,
+                }
+                for r in rows
+                if r.id is not None
+            },
+        }
+
+answer_key_cache = AnswerKeyCache(max_quizzes=settings.ANSWER_KEY_CACHE_SIZE)
@@ -0,0 +1,103 @@
+# backend/services/chat_coalescer.py
+
+import asyncio
+import hashlib
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from backend.services.text_utils import normalize_text
+
+class FlightCancelled(RuntimeError):
+    """O stream compartilhado foi cancelado antes de terminar."""
+
+class _Flight:
+    """Um stream do LLM em andamento e o que ele já produziu."""
+    def __init__(self, key: str):
+        self.key = key
+        self.chunks: List[str] = []
+        self.done = False
+        self.cancelling = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.changed = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+class ChatCoalescer:
+    """
+    Single-flight para o chat: perguntas iguais (texto normalizado) com o
+    mesmo contexto recuperado, chegando enquanto uma resposta ainda está
+    sendo gerada, compartilham um único stream do LLM.
+
+    O stream roda numa task própria e guarda os pedaços; cada cliente lê
+    desde o início, então quem chega depois recebe o prefixo já gerado e
+    segue acompanhando. Se todos os clientes desistirem, o stream é
+    cancelado. Terminado o stream, a entrada sai do mapa: a próxima
+    pergunta igual gera uma resposta nova (não é um cache de respostas).
+    """
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+
+    @staticmethod
+    def key(question: str, context: str) -> str:
+        context_hash = hashlib.sha256(context.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{normalize_text(question)}\0{context_hash}".encode("utf-8")).hexdigest()
+
+    def join(self, key: str, producer: Callable[[], AsyncIterator[str]]) -> Tuple[AsyncIterator[str], bool]:
+        """
+        Entra no stream da chave, iniciando-o com `producer()` se não
+        houver um em andamento. Retorna (pedaços da resposta, é o líder).
+        """
+        flight = self._flights.get(key)
+        # Um stream já abandonado (cancelamento em curso) não recebe ninguém novo
+        leader = flight is None or flight.cancelling or flight.done
+        if leader:
+            flight = self._flights[key] = _Flight(key)
+            flight.task = asyncio.create_task(self._run(key, flight, producer))
+        flight.subscribers += 1
+        return self._subscribe(flight), leader
+
+    async def _run(self, key: str, flight: _Flight, producer: Callable[[], AsyncIterator[str]]) -> None:
+        try:
+            async for chunk in producer():
+                async with flight.changed:
+                    flight.chunks.append(chunk)
+                    flight.changed.notify_all()
+        except BaseException as e:
+            flight.error = e
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            async with flight.changed:
+                flight.done = True
+                flight.changed.notify_all()
+
+    async def _subscribe(self, flight: _Flight) -> AsyncIterator[str]:
+        i = 0
+        try:
+            while True:
+                async with flight.changed:
+                    await flight.changed.wait_for(lambda: len(flight.chunks) > i or flight.done)
+                    pending = flight.chunks[i:]
+                    finished = flight.done
+                for chunk in pending:
+                    yield chunk
+                i += len(pending)
+                if finished and i >= len(flight.chunks):
+                    break
+            if isinstance(flight.error, asyncio.CancelledError):
+                # O cancelamento é do stream compartilhado, não de quem lê:
+                # chega como erro comum para o cliente ser avisado
+                raise FlightCancelled("stream do LLM cancelado") from flight.error
+            if flight.error is not None:
+                raise flight.error
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done and flight.task is not None:
+                # Sai do mapa já: quem chegar agora começa um stream novo
+                flight.cancelling = True
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+                flight.task.cancel()
+
+chat_coalescer = ChatCoalescer()
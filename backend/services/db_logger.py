@@ -1,27 +1,132 @@
 # backend/services/db_logger.py
 
 import uuid
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.models.message import Message
+from backend.models.message import Message, FAQHit
+from backend.infrastructure.db_writer import serialized, async_serialized
+from backend.infrastructure.metrics import DB_COMMIT_SECONDS
+from backend.repository.usage_repo import usage_rollup_statements
 
 def new_session_id() -> str:
     """Gera um UUID para identificar a sessão de chat."""
     return str(uuid.uuid4())
 
+def _message(session_id, role, content, prompt_tokens, completion_tokens, model) -> Message:
+    # Timestamp definido aqui para que mensagem e buckets dos agregados coincidam
+    return Message(
+        session_id=session_id,
+        role=role,
+        content=content,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        model=model,
+        timestamp=datetime.now(timezone.utc)
+    )
+
+@serialized
 def log_message(
     db: Session,
     session_id: str,
     role: str,
     content: str,
     prompt_tokens: int = 0,
-    completion_tokens: int = 0
+    completion_tokens: int = 0,
+    model: Optional[str] = None
+) -> None:
+    """Grava a mensagem e soma os tokens nos agregados de uso, na mesma transação."""
+    msg = _message(session_id, role, content, prompt_tokens, completion_tokens, model)
+    db.add(msg)
+    for stmt in usage_rollup_statements(session_id, model, prompt_tokens, completion_tokens, msg.timestamp):
+        db.execute(stmt)
+    with DB_COMMIT_SECONDS.time(op="log_message"):
+        db.commit()
+
+@serialized
+def log_faq_hit(
+    db: Session,
+    session_id: str,
+    faq_id: int,
+    score: float,
+    saved_prompt_tokens: int = 0,
+    saved_completion_tokens: int = 0
 ) -> None:
-    msg = Message(
+    """Registra uma pergunta respondida pelo atalho de FAQ (sem LLM)."""
+    hit = FAQHit(
         session_id=session_id,
-        role=role,
-        content=content,
-        prompt_tokens=prompt_tokens,
-        completion_tokens=completion_tokens
+        faq_id=faq_id,
+        score=score,
+        saved_prompt_tokens=saved_prompt_tokens,
+        saved_completion_tokens=saved_completion_tokens
     )
+    db.add(hit)
+    with DB_COMMIT_SECONDS.time(op="log_faq_hit"):
+        db.commit()
+
+@async_serialized
+async def alog_message(
+    db: AsyncSession,
+    session_id: str,
+    role: str,
+    content: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    model: Optional[str] = None
+) -> None:
+    """Versão assíncrona de `log_message`."""
+    msg = _message(session_id, role, content, prompt_tokens, completion_tokens, model)
     db.add(msg)
-    db.commit()
\ No newline at end of file
+    for stmt in usage_rollup_statements(session_id, model, prompt_tokens, completion_tokens, msg.timestamp):
+        await db.execute(stmt)
+    with DB_COMMIT_SECONDS.time(op="log_message"):
+        await db.commit()
+
+@async_serialized
+async def alog_faq_hit(
+    db: AsyncSession,
+    session_id: str,
+    faq_id: int,
+    score: float,
+    saved_prompt_tokens: int = 0,
+    saved_completion_tokens: int = 0
+) -> None:
+    """Versão assíncrona de `log_faq_hit`."""
+    db.add(FAQHit(
+        session_id=session_id,
+        faq_id=faq_id,
+        score=score,
+        saved_prompt_tokens=saved_prompt_tokens,
+        saved_completion_tokens=saved_completion_tokens
+    ))
+    with DB_COMMIT_SECONDS.time(op="log_faq_hit"):
+        await db.commit()
+
+_USER_QUESTIONS = select(func.count(Message.id)).where(Message.role == "user")
+_FAQ_HIT_TOTALS = select(
+    func.count(FAQHit.id),
+    func.coalesce(func.sum(FAQHit.saved_prompt_tokens), 0),
+    func.coalesce(func.sum(FAQHit.saved_completion_tokens), 0),
+)
+
+def faq_hit_stats(db: Session) -> dict:
+    """Taxa de acerto do atalho de FAQ e tokens economizados."""
+    questions = db.execute(_USER_QUESTIONS).scalar() or 0
+    return _hit_stats(questions, db.execute(_FAQ_HIT_TOTALS).one())
+
+async def afaq_hit_stats(db: AsyncSession) -> dict:
+    """Versão assíncrona de `faq_hit_stats`."""
+    questions = (await db.execute(_USER_QUESTIONS)).scalar() or 0
+    return _hit_stats(questions, (await db.execute(_FAQ_HIT_TOTALS)).one())
+
+def _hit_stats(questions: int, totals) -> dict:
+    hits, saved_prompt, saved_completion = totals
+    return {
+        "questions": questions,
+        "faq_hits": hits,
+        "hit_rate": hits / questions if questions else 0.0,
+        "saved_prompt_tokens": saved_prompt,
+        "saved_completion_tokens": saved_completion,
+    }
@@ -2,13 +2,13 @@
 from langchain_community.document_loaders import UnstructuredURLLoader
 from langchain_community.vectorstores import FAISS
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
 
 import requests
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 
 from backend.infrastructure.config import settings
+from backend.infrastructure.llm_clients import llm_clients
 
 # Configurações gerais\
 MAX_PAGES = 400  # número máximo de páginas por seed
@@ -80,6 +80,25 @@ def crawl_links(seed_urls, max_depth):
     return list(visited)
 
 
+def index_documents(docs, embeddings=None, save_path=settings.VS_PATH):
+    """
+    Quebra os documentos em chunks, gera os embeddings e monta o índice FAISS.
+    Salva em `save_path` (se não for None) e retorna o vectorstore.
+    """
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP
+    )
+    chunks = splitter.split_documents(docs)
+
+    if embeddings is None:
+        embeddings = llm_clients.embeddings()
+    with llm_clients.slot(getattr(embeddings, "model", None)):
+        vs = FAISS.from_documents(chunks, embeddings)
+    if save_path:
+        vs.save_local(save_path)
+    return vs
+
 def load_and_index():
     """
     Carrega e indexa documentos públicos conforme settings.DOC_URLS e DEPTH_MAP.
@@ -97,15 +116,4 @@ def load_and_index():
     loader = UnstructuredURLLoader(urls=all_urls)
     docs = loader.load()
 
-    # Quebra em chunks
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=CHUNK_SIZE,
-        chunk_overlap=CHUNK_OVERLAP
-    )
-    chunks = splitter.split_documents(docs)
-
-    # Gera embeddings e indexa no FAISS
-    embeddings = OpenAIEmbeddings(model=settings.EMBEDDINGS_MODEL)
-    vs = FAISS.from_documents(chunks, embeddings)
-    vs.save_local(settings.VS_PATH)
-    return vs
+    return index_documents(docs)
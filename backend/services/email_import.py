@@ -0,0 +1,275 @@
+# backend/services/email_import.py
+
+import codecs
+import csv
+import email
+import json
+from collections import deque
+from email import policy
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.infrastructure.config import settings
+from backend.repository.email_repo import AsyncEmailRepo
+
+FORMATS = ("ndjson", "csv", "mbox")
+
+CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "ndjson",
+    "text/csv": "csv",
+    "application/mbox": "mbox",
+}
+
+# Limites das colunas String(255) do modelo Email
+MAX_HEADER_LEN = 255
+
+# (nº do registro no arquivo, e-mail ou None, erro ou None)
+ParsedRow = Tuple[int, Optional[Dict[str, str]], Optional[str]]
+
+def detect_format(fmt: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Formato pedido explicitamente ou deduzido do Content-Type."""
+    if fmt:
+        return fmt if fmt in FORMATS else None
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return CONTENT_TYPES.get(media_type)
+
+def validate(row: Dict[str, Any]) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
+    data = {}
+    for field in ("sender", "subject", "body"):
+        value = row.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return None, f"Campo '{field}' ausente ou vazio"
+        data[field] = value.strip() if field != "body" else value
+    for field in ("sender", "subject"):
+        if len(data[field]) > MAX_HEADER_LEN:
+            return None, f"Campo '{field}' com mais de {MAX_HEADER_LEN} caracteres"
+    return data, None
+
+class NDJSONRowParser:
+    """Um objeto JSON por linha; linhas em branco são ignoradas."""
+    def __init__(self):
+        self.n = 0
+
+    def feed(self, line: str) -> List[ParsedRow]:
+        if not line.strip():
+            return []
+        self.n += 1
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            return [(self.n, None, f"JSON inválido: {e}")]
+        if not isinstance(obj, dict):
+            return [(self.n, None, "Esperado um objeto JSON")]
+        return [(self.n, *validate(obj))]
+
+    def close(self) -> List[ParsedRow]:
+        return []
+
+class CSVRowParser:
+    """
+    CSV com cabeçalho (sender, subject, body). Campos entre aspas podem
+    ter quebras de linha: as linhas são acumuladas até as aspas fecharem.
+
+    O estado das aspas é acompanhado linha a linha, com as mesmas regras
+    do módulo csv (aspas só abrem um campo no início dele; "" é escape),
+    então cada linha é lida uma vez. Um registro que passa de
+    `max_record_chars` (aspas que nunca fecham) vira erro na linha onde
+    começou, e as linhas seguintes são relidas como registros novos.
+    """
+    def __init__(self, max_record_chars: int = settings.EMAIL_IMPORT_MAX_RECORD_CHARS):
+        self.n = 0
+        self.header: Optional[List[str]] = None
+        self.max_record_chars = max_record_chars
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._in_quotes = False
+
+    @staticmethod
+    def _quotes_open_after(line: str, in_quotes: bool) -> bool:
+        """Se, ao fim da linha, um campo entre aspas continua aberto."""
+        if not in_quotes and '"' not in line:
+            return False
+        at_field_start = not in_quotes
+        i, n = 0, len(line)
+        while i < n:
+            ch = line[i]
+            if in_quotes:
+                if ch == '"':
+                    if i + 1 < n and line[i + 1] == '"':
+                        i += 2
+                        continue
+                    in_quotes = False
+            else:
+                if ch == '"' and at_field_start:
+                    in_quotes = True
+                at_field_start = ch == ","
+            i += 1
+        return in_quotes
+
+    def feed(self, line: str) -> List[ParsedRow]:
+        out: List[ParsedRow] = []
+        lines = deque([line])
+        while lines:
+            line = lines.popleft()
+            self._in_quotes = self._quotes_open_after(line, self._in_quotes)
+            self._pending.append(line)
+            self._pending_chars += len(line)
+            if not self._in_quotes:
+                out.extend(self._flush())
+            elif self._pending_chars > self.max_record_chars:
+                out.append(self._drop_first_line(lines))
+            # senão, aspas abertas: o registro continua na próxima linha
+        return out
+
+    def close(self) -> List[ParsedRow]:
+        out: List[ParsedRow] = []
+        while self._in_quotes:
+            lines: deque = deque()
+            out.append(self._drop_first_line(lines))
+            for line in lines:
+                out.extend(self.feed(line))
+        return out + self._flush()
+
+    def _drop_first_line(self, lines: deque) -> ParsedRow:
+        """Registra a linha que abriu as aspas como erro e devolve as seguintes para `lines`."""
+        pending = self._pending
+        self._pending, self._pending_chars, self._in_quotes = [], 0, False
+        lines.extendleft(reversed(pending[1:]))
+        self.n += 1
+        return (self.n, None, "Aspas não fechadas no registro CSV")
+
+    def _flush(self) -> List[ParsedRow]:
+        if not self._pending:
+            return []
+        record = "".join(self._pending)
+        self._pending, self._pending_chars = [], 0
+        return self._parse(record)
+
+    def _parse(self, record: str) -> List[ParsedRow]:
+        if not record.strip():
+            return []
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as e:
+            self.n += 1
+            return [(self.n, None, f"CSV inválido: {e}")]
+        if self.header is None:
+            self.header = [h.strip().lower() for h in values]
+            missing = {"sender", "subject", "body"} - set(self.header)
+            if missing:
+                raise ValueError(f"Cabeçalho CSV sem as colunas: {', '.join(sorted(missing))}")
+            return []
+        self.n += 1
+        if len(values) != len(self.header):
+            return [(self.n, None, f"Esperadas {len(self.header)} colunas, encontradas {len(values)}")]
+        return [(self.n, *validate(dict(zip(self.header, values))))]
+
+class MboxRowParser:
+    """
+    Formato mbox: cada mensagem começa numa linha "From ". Remetente e
+    assunto vêm dos cabeçalhos; o corpo é a parte text/plain.
+    """
+    def __init__(self):
+        self.n = 0
+        self._lines: List[str] = []
+        self._started = False
+
+    def feed(self, line: str) -> List[ParsedRow]:
+        if line.startswith("From "):
+            out = self._flush()
+            self._started = True
+            return out
+        if self._started:
+            # ">From " é o escape do mbox para linhas de corpo que começam com "From "
+            self._lines.append(line[1:] if line.startswith(">From ") else line)
+        return []
+
+    def close(self) -> List[ParsedRow]:
+        return self._flush()
+
+    def _flush(self) -> List[ParsedRow]:
+        if not self._started:
+            return []
+        raw, self._lines = "".join(self._lines), []
+        self.n += 1
+        try:
+            msg = email.message_from_string(raw, policy=policy.default)
+            part = msg.get_body(preferencelist=("plain",))
+            body = part.get_content() if part is not None else ""
+            row = {"sender": str(msg.get("From", "")), "subject": str(msg.get("Subject", "")), "body": body}
+        except Exception as e:
+            return [(self.n, None, f"Mensagem inválida: {e}")]
+        return [(self.n, *validate(row))]
+
+PARSERS = {"ndjson": NDJSONRowParser, "csv": CSVRowParser, "mbox": MboxRowParser}
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Converte os pedaços do corpo da requisição em linhas (com o "\\n"),
+    sem acumular o arquivo em memória.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    async for chunk in chunks:
+        buf += decoder.decode(chunk)
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buf += decoder.decode(b"", final=True)
+    if buf:
+        yield buf
+
+async def import_emails(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    batch_size: int = settings.EMAIL_IMPORT_BATCH_SIZE,
+    max_errors: int = settings.EMAIL_IMPORT_MAX_ERRORS
+) -> Dict[str, Any]:
+    """
+    Importa e-mails de um corpo em streaming (NDJSON, CSV ou mbox),
+    gravando em lotes de `batch_size` por transação. Linhas inválidas
+    não interrompem a importação: entram no relatório de erros (até
+    `max_errors` itens).
+    """
+    parser = PARSERS[fmt]()
+    repo = AsyncEmailRepo(db)
+    report = {"format": fmt, "received": 0, "inserted": 0, "failed": 0, "errors": [], "errors_truncated": False}
+    batch: List[Tuple[int, Dict[str, str]]] = []
+
+    def add_error(row: int, error: str):
+        report["failed"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"row": row, "error": error})
+        else:
+            report["errors_truncated"] = True
+
+    async def flush():
+        if not batch:
+            return
+        try:
+            report["inserted"] += await repo.bulk_create([data for _, data in batch])
+        except Exception as e:
+            await db.rollback()
+            for row, _ in batch:
+                add_error(row, f"Falha ao gravar o lote: {e}")
+        batch.clear()
+
+    async def handle(parsed: List[ParsedRow]):
+        for row, data, error in parsed:
+            report["received"] += 1
+            if error:
+                add_error(row, error)
+                continue
+            batch.append((row, data))
+            if len(batch) >= batch_size:
+                await flush()
+
+    async for line in iter_lines(chunks):
+        await handle(parser.feed(line))
+    await handle(parser.close())
+    await flush()
+    return report
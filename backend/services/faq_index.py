@@ -0,0 +1,114 @@
+# backend/services/faq_index.py
+
+import threading
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.infrastructure.config import settings
+from backend.infrastructure.response_cache import table_generations, TableGenerations
+from backend.models.faq import FAQ
+from backend.services.text_utils import normalize_text, keywords
+
+# Quantos candidatos (por sobreposição de palavras) passam para a comparação fina
+MAX_CANDIDATES = 20
+
+class FAQIndex:
+    """
+    Índice em memória das perguntas de FAQ, usado para responder no chat
+    sem chamar o LLM quando a pergunta do aluno já tem resposta curada.
+
+    Um índice invertido palavra -> FAQs seleciona poucos candidatos e só
+    eles passam pelo SequenceMatcher. O índice é reconstruído de forma
+    preguiçosa na primeira consulta depois que a geração da tabela `faqs`
+    muda (os métodos de escrita do FAQRepo a incrementam, a mesma usada
+    pelo cache de respostas).
+    """
+    def __init__(self, threshold: float, generations: TableGenerations):
+        self.threshold = threshold
+        self.generations = generations
+        self._lock = threading.Lock()
+        self._built_version = -1   # geração de `faqs` refletida em _entries
+        self._entries: List[Dict[str, Any]] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def _stale_version(self) -> Optional[int]:
+        """Geração a reconstruir, ou None se o índice estiver em dia."""
+        version = self.generations.current("faqs")
+        with self._lock:
+            return version if self._built_version != version else None
+
+    def _rows_query(self):
+        return select(FAQ.id, FAQ.question, FAQ.answer, FAQ.excerpt, FAQ.link)
+
+    def _install(self, version: int, rows) -> None:
+        entries: List[Dict[str, Any]] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for row in rows:
+            if not row.question:
+                continue
+            norm = normalize_text(row.question)
+            idx = len(entries)
+            entries.append({
+                "id": row.id,
+                "question": row.question,
+                "answer": row.answer,
+                "excerpt": row.excerpt,
+                "link": row.link,
+                "normalized": norm,
+            })
+            for tok in set(keywords(norm)):
+                postings[tok].append(idx)
+
+        with self._lock:
+            # Se houve outra escrita durante a leitura, a próxima consulta reconstrói de novo
+            self._entries, self._postings = entries, dict(postings)
+            self._built_version = version
+
+    def lookup(self, db: Session, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna a FAQ mais parecida com `question` (com a chave `score`)
+        se a similaridade atingir o limiar, senão None.
+        """
+        version = self._stale_version()
+        if version is not None:
+            self._install(version, db.execute(self._rows_query()).all())
+        return self._match(question)
+
+    async def alookup(self, db: AsyncSession, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Versão assíncrona de `lookup`; o índice é o mesmo.
+        """
+        version = self._stale_version()
+        if version is not None:
+            self._install(version, (await db.execute(self._rows_query())).all())
+        return self._match(question)
+
+    def _match(self, question: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entries, postings = self._entries, self._postings
+
+        norm = normalize_text(question)
+        hits = Counter()
+        for tok in set(keywords(norm)):
+            for idx in postings.get(tok, ()):
+                hits[idx] += 1
+        if not hits:
+            return None
+
+        best, best_ratio = None, 0.0
+        for idx, _ in hits.most_common(MAX_CANDIDATES):
+            entry = entries[idx]
+            ratio = SequenceMatcher(None, norm, entry["normalized"]).ratio()
+            if ratio > best_ratio:
+                best, best_ratio = entry, ratio
+
+        if best is None or best_ratio < self.threshold:
+            return None
+        return {**best, "score": best_ratio}
+
+faq_index = FAQIndex(threshold=settings.FAQ_MATCH_THRESHOLD, generations=table_generations)
@@ -2,7 +2,9 @@
 
 import json
 from difflib import SequenceMatcher
-from typing import List, Dict
+from typing import List, Dict, Callable, Optional
+
+from sqlalchemy.orm import Session
 
 from backend.infrastructure.session import get_db
 from backend.repository.email_repo import EmailRepo
@@ -26,17 +28,28 @@ def find_best_match(question: str, candidates: List[str]) -> str | None:
         return best
     return None
 
-def generate_and_save_faqs() -> List[Dict]:
-    db = next(get_db())
+def generate_and_save_faqs(
+    db: Optional[Session] = None,
+    progress: Optional[Callable[[int, str], None]] = None
+) -> List[Dict]:
+    """
+    Gera FAQs a partir dos e-mails e salva no banco.
+    `progress(percent, etapa)` é chamado entre as etapas (usado pelos jobs assíncronos).
+    """
+    if db is None:
+        db = next(get_db())
+    report = progress or (lambda percent, message: None)
     email_repo = EmailRepo(db)
     faq_repo = FAQRepo(db)
 
     # 1) Pega todos os e-mails simulados
+    report(5, "Carregando e-mails")
     raw_emails = [e.body for e in email_repo.list_all()]
     if not raw_emails:
         return []
 
     # 2) Gera as FAQs via LangChain
+    report(15, f"Gerando FAQs a partir de {len(raw_emails)} e-mails")
     faqs_generated = run_faq_chain(raw_emails)
 
     # 3) Carrega as perguntas já existentes
@@ -44,7 +57,8 @@ def generate_and_save_faqs() -> List[Dict]:
     existing_questions = [f.question for f in existing_faqs]
 
     saved = []
-    for item in faqs_generated:
+    for i, item in enumerate(faqs_generated):
+        report(80 + 20 * i // len(faqs_generated), "Salvando FAQs")
         q_new = item["question"]
         # 4) Verifica se já existe pergunta similar
         q_matched = find_best_match(q_new, existing_questions)
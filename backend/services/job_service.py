@@ -0,0 +1,316 @@
+# backend/services/job_service.py
+
+import asyncio
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.infrastructure.config import settings
+from backend.infrastructure.session import SessionLocal
+from backend.repository.job_repo import JobRepo
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATUSES = {SUCCEEDED, FAILED, CANCELLED}
+
+# Assinatura dos handlers: (sessão, payload, contexto) -> resultado serializável em JSON
+JobHandler = Callable[[Session, Dict[str, Any], "JobContext"], Any]
+
+class JobCancelled(Exception):
+    """Levantada dentro do handler quando o job foi cancelado pelo cliente."""
+
+class JobQueueFull(Exception):
+    """A fila de jobs está cheia; o cliente deve tentar novamente mais tarde."""
+
+class JobContext:
+    """
+    Entregue ao handler para reportar progresso e checar cancelamento.
+    O cancelamento é cooperativo: cada chamada a `progress` é um ponto de parada.
+    """
+    def __init__(self, manager: "JobManager", job_id: str, cancel_event: threading.Event):
+        self.job_id = job_id
+        self._manager = manager
+        self._cancel_event = cancel_event
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.job_id)
+
+    def progress(self, percent: int, message: Optional[str] = None) -> None:
+        self.check_cancelled()
+        self._manager._set_progress(self.job_id, percent, message)
+
+class _JobState:
+    """Estado vivo de um job enquanto ele está na fila ou executando."""
+    def __init__(self, job_id: str, kind: str):
+        self.job_id = job_id
+        self.kind = kind
+        self.status = PENDING
+        self.progress = 0
+        self.message: Optional[str] = "Na fila"
+        self.error: Optional[str] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+        }
+
+class JobManager:
+    """
+    Executa jobs longos (geração de FAQ/quiz) num pool limitado de threads.
+
+    O estado vivo (progresso, etapa) fica em memória; transições de status e
+    resultados são gravados no SQLite, então sobrevivem a um reinício.
+    """
+    def __init__(self, max_workers: int, max_queued: int, session_factory=SessionLocal):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._session_factory = session_factory
+        self._handlers: Dict[str, JobHandler] = {}
+        self._states: Dict[str, _JobState] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        """
+        Cria o pool de workers e marca como falhos os jobs que o processo
+        anterior deixou pela metade.
+        """
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="job-worker"
+            )
+        with self._session() as db:
+            JobRepo(db).fail_unfinished(
+                [PENDING, RUNNING],
+                error="Job interrompido por reinício do servidor"
+            )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            for state in self._states.values():
+                state.cancel_event.set()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Enfileira um job e retorna seu ID imediatamente.
+
+        Raises:
+            ValueError: se não houver handler para `kind`.
+            JobQueueFull: se já houver jobs demais aguardando.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Tipo de job desconhecido: {kind}")
+        if self._executor is None:
+            self.start()
+
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            if len(self._states) >= self.max_workers + self.max_queued:
+                raise JobQueueFull()
+            state = _JobState(job_id, kind)
+            self._states[job_id] = state
+
+        try:
+            with self._session() as db:
+                JobRepo(db).create(job_id, kind, json.dumps(payload), status=PENDING)
+            state.future = self._executor.submit(self._run, job_id, kind, payload)
+        except Exception:
+            with self._lock:
+                self._states.pop(job_id, None)
+            raise
+        return job_id
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Pede o cancelamento de um job ativo. Retorna o status atual,
+        ou None se o job não estiver ativo (inexistente ou já finalizado).
+        """
+        with self._lock:
+            state = self._states.get(job_id)
+        if state is None:
+            return None
+
+        state.cancel_event.set()
+        # Ainda na fila: nunca vai rodar, então finalizamos aqui mesmo
+        if state.future is not None and state.future.cancel():
+            self._finish(job_id, CANCELLED, message="Cancelado antes de iniciar")
+            return CANCELLED
+        return state.status
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Estado atual do job: memória para jobs ativos, banco para os demais.
+        """
+        with self._lock:
+            state = self._states.get(job_id)
+            if state is not None:
+                return state.as_dict()
+
+        with self._session() as db:
+            job = JobRepo(db).get(job_id)
+            if not job:
+                return None
+            return {
+                "id": job.id,
+                "kind": job.kind,
+                "status": job.status,
+                "progress": job.progress,
+                "message": job.message,
+                "error": job.error,
+            }
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna status e resultado desserializado de um job persistido.
+        """
+        with self._session() as db:
+            job = JobRepo(db).get(job_id)
+            if not job:
+                return None
+            return {
+                "id": job.id,
+                "status": job.status,
+                "result": json.loads(job.result) if job.result else None,
+                "error": job.error,
+            }
+
+    async def events(self, job_id: str, poll_interval: float = 0.5) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Gera um snapshot a cada mudança de estado, até o job terminar.
+        """
+        last = None
+        while True:
+            with self._lock:
+                state = self._states.get(job_id)
+                snap = state.as_dict() if state is not None else None
+            if snap is None:
+                snap = await asyncio.to_thread(self.snapshot, job_id)
+                if snap is None:
+                    return
+            if snap != last:
+                last = snap
+                yield snap
+            if snap["status"] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(poll_interval)
+
+    # --- Execução ---------------------------------------------------------
+
+    @contextmanager
+    def _session(self):
+        db = self._session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def _run(self, job_id: str, kind: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            state = self._states.get(job_id)
+        if state is None:
+            return
+        ctx = JobContext(self, job_id, state.cancel_event)
+
+        try:
+            ctx.check_cancelled()
+            self._persist(job_id, status=RUNNING, message="Iniciando")
+            with self._lock:
+                state.status = RUNNING
+                state.message = "Iniciando"
+
+            with self._session() as db:
+                result = self._handlers[kind](db, payload, ctx)
+            self._finish(
+                job_id, SUCCEEDED, message="Concluído",
+                result=json.dumps(result, ensure_ascii=False, default=str)
+            )
+        except JobCancelled:
+            self._finish(job_id, CANCELLED, message="Cancelado")
+        except Exception as e:
+            self._finish(job_id, FAILED, message="Falhou", error=str(e))
+
+    def _set_progress(self, job_id: str, percent: int, message: Optional[str]) -> None:
+        with self._lock:
+            state = self._states.get(job_id)
+            if state is None:
+                return
+            state.progress = max(0, min(100, int(percent)))
+            if message is not None:
+                state.message = message
+
+    def _finish(self, job_id: str, status: str, **fields) -> None:
+        with self._lock:
+            state = self._states.get(job_id)
+            progress = 100 if status == SUCCEEDED else (state.progress if state else 0)
+        self._persist(job_id, status=status, progress=progress, **fields)
+        with self._lock:
+            self._states.pop(job_id, None)
+
+    def _persist(self, job_id: str, **fields) -> None:
+        with self._session() as db:
+            JobRepo(db).update(job_id, **fields)
+
+# --- Handlers ------------------------------------------------------------
+
+def _run_faq_job(db: Session, payload: Dict[str, Any], ctx: JobContext) -> Any:
+    from backend.services.faq_service import generate_and_save_faqs
+
+    faqs = generate_and_save_faqs(db=db, progress=ctx.progress)
+    return [
+        {"id": f.id, "question": f.question, "answer": f.answer, "excerpt": f.excerpt, "link": f.link}
+        for f in faqs
+    ]
+
+def _run_quiz_job(db: Session, payload: Dict[str, Any], ctx: JobContext) -> Any:
+    from backend.repository.quiz_repo import QuizRepo
+    from backend.schemas.quiz_schema import QuizCreate
+    from backend.services.quiz_service import generate_and_save_quiz
+
+    quiz_id = generate_and_save_quiz(db, QuizCreate(**payload), progress=ctx.progress)
+    return QuizRepo(db).get_quiz_with_questions(quiz_id)
+
+def _run_retention_job(db: Session, payload: Dict[str, Any], ctx: JobContext) -> Any:
+    from backend.services.retention_service import archive_old_messages
+
+    return archive_old_messages(
+        db=db,
+        older_than_days=payload.get("older_than_days", settings.RETENTION_DAYS),
+        progress=ctx.progress
+    )
+
+job_manager = JobManager(
+    max_workers=settings.JOB_WORKERS,
+    max_queued=settings.JOB_QUEUE_SIZE
+)
+job_manager.register("faq", _run_faq_job)
+job_manager.register("quiz", _run_quiz_job)
+job_manager.register("retention", _run_retention_job)
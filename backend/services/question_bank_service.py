@@ -0,0 +1,104 @@
+# backend/services/question_bank_service.py
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.infrastructure.config import settings
+from backend.infrastructure.session import SessionLocal
+from backend.repository.question_bank_repo import QuestionBankRepo
+from backend.repository.quiz_repo import QuizRepo
+from backend.services.text_utils import normalize_theme
+
+logger = logging.getLogger(__name__)
+
+def take_quiz_from_bank(db: Session, theme: str, n_questions: int) -> Optional[int]:
+    """
+    Registra a demanda pelo tema e, se houver estoque suficiente, monta o
+    quiz direto do banco de perguntas. Retorna o ID do quiz ou None.
+    """
+    if not settings.QUESTION_BANK_ENABLED:
+        return None
+
+    bank = QuestionBankRepo(db)
+    theme_key = normalize_theme(theme)
+    bank.record_demand(theme_key, theme)
+    if bank.count(theme_key) < n_questions:
+        return None
+
+    questions = bank.sample(theme_key, n_questions)
+    return QuizRepo(db).create_quiz(theme=theme, n_questions=len(questions), questions=questions)
+
+def deposit_questions(db: Session, theme: str, questions: List[Dict[str, Any]]) -> int:
+    """
+    Guarda no banco perguntas recém-geradas (formato do QuizRepo).
+    """
+    if not settings.QUESTION_BANK_ENABLED or not questions:
+        return 0
+    return QuestionBankRepo(db).add_questions(normalize_theme(theme), questions)
+
+class BankRefiller:
+    """
+    Thread de fundo que mantém estoque nos temas mais pedidos: a cada
+    intervalo, gera perguntas para os temas populares abaixo do alvo.
+    """
+    def __init__(self, interval: float, target_stock: int, min_demand: int, batch_size: int):
+        self.interval = interval
+        self.target_stock = target_stock
+        self.min_demand = min_demand
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None or not settings.QUESTION_BANK_ENABLED:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="question-bank-refiller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refill_once()
+            except Exception:
+                logger.exception("Falha ao reabastecer o banco de perguntas")
+
+    def refill_once(self, max_themes: int = 5) -> int:
+        """
+        Uma rodada de reabastecimento. Retorna quantas perguntas entraram no banco.
+        """
+        from backend.services.quiz_service import generate_questions, to_repo_question
+
+        db = SessionLocal()
+        try:
+            themes = QuestionBankRepo(db).low_stock_themes(
+                min_requests=self.min_demand,
+                target_stock=self.target_stock,
+                limit=max_themes
+            )
+            added = 0
+            for t in themes:
+                if self._stop.is_set():
+                    break
+                n = min(self.batch_size, self.target_stock - t["stock"])
+                generated = generate_questions(t["theme"], n)
+                added += deposit_questions(db, t["theme"], [to_repo_question(q) for q in generated])
+            return added
+        finally:
+            db.close()
+
+bank_refiller = BankRefiller(
+    interval=settings.QUESTION_BANK_REFILL_INTERVAL,
+    target_stock=settings.QUESTION_BANK_TARGET_STOCK,
+    min_demand=settings.QUESTION_BANK_MIN_DEMAND,
+    batch_size=settings.QUESTION_BANK_REFILL_BATCH
+)
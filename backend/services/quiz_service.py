@@ -1,33 +1,73 @@
 # backend/services/quiz_service.py
 
-from typing import List, Dict
+from typing import List, Dict, Any, Callable, Iterator, Optional
 from backend.infrastructure.session import get_db
-from backend.repository.quiz_repo import QuizRepo
-from backend.chains.quiz_chains import run_quiz_chain
+from backend.repository.quiz_repo import QuizRepo, AsyncQuizRepo
+from backend.chains.quiz_chains import run_quiz_chain, stream_quiz_chain, iter_quiz_chain_fanout
+from backend.infrastructure.config import settings
 from backend.schemas.quiz_schema import QuizCreate
+from backend.services.answer_key_cache import answer_key_cache
+from backend.services.question_bank_service import take_quiz_from_bank, deposit_questions
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
-def generate_and_save_quiz(db: Session, quiz_create: QuizCreate) -> int:
+def to_repo_question(q: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte uma pergunta normalizada da chain no payload do QuizRepo."""
+    return {
+        "prompt":         q["prompt"],
+        "explanation":    q["explanation"],
+        "correct_answer": q["correct_answer_letter"],
+        "alternatives":   q["alternatives"],  
+    }
+
+def iter_generated_questions(theme: str, n_questions: int) -> Iterator[Dict[str, Any]]:
+    """
+    Gera perguntas novas via LLM, entregando cada uma assim que fica pronta.
+    Quizzes grandes são divididos em lotes concorrentes (fan-out), para
+    que a latência não cresça linearmente com o número de perguntas.
+    """
+    if n_questions > settings.QUIZ_FANOUT_THRESHOLD:
+        return iter_quiz_chain_fanout(theme, n_questions)
+    return stream_quiz_chain(theme, n_questions)
+
+def generate_questions(theme: str, n_questions: int) -> List[Dict[str, Any]]:
+    """Gera perguntas novas via LLM (formato normalizado da chain)."""
+    if n_questions > settings.QUIZ_FANOUT_THRESHOLD:
+        return list(iter_quiz_chain_fanout(theme, n_questions))
+    return run_quiz_chain(theme=theme, n_questions=n_questions)
+
+def generate_and_save_quiz(
+    db: Session,
+    quiz_create: QuizCreate,
+    progress: Optional[Callable[[int, str], None]] = None
+) -> int:
+    """
+    Monta um quiz e salva no banco, retornando o ID. Usa o banco de
+    perguntas pré-geradas quando há estoque para o tema; senão gera via LLM.
+    `progress(percent, etapa)` é chamado entre as etapas (usado pelos jobs assíncronos).
+    """
+    report = progress or (lambda percent, message: None)
     quiz_repo = QuizRepo(db)
 
+    # 0) Atalho: tema com estoque suficiente no banco de perguntas
+    quiz_id = take_quiz_from_bank(db, quiz_create.theme, quiz_create.n_questions)
+    if quiz_id is not None:
+        return quiz_id
+
     # 1) Gera as perguntas via chain (já com prompt, options, correct_letter, etc.)
-    questions_generated = run_quiz_chain(
+    report(10, f"Gerando {quiz_create.n_questions} perguntas sobre \"{quiz_create.theme}\"")
+    questions_generated = generate_questions(
         theme=quiz_create.theme,
         n_questions=quiz_create.n_questions
     )
 
     # 2) Monte só o payload pro repo, sem gerar placeholders
-    questions_with_alternatives = []
-    for q in questions_generated:
-        questions_with_alternatives.append({
-            "prompt":         q["prompt"],
-            "explanation":    q["explanation"],
-            "correct_answer": q["correct_answer_letter"],
-            "alternatives":   q["alternatives"],  
-        })
+    questions_with_alternatives = [to_repo_question(q) for q in questions_generated]
+    deposit_questions(db, quiz_create.theme, questions_with_alternatives)
 
     # 3) Salva no banco
+    report(90, "Salvando quiz")
     quiz_id = quiz_repo.create_quiz(
         theme=quiz_create.theme,
         n_questions=len(questions_with_alternatives),
@@ -36,23 +76,207 @@ def generate_and_save_quiz(db: Session, quiz_create: QuizCreate) -> int:
     return quiz_id
 
 
-def save_and_check_answer(quiz_id: int, question_id: int, given_answer: str, db: Session) -> dict:
-    repo = QuizRepo(db)   
-    question = repo.get_question_by_id(question_id)
-    if not question:
-        raise HTTPException(status_code=404, detail="Pergunta não encontrada")
+def stream_and_save_quiz(db: Session, quiz_create: QuizCreate) -> Iterator[Dict[str, Any]]:
+    """
+    Gera o quiz em streaming: cada pergunta é validada, salva e emitida
+    assim que o LLM termina de escrevê-la. Produz eventos:
+      - {"event": "quiz", "quiz": {id, theme, n_questions}}
+      - {"event": "question", "index": i, "question": {...}}  (uma por pergunta)
+      - {"event": "done", "quiz_id": id, "n_questions": total}
+      - {"event": "error", "detail": "..."}  (encerra o stream)
+    Com estoque no banco de perguntas, todos os eventos saem de imediato.
+    """
+    quiz_repo = QuizRepo(db)
+
+    quiz_id = take_quiz_from_bank(db, quiz_create.theme, quiz_create.n_questions)
+    if quiz_id is not None:
+        quiz = quiz_repo.get_quiz_with_questions(quiz_id)
+        yield {
+            "event": "quiz",
+            "quiz": {"id": quiz_id, "theme": quiz["theme"], "n_questions": quiz["n_questions"]},
+        }
+        for i, question in enumerate(quiz["questions"]):
+            yield {"event": "question", "index": i, "question": question}
+        yield {"event": "done", "quiz_id": quiz_id, "n_questions": quiz["n_questions"]}
+        return
+
+    quiz_id = quiz_repo.create_empty_quiz(quiz_create.theme, quiz_create.n_questions)
+    yield {
+        "event": "quiz",
+        "quiz": {"id": quiz_id, "theme": quiz_create.theme, "n_questions": quiz_create.n_questions},
+    }
+
+    count = 0
+    error = None
+    generated = []
+    try:
+        for q in iter_generated_questions(quiz_create.theme, quiz_create.n_questions):
+            payload = to_repo_question(q)
+            question = quiz_repo.add_question(quiz_id, payload)
+            generated.append(payload)
+            yield {"event": "question", "index": count, "question": question}
+            count += 1
+    except Exception as e:
+        db.rollback()
+        error = f"Falha ao gerar quiz: {e}"
+    finally:
+        # Também roda se o cliente desconectar no meio: o quiz salvo
+        # precisa refletir só as perguntas que de fato foram persistidas
+        if count == 0:
+            quiz_repo.delete_quiz(quiz_id)
+        elif count != quiz_create.n_questions:
+            quiz_repo.set_n_questions(quiz_id, count)
+        deposit_questions(db, quiz_create.theme, generated)
 
-    # Valida que a pergunta pertence a este quiz
-    if question["quiz_id"] != quiz_id:
-        raise HTTPException(status_code=400, detail="Pergunta não pertence a este quiz")
+    if count == 0:
+        yield {"event": "error", "detail": error or "O modelo não retornou nenhuma pergunta válida"}
+    elif error:
+        yield {"event": "error", "detail": error}
+    else:
+        yield {"event": "done", "quiz_id": quiz_id, "n_questions": count}
+
+
+def _grade(key: Dict[str, Any], question_id: int, given_answer: str) -> Optional[dict]:
+    """Corrige uma resposta contra o gabarito em memória; None se a pergunta não for do quiz."""
+    entry = key["questions"].get(question_id)
+    if entry is None:
+        return None
 
     # Compara resposta (letra)
-    is_correct = question["correct_answer"].strip().upper() == given_answer.strip().upper()
+    is_correct = entry["correct"] == given_answer.strip().upper()
 
     return {
-        "question_id":   question["id"],
-        "text":          question["prompt"],       # mapeia 'prompt' para 'text'
+        "question_id":   question_id,
+        "text":          entry["prompt"],       # mapeia 'prompt' para 'text'
         "given_answer":  given_answer,
         "is_correct":    is_correct,
-        "explanation":   question["explanation"],
-    }
\ No newline at end of file
+        "explanation":   entry["explanation"],
+    }
+
+
+def _grade_one(key: Optional[Dict[str, Any]], question_id: int, given_answer: str) -> dict:
+    """Corrige uma resposta avulsa; levanta 404 se o quiz ou a pergunta não existirem."""
+    if key is None:
+        raise HTTPException(status_code=404, detail="Quiz não encontrado")
+
+    result = _grade(key, question_id, given_answer)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Pergunta não encontrada neste quiz")
+    return result
+
+
+def _grade_all(key: Optional[Dict[str, Any]], answers: List[Dict[str, Any]]):
+    """
+    Corrige todas as respostas de uma tentativa. Retorna (resultados,
+    linhas para gravar); levanta 404/400 para quiz, pergunta ou repetição inválidos.
+    """
+    if key is None:
+        raise HTTPException(status_code=404, detail="Quiz não encontrado")
+
+    question_ids = [a["question_id"] for a in answers]
+    if len(set(question_ids)) != len(question_ids):
+        raise HTTPException(status_code=400, detail="Pergunta respondida mais de uma vez na tentativa")
+
+    results = []
+    for a in answers:
+        result = _grade(key, a["question_id"], a["given_answer"])
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"Pergunta {a['question_id']} não encontrada neste quiz")
+        results.append(result)
+
+    graded = [
+        {
+            "question_id": r["question_id"],
+            "given_answer": r["given_answer"].strip().upper(),
+            "is_correct": r["is_correct"],
+            "time_spent_ms": a.get("time_spent_ms"),
+        }
+        for r, a in zip(results, answers)
+    ]
+    return results, graded
+
+
+def _attempt_out(attempt_id: int, quiz_id: int, results: List[dict]) -> dict:
+    return {
+        "attempt_id": attempt_id,
+        "quiz_id": quiz_id,
+        "n_answered": len(results),
+        "n_correct": sum(1 for r in results if r["is_correct"]),
+        "results": results,
+    }
+
+
+def save_and_check_answer(
+    quiz_id: int,
+    question_id: int,
+    given_answer: str,
+    db: Session,
+    time_spent_ms: Optional[int] = None
+) -> dict:
+    """
+    Corrige uma resposta usando o gabarito em cache (sem leitura no banco
+    depois da primeira correção do quiz), grava a resposta e atualiza
+    as estatísticas da pergunta e do tema.
+    """
+    key = answer_key_cache.get(db, quiz_id)
+    result = _grade_one(key, question_id, given_answer)
+    QuizRepo(db).record_answer(
+        quiz_id=quiz_id,
+        theme=key["theme"],
+        question_id=question_id,
+        given_answer=given_answer.strip().upper(),
+        is_correct=result["is_correct"],
+        time_spent_ms=time_spent_ms
+    )
+    return result
+
+
+async def asave_and_check_answer(
+    quiz_id: int,
+    question_id: int,
+    given_answer: str,
+    db: AsyncSession,
+    time_spent_ms: Optional[int] = None
+) -> dict:
+    """Versão assíncrona de `save_and_check_answer`."""
+    key = await answer_key_cache.aget(db, quiz_id)
+    result = _grade_one(key, question_id, given_answer)
+    await AsyncQuizRepo(db).record_answer(
+        quiz_id=quiz_id,
+        theme=key["theme"],
+        question_id=question_id,
+        given_answer=given_answer.strip().upper(),
+        is_correct=result["is_correct"],
+        time_spent_ms=time_spent_ms
+    )
+    return result
+
+
+def grade_attempt(quiz_id: int, answers: List[Dict[str, Any]], db: Session) -> dict:
+    """
+    Corrige todas as respostas de uma tentativa e grava tudo numa única
+    transação. answers: lista de dicts com question_id, given_answer
+    e time_spent_ms (opcional).
+    """
+    key = answer_key_cache.get(db, quiz_id)
+    results, graded = _grade_all(key, answers)
+    attempt_id = QuizRepo(db).record_attempt(quiz_id, key["theme"], graded)
+    return _attempt_out(attempt_id, quiz_id, results)
+
+
+async def agrade_attempt(quiz_id: int, answers: List[Dict[str, Any]], db: AsyncSession) -> dict:
+    """Versão assíncrona de `grade_attempt`."""
+    key = await answer_key_cache.aget(db, quiz_id)
+    results, graded = _grade_all(key, answers)
+    attempt_id = await AsyncQuizRepo(db).record_attempt(quiz_id, key["theme"], graded)
+    return _attempt_out(attempt_id, quiz_id, results)
+
+
+def stats_to_dict(stats) -> dict:
+    """Converte um agregado (QuestionStats/ThemeStats) em taxas e médias."""
+    return {
+        "attempts": stats.attempts,
+        "correct": stats.correct,
+        "correct_rate": stats.correct / stats.attempts if stats.attempts else 0.0,
+        "mean_time_ms": stats.total_time_ms / stats.timed_attempts if stats.timed_attempts else None,
+    }
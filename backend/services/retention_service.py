@@ -0,0 +1,204 @@
+# backend/services/retention_service.py
+
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend.infrastructure.archive_io import (
+    SUFFIXES, open_archive_reader, open_archive_writer, resolve_compression,
+)
+from backend.infrastructure.config import settings
+from backend.infrastructure.db_writer import serialized_write
+from backend.infrastructure.session import SessionLocal, engine as default_engine
+from backend.models.message import Message, MessageArchive
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, Optional[str]], None]
+
+def message_record(m: Message) -> Dict[str, Any]:
+    """Mensagem no formato das linhas do arquivo morto."""
+    return {
+        "id": m.id,
+        "session_id": m.session_id,
+        "role": m.role,
+        "content": m.content,
+        "timestamp": m.timestamp.isoformat(),
+        "prompt_tokens": m.prompt_tokens,
+        "completion_tokens": m.completion_tokens,
+        "model": m.model,
+    }
+
+def _write_partition(day: str, rows: List[Message], compression: str) -> str:
+    """
+    Grava as mensagens de um dia num arquivo novo da partição do dia e
+    retorna o caminho relativo a ARCHIVE_DIR. O nome leva o intervalo de
+    IDs, então reprocessar o mesmo lote sobrescreve o mesmo arquivo.
+    """
+    year, month, dom = day.split("-")
+    rel = os.path.join(
+        "messages", year, month, dom,
+        f"messages-{rows[0].id}-{rows[-1].id}{SUFFIXES[compression]}"
+    )
+    with open_archive_writer(os.path.join(settings.ARCHIVE_DIR, rel), compression) as fh:
+        for m in rows:
+            fh.write(json.dumps(message_record(m), ensure_ascii=False) + "\n")
+    return rel
+
+def archive_old_messages(
+    db: Optional[Session] = None,
+    older_than_days: int = settings.RETENTION_DAYS,
+    batch_size: int = settings.RETENTION_BATCH_SIZE,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Move as mensagens mais antigas que `older_than_days` para arquivos
+    JSONL comprimidos, particionados por dia, e as apaga do banco.
+
+    Cada lote é gravado em disco (escrita atômica) antes de a transação
+    que registra o índice e apaga as linhas ser aberta; se o processo cair
+    no meio, o lote continua no banco e é refeito na próxima rodada.
+    Os agregados de uso (usage_*) não são tocados.
+    """
+    if db is None:
+        db = SessionLocal()
+        owns_session = True
+    else:
+        owns_session = False
+
+    bind = db.get_bind()
+    compression = resolve_compression(settings.ARCHIVE_COMPRESSION)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    total = db.query(Message.id).filter(Message.timestamp < cutoff).count()
+    stats = {"cutoff": cutoff.isoformat(), "archived": 0, "files": 0, "compression": compression}
+
+    try:
+        while True:
+            rows = (
+                db.query(Message)
+                  .filter(Message.timestamp < cutoff)
+                  .order_by(Message.id)
+                  .limit(batch_size)
+                  .all()
+            )
+            if not rows:
+                break
+
+            by_day: Dict[str, List[Message]] = defaultdict(list)
+            for m in rows:
+                by_day[m.timestamp.strftime("%Y-%m-%d")].append(m)
+
+            index_rows = []
+            for day, day_rows in sorted(by_day.items()):
+                rel = _write_partition(day, day_rows, compression)
+                stats["files"] += 1
+                per_session: Dict[str, List[int]] = defaultdict(list)
+                for m in day_rows:
+                    per_session[m.session_id].append(m.id)
+                index_rows.extend(
+                    MessageArchive(session_id=sid, path=rel, day=day, messages=len(ids), first_id=ids[0], last_id=ids[-1])
+                    for sid, ids in per_session.items()
+                )
+
+            ids = [m.id for m in rows]
+            with serialized_write():
+                for row in index_rows:
+                    db.merge(row)
+                db.query(Message).filter(Message.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+            db.expunge_all()
+
+            stats["archived"] += len(ids)
+            if progress:
+                progress(min(99, int(stats["archived"] * 100 / max(total, 1))), f"{stats['archived']} de {total} mensagens arquivadas")
+    finally:
+        if owns_session:
+            db.close()
+
+    if stats["archived"]:
+        stats.update(compact_database(bind))
+    logger.info("Retenção: %s", stats)
+    return stats
+
+def compact_database(engine: Engine = default_engine) -> Dict[str, Any]:
+    """
+    Devolve ao sistema de arquivos as páginas liberadas pelos deletes.
+
+    Usa auto_vacuum=INCREMENTAL; em bancos criados sem ele, a primeira
+    chamada ativa o modo e faz um VACUUM completo (único, bloqueante).
+    """
+    with serialized_write():
+        with engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            freelist = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+                conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.exec_driver_sql("VACUUM")
+                mode = "full"
+            else:
+                # Cada linha do resultado é um passo; precisa consumir tudo
+                conn.exec_driver_sql("PRAGMA incremental_vacuum").fetchall()
+                mode = "incremental"
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+    return {"vacuum": mode, "freed_pages": freelist}
+
+def iter_archived_session(db: Session, session_id: str) -> Iterator[Dict[str, Any]]:
+    """
+    Reproduz, em ordem, as mensagens arquivadas de uma sessão, lendo em
+    streaming só os arquivos em que ela aparece.
+    """
+    entries = (
+        db.query(MessageArchive.path)
+          .filter(MessageArchive.session_id == session_id)
+          .order_by(MessageArchive.first_id)
+          .all()
+    )
+    for entry in entries:
+        path = os.path.join(settings.ARCHIVE_DIR, entry.path)
+        if not os.path.exists(path):
+            logger.error("Arquivo de retenção ausente: %s", path)
+            continue
+        with open_archive_reader(path) as fh:
+            for line in fh:
+                record = json.loads(line)
+                if record["session_id"] == session_id:
+                    yield record
+
+class RetentionWorker:
+    """
+    Thread de fundo que roda a retenção a cada `interval` segundos
+    (0 desliga; a retenção ainda pode ser disparada pela API).
+    """
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="message-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                archive_old_messages()
+            except Exception:
+                logger.exception("Falha na retenção de mensagens")
+
+retention_worker = RetentionWorker(interval=settings.RETENTION_INTERVAL)
@@ -0,0 +1,53 @@
+# backend/services/text_utils.py
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Iterable, List
+
+_NON_WORD_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_SPACES_RE = re.compile(r"\s+")
+
+# Palavras muito frequentes que não ajudam a diferenciar perguntas
+STOPWORDS = {
+    "a", "o", "as", "os", "um", "uma", "de", "da", "do", "das", "dos", "e", "é",
+    "em", "no", "na", "nos", "nas", "que", "como", "para", "por", "com", "se",
+    "eu", "meu", "minha", "qual", "quais", "the", "to", "of", "in", "is", "how",
+}
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza um texto para comparação: minúsculas, sem acentos,
+    sem pontuação e com espaços colapsados.
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _NON_WORD_RE.sub(" ", text.lower())
+    return _SPACES_RE.sub(" ", text).strip()
+
+def keywords(normalized: str) -> List[str]:
+    """
+    Palavras relevantes de um texto já normalizado (sem stopwords).
+    """
+    return [tok for tok in normalized.split() if tok not in STOPWORDS and len(tok) > 1]
+
+def normalize_theme(theme: str) -> str:
+    """
+    Chave canônica de um tema de quiz: sem acentos, pontuação, caixa e stopwords.
+    "Listas em Python!" e "listas python" caem na mesma chave.
+    """
+    norm = normalize_text(theme)
+    return " ".join(keywords(norm)) or norm
+
+def is_near_duplicate(key: str, known: Iterable[str], threshold: float) -> bool:
+    """
+    True se `key` (texto normalizado) for igual ou tiver similaridade
+    >= threshold com algum dos textos em `known`.
+    """
+    for other in known:
+        if key == other:
+            return True
+        matcher = SequenceMatcher(None, key, other)
+        if matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold:
+            return True
+    return False
@@ -0,0 +1,16 @@
+# backend/services/token_counter.py
+
+from functools import lru_cache
+
+import tiktoken
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Número de tokens de `text` no encoding do modelo (cl100k_base se o modelo for desconhecido)."""
+    return len(_encoding(model or "gpt-4").encode(text))
@@ -0,0 +1,149 @@
+# benchmarks/async_repos.py
+"""
+Compara o acesso ao banco a partir de handlers `async def` em três modos:
+
+  - sync-in-loop: repositório síncrono chamado direto no event loop
+    (o que o chat fazia com `log_message`): bloqueia o loop a cada query;
+  - sync-threadpool: repositório síncrono via `asyncio.to_thread`
+    (equivalente aos handlers `def` do FastAPI);
+  - async: repositórios Async* sobre aiosqlite.
+
+Cada "request" lê um quiz completo e, numa fração deles, grava uma
+resposta. Além de requests/s, mede o maior atraso do event loop (uma
+tarefa que acorda a cada 5 ms), que é o que os outros clientes sentem.
+
+Uso:
+    python -m benchmarks.async_repos --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from backend.infrastructure.session import create_sqlite_engine, create_async_sqlite_engine
+from backend.migrations.runner import migrate
+from backend.repository.quiz_repo import QuizRepo, AsyncQuizRepo
+
+N_QUIZZES = 50
+QUESTIONS_PER_QUIZ = 10
+TICK_S = 0.005
+
+def seed(path: str) -> dict:
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    migrate(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    questions = {}
+    try:
+        repo = QuizRepo(db)
+        for i in range(N_QUIZZES):
+            quiz_id = repo.create_quiz(f"tema {i}", QUESTIONS_PER_QUIZ, [
+                {
+                    "prompt": f"pergunta {i}.{j}",
+                    "correct_answer": "A",
+                    "explanation": "explicação",
+                    "alternatives": [{"letter": l, "text": f"alternativa {l}"} for l in "ABCD"],
+                }
+                for j in range(QUESTIONS_PER_QUIZ)
+            ])
+            questions[quiz_id] = [q["id"] for q in repo.get_quiz_with_questions(quiz_id)["questions"]]
+    finally:
+        db.close()
+        engine.dispose()
+    return questions
+
+async def measure_lag(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_S)
+        lags.append(time.perf_counter() - start - TICK_S)
+
+async def run(mode: str, path: str, questions: dict, n_requests: int, concurrency: int, write_ratio: float) -> dict:
+    url = f"sqlite:///{path}"
+    if mode == "async":
+        engine = create_async_sqlite_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    else:
+        engine = create_sqlite_engine(url)
+        Session = sessionmaker(bind=engine)
+
+    def sync_request(quiz_id, question_id, write):
+        db = Session()
+        try:
+            repo = QuizRepo(db)
+            repo.get_quiz_with_questions(quiz_id)
+            if write:
+                repo.record_answer(quiz_id, "tema", question_id, "A", True, 1000)
+        finally:
+            db.close()
+
+    async def async_request(quiz_id, question_id, write):
+        async with Session() as db:
+            repo = AsyncQuizRepo(db)
+            await repo.get_quiz_with_questions(quiz_id)
+            if write:
+                await repo.record_answer(quiz_id, "tema", question_id, "A", True, 1000)
+
+    sem = asyncio.Semaphore(concurrency)
+    rnd = random.Random(42)
+    quiz_ids = list(questions)
+
+    async def one():
+        quiz_id = rnd.choice(quiz_ids)
+        args = (quiz_id, rnd.choice(questions[quiz_id]), rnd.random() < write_ratio)
+        async with sem:
+            if mode == "async":
+                await async_request(*args)
+            elif mode == "sync-threadpool":
+                await asyncio.to_thread(sync_request, *args)
+            else:
+                sync_request(*args)
+                await asyncio.sleep(0)
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n_requests)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    if mode == "async":
+        await engine.dispose()
+    else:
+        engine.dispose()
+
+    lags.sort()
+    return {
+        "mode": mode,
+        "req_per_s": round(n_requests / wall, 1),
+        "loop_lag_p99_ms": round(lags[int(len(lags) * 0.99)] * 1000, 2) if lags else 0.0,
+        "loop_lag_max_ms": round(lags[-1] * 1000, 2) if lags else 0.0,
+    }
+
+async def main_async(args):
+    path = os.path.join(tempfile.mkdtemp(prefix="async-bench-"), "bench.db")
+    questions = seed(path)
+    results = []
+    for mode in ("sync-in-loop", "sync-threadpool", "async"):
+        results.append(await run(mode, path, questions, args.requests, args.concurrency, args.write_ratio))
+
+    cols = list(results[0].keys())
+    print(" | ".join(f"{c:>16}" for c in cols))
+    for r in results:
+        print(" | ".join(f"{str(r[c]):>16}" for c in cols))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# benchmarks/components.py
+"""
+Benchmarks offline dos componentes do backend, sem rede: LLM e embeddings
+são substituídos por fakes determinísticos (benchmarks/fakes.py) e a
+documentação por um corpus sintético.
+
+Componentes medidos:
+  - index: `index_documents` (split + embeddings + FAISS + save_local),
+    o que `load_and_index` faz depois do crawl;
+  - retrieval: `similarity_search` no índice criado;
+  - find_best_match: deduplicação de perguntas de FAQ;
+  - faq_upsert / quiz_create: escritas do FAQRepo e do QuizRepo num SQLite temporário;
+  - count_tokens: contagem de tokens do chat (precisa do arquivo BPE do
+    tiktoken em cache; sem ele o item sai como "skipped").
+
+O resultado vai para um JSON (parâmetros, ambiente, commit e estatísticas
+por componente) para comparar execuções; `--baseline` mostra a razão das
+medianas contra um JSON anterior.
+
+Uso:
+    python -m benchmarks.components --docs 500 --queries 200
+    python -m benchmarks.components --baseline benchmarks/results/components-20260101-120000.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from benchmarks.fakes import FakeEmbeddings, install_fakes, synthetic_corpus, synthetic_questions
+
+install_fakes()
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.infrastructure.config import settings
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def summarize(durations: List[float], **extra) -> Dict[str, float]:
+    ordered = sorted(durations)
+    return {
+        "n": len(ordered),
+        "total_s": round(sum(ordered), 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        **extra,
+    }
+
+def timed(fn: Callable, args_list) -> List[float]:
+    durations = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def bench_index(docs, vs_path: str):
+    from backend.services.docs_loader import index_documents
+    start = time.perf_counter()
+    vs = index_documents(docs, embeddings=FakeEmbeddings(), save_path=vs_path)
+    elapsed = time.perf_counter() - start
+    return vs, summarize([elapsed], docs=len(docs), chunks=vs.index.ntotal)
+
+def bench_retrieval(vs, questions: List[str], k: int):
+    return summarize(timed(lambda q: vs.similarity_search(q, k=k), [(q,) for q in questions]), k=k)
+
+def bench_find_best_match(questions: List[str], n_candidates: int):
+    # Importado depois do índice: faq_chains carrega o vectorstore de settings.VS_PATH na importação
+    from backend.services.faq_service import find_best_match
+    candidates = synthetic_questions(n_candidates, seed=11)
+    return summarize(timed(lambda q: find_best_match(q, candidates), [(q,) for q in questions]), candidates=n_candidates)
+
+def bench_repo_writes(n_faqs: int, n_quizzes: int, questions_per_quiz: int):
+    from backend.infrastructure.session import create_sqlite_engine
+    from backend.migrations.runner import migrate
+    from backend.repository.faq_repo import FAQRepo
+    from backend.repository.quiz_repo import QuizRepo
+
+    path = os.path.join(tempfile.mkdtemp(prefix="components-bench-"), "bench.db")
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    migrate(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        faq_repo, quiz_repo = FAQRepo(db), QuizRepo(db)
+        faqs = [(f"Pergunta {i}?", f"Resposta {i}.", "Trecho da documentação.", f"https://exemplo.com/{i}") for i in range(n_faqs)]
+        faq_times = timed(faq_repo.upsert, faqs)
+        questions = [
+            {
+                "prompt": f"pergunta {j}",
+                "correct_answer": "A",
+                "explanation": "explicação",
+                "alternatives": [{"letter": l, "text": f"alternativa {l}"} for l in "ABCD"],
+            }
+            for j in range(questions_per_quiz)
+        ]
+        quiz_times = timed(quiz_repo.create_quiz, [(f"tema {i}", questions_per_quiz, questions) for i in range(n_quizzes)])
+    finally:
+        db.close()
+        engine.dispose()
+    return summarize(faq_times), summarize(quiz_times, questions_per_quiz=questions_per_quiz)
+
+def bench_count_tokens(docs):
+    from backend.services.token_counter import count_tokens
+    texts = [(d.page_content,) for d in docs]
+    try:
+        count_tokens("aquecimento", model=settings.CHAT_MODEL)
+    except Exception as e:   # arquivo BPE ausente e sem rede
+        return {"skipped": f"{type(e).__name__}: {e}"}
+    total_tokens = sum(count_tokens(t, model=settings.CHAT_MODEL) for (t,) in texts)
+    durations = timed(lambda t: count_tokens(t, model=settings.CHAT_MODEL), texts)
+    return summarize(durations, tokens=total_tokens, tokens_per_s=round(total_tokens / sum(durations)))
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+def compare(results: Dict, baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\nComparação com {baseline_path} (p50 atual / p50 base):")
+    for name, res in results.items():
+        base = baseline.get(name, {})
+        if "p50_ms" in res and base.get("p50_ms"):
+            print(f"  {name:>16}: {res['p50_ms'] / base['p50_ms']:.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=300, help="documentos no corpus sintético")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--candidates", type=int, default=500, help="FAQs existentes no find_best_match")
+    parser.add_argument("--faqs", type=int, default=300)
+    parser.add_argument("--quizzes", type=int, default=50)
+    parser.add_argument("--questions-per-quiz", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="arquivo JSON (padrão: benchmarks/results/components-<data>.json)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    # Índice num diretório temporário; as chains passam a carregar este, não o real
+    settings.VS_PATH = os.path.join(tempfile.mkdtemp(prefix="components-vs-"), "faiss_index")
+
+    docs = synthetic_corpus(args.docs, seed=args.seed)
+    questions = synthetic_questions(args.queries, seed=args.seed)
+
+    results = {}
+    vs, results["index"] = bench_index(docs, settings.VS_PATH)
+    results["retrieval"] = bench_retrieval(vs, questions, args.k)
+    results["find_best_match"] = bench_find_best_match(questions, args.candidates)
+    results["faq_upsert"], results["quiz_create"] = bench_repo_writes(args.faqs, args.quizzes, args.questions_per_quiz)
+    results["count_tokens"] = bench_count_tokens(docs)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": vars(args),
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"components-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    for name, res in results.items():
+        print(f"{name:>16}: " + ", ".join(f"{k}={v}" for k, v in res.items()))
+    print(f"\nResultado salvo em {output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+if __name__ == "__main__":
+    main()
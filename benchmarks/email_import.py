@@ -0,0 +1,85 @@
+# benchmarks/email_import.py
+"""
+Vazão de importação de e-mails: um commit por e-mail (EmailRepo.create,
+como N chamadas a POST /emails/) contra a importação em lotes de
+`import_emails` (POST /emails/bulk), com o corpo NDJSON chegando em pedaços.
+
+Uso:
+    python -m benchmarks.email_import --emails 20000 --batch-sizes 100 500 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from backend.infrastructure.session import create_sqlite_engine, create_async_sqlite_engine
+from backend.migrations.runner import migrate
+from backend.repository.email_repo import EmailRepo
+from backend.services.email_import import import_emails
+
+CHUNK_SIZE = 64 * 1024
+
+def make_emails(n: int):
+    return [
+        {"sender": f"aluno{i}@exemplo.com", "subject": f"Dúvida {i}", "body": "Olá, professor. " * 20}
+        for i in range(n)
+    ]
+
+def fresh_db() -> str:
+    path = os.path.join(tempfile.mkdtemp(prefix="email-bench-"), "bench.db")
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    migrate(engine)
+    engine.dispose()
+    return path
+
+def bench_per_row(emails) -> float:
+    engine = create_sqlite_engine(f"sqlite:///{fresh_db()}")
+    db = sessionmaker(bind=engine)()
+    start = time.perf_counter()
+    repo = EmailRepo(db)
+    for e in emails:
+        repo.create(**e)
+    elapsed = time.perf_counter() - start
+    db.close()
+    engine.dispose()
+    return elapsed
+
+async def bench_bulk(emails, batch_size: int) -> float:
+    body = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in emails).encode()
+
+    async def chunks():
+        for i in range(0, len(body), CHUNK_SIZE):
+            yield body[i:i + CHUNK_SIZE]
+
+    engine = create_async_sqlite_engine(f"sqlite+aiosqlite:///{fresh_db()}")
+    Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with Session() as db:
+        start = time.perf_counter()
+        report = await import_emails(db, chunks(), "ndjson", batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+    await engine.dispose()
+    assert report["inserted"] == len(emails), report
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=20000)
+    parser.add_argument("--per-row-sample", type=int, default=2000, help="e-mails no modo um-commit-por-linha")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 500, 2000])
+    args = parser.parse_args()
+
+    emails = make_emails(args.emails)
+    sample = emails[:args.per_row_sample]
+    elapsed = bench_per_row(sample)
+    print(f"{'por linha':>12} | {len(sample) / elapsed:>10.0f} e-mails/s")
+    for size in args.batch_sizes:
+        elapsed = asyncio.run(bench_bulk(emails, size))
+        print(f"{'lote ' + str(size):>12} | {len(emails) / elapsed:>10.0f} e-mails/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# benchmarks/fake_openai.py
+"""
+Servidor local compatível com a API da OpenAI (chat completions com e sem
+streaming, embeddings e lista de modelos), para testes de carga sem custo
+e com latência controlada:
+
+  - o primeiro token sai depois de --ttft-ms;
+  - os demais saem a --tokens-per-sec;
+  - embeddings são determinísticos (mesmo hashing de benchmarks/fakes.py),
+    com --embedding-dim posições.
+
+O conteúdo segue o prompt: pedidos de quiz recebem um array JSON com o
+número de perguntas pedido, pedidos de FAQ um array de FAQs, e o chat um
+texto de --completion-tokens tokens.
+
+Uso:
+    # índice FAISS sintético com os mesmos embeddings do servidor
+    python -m benchmarks.fake_openai --build-index /tmp/fake_index --docs 300
+    python -m benchmarks.fake_openai --port 9000 --ttft-ms 400 --tokens-per-sec 40
+
+    # backend apontando para o servidor fake; o gerador de carga sai de um
+    # único IP, então os limites de tokens por IP/sessão ficam desligados
+    # (senão o teste mede 429, não vazão)
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=fake VS_PATH=/tmp/fake_index \\
+    IP_TOKENS_PER_MINUTE=0 SESSION_TOKENS_PER_MINUTE=0 \\
+        uvicorn backend.main:app
+"""
+import argparse
+import asyncio
+import base64
+import json
+import re
+import struct
+import time
+import uuid
+from typing import Any, Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.fakes import FakeEmbeddings, synthetic_corpus
+
+WORDS = (
+    "Em Python, listas são mutáveis e aceitam qualquer tipo. No FastAPI, "
+    "dependências são declaradas com Depends e resolvidas a cada request. "
+    "No Streamlit, o session_state guarda valores entre execuções do script. "
+).split()
+
+_N_QUESTIONS_RE = re.compile(r"exatamente (\d+) perguntas")
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for m in messages:
+        content = m.get("content")
+        if isinstance(content, list):   # formato com partes (texto/imagem)
+            content = " ".join(p.get("text", "") for p in content if isinstance(p, dict))
+        parts.append(content or "")
+    return "\n".join(parts)
+
+def _completion_text(prompt: str, completion_tokens: int) -> str:
+    nonce = uuid.uuid4().hex[:8]   # enunciados únicos: a deduplicação do quiz não descarta nada
+    if "múltipla escolha" in prompt:
+        match = _N_QUESTIONS_RE.search(prompt)
+        n = int(match.group(1)) if match else 3
+        return json.dumps([
+            {
+                "prompt": f"Pergunta {nonce}-{i}: qual alternativa descreve o conceito {i}?",
+                "options": {l: f"Alternativa {l} da pergunta {i}" for l in "ABCD"},
+                "correct_answer": "ABCD"[i % 4],
+                "explanation": "Explicação gerada pelo servidor fake.",
+            }
+            for i in range(n)
+        ], ensure_ascii=False)
+    if "FAQ" in prompt and "Emails:" in prompt:
+        return json.dumps([
+            {
+                "question": f"Dúvida frequente {nonce}-{i}?",
+                "answer": "Resposta gerada pelo servidor fake.",
+                "excerpt": "Trecho da documentação.",
+                "link": "https://docs.python.org/3/tutorial/",
+            }
+            for i in range(3)
+        ], ensure_ascii=False)
+    return " ".join(WORDS[i % len(WORDS)] for i in range(completion_tokens))
+
+def _pieces(text: str) -> List[str]:
+    """Quebra o texto em "tokens" de ~4 caracteres (média do tokenizer da OpenAI)."""
+    return [text[i:i + 4] for i in range(0, len(text), 4)] or [""]
+
+def _usage(prompt: str, pieces: List[str]) -> Dict[str, int]:
+    prompt_tokens = max(1, len(prompt) // 4)
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": len(pieces), "total_tokens": prompt_tokens + len(pieces)}
+
+def create_app(ttft: float, tokens_per_sec: float, completion_tokens: int, embedding_dim: int) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    embedder = FakeEmbeddings(size=embedding_dim)
+    interval = 1.0 / tokens_per_sec if tokens_per_sec > 0 else 0.0
+
+    @app.get("/v1/models")
+    def list_models():
+        return {"object": "list", "data": [{"id": "fake-model", "object": "model", "owned_by": "benchmarks"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model") or "fake-model"
+        prompt = _prompt_text(body.get("messages", []))
+        pieces = _pieces(_completion_text(prompt, completion_tokens))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            await asyncio.sleep(ttft + interval * (len(pieces) - 1))
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(pieces)},
+                    "finish_reason": "stop",
+                }],
+                "usage": _usage(prompt, pieces),
+            }
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: Dict[str, Any], finish_reason=None, usage=None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if usage is None else [],
+            }
+            if usage is not None:
+                payload["usage"] = usage
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        async def gen():
+            await asyncio.sleep(ttft)
+            yield chunk({"role": "assistant", "content": pieces[0]})
+            # Ritmo pelo relógio, não por sleep fixo: atrasos do loop não se acumulam
+            start = time.perf_counter()
+            for i, piece in enumerate(pieces[1:], start=1):
+                delay = start + interval * i - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                yield chunk({"content": piece})
+            yield chunk({}, finish_reason="stop")
+            if include_usage:
+                yield chunk({}, usage=_usage(prompt, pieces))
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(gen(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input", [])
+        # A API aceita texto, lista de textos, tokens ou lista de listas de tokens
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        texts = [t if isinstance(t, str) else " ".join(map(str, t)) for t in inputs]
+        vectors = embedder.embed_documents(texts)
+        as_base64 = body.get("encoding_format") == "base64"
+        data = [
+            {
+                "object": "embedding",
+                "index": i,
+                "embedding": (
+                    base64.b64encode(struct.pack(f"<{len(v)}f", *v)).decode("ascii") if as_base64 else v
+                ),
+            }
+            for i, v in enumerate(vectors)
+        ]
+        tokens = sum(max(1, len(t) // 4) for t in texts)
+        return JSONResponse({
+            "object": "list",
+            "data": data,
+            "model": body.get("model") or "fake-embedding",
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    return app
+
+def build_index(path: str, n_docs: int, embedding_dim: int) -> None:
+    from backend.services.docs_loader import index_documents
+    vs = index_documents(synthetic_corpus(n_docs), embeddings=FakeEmbeddings(size=embedding_dim), save_path=path)
+    print(f"Índice com {vs.index.ntotal} chunks salvo em {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--ttft-ms", type=float, default=300)
+    parser.add_argument("--tokens-per-sec", type=float, default=50)
+    parser.add_argument("--completion-tokens", type=int, default=200, help="tamanho das respostas de chat")
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    parser.add_argument("--build-index", metavar="PATH", help="só cria um índice FAISS sintético em PATH e sai")
+    parser.add_argument("--docs", type=int, default=300, help="documentos do índice sintético")
+    args = parser.parse_args()
+
+    if args.build_index:
+        build_index(args.build_index, args.docs, args.embedding_dim)
+        return
+    app = create_app(args.ttft_ms / 1000, args.tokens_per_sec, args.completion_tokens, args.embedding_dim)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/fakes.py
+"""
+Substitutos determinísticos e offline de `ChatOpenAI` e `OpenAIEmbeddings`
+para os benchmarks, e um corpus sintético de documentação.
+
+`install_fakes()` troca as classes no módulo `langchain_openai`; precisa
+rodar antes de importar módulos do backend que fazem
+`from langchain_openai import ...` (as chains criam o LLM e carregam o
+vectorstore na importação).
+"""
+import json
+import math
+import random
+import re
+import zlib
+from typing import Any, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+class FakeEmbeddings(Embeddings):
+    """
+    Embeddings por hashing de palavras (bag of words num vetor de `size`
+    posições, normalizado). Textos com palavras em comum ficam próximos,
+    então a busca no FAISS devolve resultados plausíveis.
+    """
+    def __init__(self, model: Optional[str] = None, size: int = 256, **kwargs: Any):
+        self.model = model
+        self.size = size
+
+    def _embed(self, text: str) -> List[float]:
+        vec = [0.0] * self.size
+        for tok in _TOKEN_RE.findall(text.lower()):
+            vec[zlib.crc32(tok.encode("utf-8")) % self.size] += 1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+def fake_quiz_json(n_questions: int = 3) -> str:
+    return json.dumps([
+        {
+            "prompt": f"Pergunta sintética {i}?",
+            "options": {l: f"Alternativa {l}" for l in "ABCD"},
+            "correct_answer": "A",
+            "explanation": "Explicação sintética.",
+        }
+        for i in range(n_questions)
+    ], ensure_ascii=False)
+
+class FakeChatOpenAI(FakeListChatModel):
+    """Aceita os mesmos argumentos usados no backend e responde sempre o mesmo JSON de quiz."""
+    model: Optional[str] = None
+    streaming: bool = False
+    temperature: Optional[float] = None
+    responses: List[str] = [fake_quiz_json()]
+
+    def __init__(self, **kwargs: Any):
+        # Descarta o que só faz sentido para o cliente real (base_url, http_client, timeout...)
+        fields = getattr(type(self), "model_fields", None) or type(self).__fields__
+        super().__init__(**{k: v for k, v in kwargs.items() if k in fields})
+
+def install_fakes() -> None:
+    import langchain_openai
+    langchain_openai.ChatOpenAI = FakeChatOpenAI
+    langchain_openai.OpenAIEmbeddings = FakeEmbeddings
+
+TOPICS = {
+    "python": ["lista", "tupla", "dicionário", "função", "classe", "exceção", "módulo", "iterador", "gerador", "decorador"],
+    "fastapi": ["rota", "dependência", "pydantic", "middleware", "request", "response", "validação", "openapi", "async", "router"],
+    "streamlit": ["widget", "sidebar", "session_state", "cache", "dataframe", "gráfico", "layout", "coluna", "formulário", "deploy"],
+}
+FILLER = "o a de para com em que um uma como usar exemplo código valor retorna chama cria define".split()
+
+def synthetic_corpus(n_docs: int, words_per_doc: int = 400, seed: int = 42) -> List[Document]:
+    """Documentos com vocabulário de Python/FastAPI/Streamlit, iguais para o mesmo `seed`."""
+    rnd = random.Random(seed)
+    docs = []
+    for i in range(n_docs):
+        topic = rnd.choice(sorted(TOPICS))
+        vocab = TOPICS[topic]
+        words = [rnd.choice(vocab) if rnd.random() < 0.3 else rnd.choice(FILLER) for _ in range(words_per_doc)]
+        text = f"{topic} {rnd.choice(vocab)}\n\n" + " ".join(words)
+        docs.append(Document(page_content=text, metadata={"source": f"synthetic://{topic}/{i}"}))
+    return docs
+
+def synthetic_questions(n: int, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    questions = []
+    for _ in range(n):
+        topic = rnd.choice(sorted(TOPICS))
+        a, b = rnd.sample(TOPICS[topic], 2)
+        questions.append(f"Como usar {a} com {b} no {topic}?")
+    return questions
@@ -0,0 +1,143 @@
+# benchmarks/load_test.py
+"""
+Gerador de carga ponta a ponta contra o backend rodando (de preferência
+apontado para o servidor fake de benchmarks/fake_openai.py).
+
+Cenários:
+  - chat: POST /chat/stream, consumindo o stream SSE; mede TTFT (primeiro
+    evento `token`) e a duração total; um evento `error` conta como erro;
+  - quiz: POST /quiz/generate;
+  - faq:  POST /faq/generate (gera a partir de todos os e-mails; é pesado).
+
+Para cada cenário, com --concurrency clientes simultâneos, reporta
+vazão (req/s), erros e p50/p95/p99 de latência (e de TTFT no chat).
+
+Todas as requisições saem do mesmo IP: suba o backend com
+IP_TOKENS_PER_MINUTE=0 e SESSION_TOKENS_PER_MINUTE=0 (ver
+benchmarks/fake_openai.py) e, acima de ~190 clientes, aumente
+CHAT_MAX_STREAMS/CHAT_MAX_QUEUE; do contrário os erros "429" dominam.
+
+Uso:
+    python -m benchmarks.load_test --scenario chat --concurrency 50 --requests 500
+    python -m benchmarks.load_test --scenario chat quiz --concurrency 10 --requests 100 --json
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.fakes import synthetic_questions
+
+def percentile(ordered: List[float], p: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 1)
+
+def latency_stats(values: List[float], prefix: str) -> Dict[str, Optional[float]]:
+    ordered = sorted(values)
+    return {f"{prefix}_p{int(p * 100)}_ms": percentile(ordered, p) for p in (0.5, 0.95, 0.99)}
+
+async def chat_request(client: httpx.AsyncClient, question: str) -> Dict[str, float]:
+    start = time.perf_counter()
+    ttft = None
+    payload = {"question": f"{question} ({uuid.uuid4().hex[:6]})", "session_id": str(uuid.uuid4())}
+    async with client.stream("POST", "/chat/stream", json=payload) as res:
+        res.raise_for_status()
+        event = None
+        async for line in res.aiter_lines():
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                if event == "token" and ttft is None:
+                    ttft = time.perf_counter() - start
+                elif event == "error":
+                    raise RuntimeError(json.loads(line[len("data:"):])["detail"])
+            elif not line:
+                event = None
+    return {"latency": time.perf_counter() - start, "ttft": ttft}
+
+async def quiz_request(client: httpx.AsyncClient, theme: str, n_questions: int) -> Dict[str, float]:
+    start = time.perf_counter()
+    res = await client.post("/quiz/generate", json={"theme": theme, "n_questions": n_questions})
+    res.raise_for_status()
+    return {"latency": time.perf_counter() - start}
+
+async def faq_request(client: httpx.AsyncClient) -> Dict[str, float]:
+    start = time.perf_counter()
+    res = await client.post("/faq/generate")
+    res.raise_for_status()
+    return {"latency": time.perf_counter() - start}
+
+async def run_scenario(args, scenario: str) -> Dict:
+    questions = synthetic_questions(max(args.requests, 1), seed=args.seed)
+    rnd = random.Random(args.seed)
+    sem = asyncio.Semaphore(args.concurrency)
+    samples: List[Dict[str, float]] = []
+    errors: Dict[str, int] = {}
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        async def one(i: int):
+            async with sem:
+                try:
+                    if scenario == "chat":
+                        samples.append(await chat_request(client, questions[i]))
+                    elif scenario == "quiz":
+                        samples.append(await quiz_request(client, rnd.choice(args.themes), args.n_questions))
+                    else:
+                        samples.append(await faq_request(client))
+                except Exception as e:
+                    key = f"{e.response.status_code}" if isinstance(e, httpx.HTTPStatusError) else type(e).__name__
+                    errors[key] = errors.get(key, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        wall = time.perf_counter() - start
+
+    result = {
+        "scenario": scenario,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "ok": len(samples),
+        "errors": errors,
+        "wall_s": round(wall, 2),
+        "req_per_s": round(len(samples) / wall, 2) if wall else 0.0,
+        **latency_stats([s["latency"] for s in samples], "latency"),
+    }
+    if scenario == "chat":
+        result.update(latency_stats([s["ttft"] for s in samples if s.get("ttft") is not None], "ttft"))
+    return result
+
+async def main_async(args):
+    results = [await run_scenario(args, scenario) for scenario in args.scenario]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"== {r['scenario']} (concorrência {r['concurrency']}) ==")
+        for k, v in r.items():
+            if k not in ("scenario", "concurrency"):
+                print(f"  {k:>16}: {v}")
+        if r["errors"].get("429"):
+            print("  aviso: respostas 429 do controle de admissão; veja o início deste arquivo")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", nargs="+", choices=["chat", "quiz", "faq"], default=["chat"])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="requisições por cenário")
+    parser.add_argument("--themes", nargs="+", default=["listas em python", "dependências no fastapi", "session_state no streamlit"])
+    parser.add_argument("--n-questions", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/sqlite_concurrency.py
+"""
+Benchmark de leitura/escrita concorrente no SQLite.
+
+Compara a configuração padrão (journal DELETE, sem escritor serializado)
+com a ajustada (WAL + PRAGMAs + `serialized_write`) numa carga mista
+parecida com a do chat: gravar mensagens e ler o histórico de sessões.
+
+Uso:
+    python -m benchmarks.sqlite_concurrency --threads 16 --seconds 10 --write-ratio 0.3
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.infrastructure.db_writer import serialized_write
+from backend.infrastructure.session import create_sqlite_engine
+from backend.migrations.runner import migrate
+from backend.models.message import Message
+
+N_SESSIONS = 50
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+def run(tuned: bool, threads: int, seconds: float, write_ratio: float) -> dict:
+    tmpdir = tempfile.mkdtemp(prefix="sqlite-bench-")
+    engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", tuned=tuned)
+    migrate(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    sessions = [str(uuid.uuid4()) for _ in range(N_SESSIONS)]
+
+    lock = threading.Lock()
+    stats = {"reads": 0, "writes": 0, "locked": 0, "other_errors": 0}
+    read_lat, write_lat = [], []
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed: int):
+        rnd = random.Random(seed)
+        db = Session()
+        try:
+            while time.perf_counter() < deadline:
+                session_id = rnd.choice(sessions)
+                is_write = rnd.random() < write_ratio
+                start = time.perf_counter()
+                try:
+                    if is_write:
+                        with serialized_write() if tuned else nullcontext():
+                            db.add(Message(session_id=session_id, role="user", content="x" * 200,
+                                           prompt_tokens=50, completion_tokens=0))
+                            db.commit()
+                    else:
+                        (db.query(Message)
+                           .filter(Message.session_id == session_id)
+                           .order_by(Message.id.desc())
+                           .limit(20)
+                           .all())
+                        db.commit()
+                except OperationalError as e:
+                    db.rollback()
+                    key = "locked" if "locked" in str(e) else "other_errors"
+                    with lock:
+                        stats[key] += 1
+                    continue
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if is_write:
+                        stats["writes"] += 1
+                        write_lat.append(elapsed)
+                    else:
+                        stats["reads"] += 1
+                        read_lat.append(elapsed)
+        finally:
+            db.close()
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    wall = time.perf_counter() - started
+    engine.dispose()
+
+    return {
+        "config": "tuned" if tuned else "baseline",
+        "ops_per_s": round((stats["reads"] + stats["writes"]) / wall, 1),
+        "writes_per_s": round(stats["writes"] / wall, 1),
+        **stats,
+        "read_p50_ms": round(statistics.median(read_lat) * 1000, 2) if read_lat else 0.0,
+        "read_p95_ms": round(_percentile(read_lat, 0.95) * 1000, 2),
+        "write_p50_ms": round(statistics.median(write_lat) * 1000, 2) if write_lat else 0.0,
+        "write_p95_ms": round(_percentile(write_lat, 0.95) * 1000, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    results = [run(tuned, args.threads, args.seconds, args.write_ratio) for tuned in (False, True)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    cols = list(results[0].keys())
+    print(" | ".join(f"{c:>13}" for c in cols))
+    for r in results:
+        print(" | ".join(f"{str(r[c]):>13}" for c in cols))
+
+if __name__ == "__main__":
+    main()
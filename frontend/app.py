@@ -1,7 +1,9 @@
 import streamlit as st
 import requests
+import json
 from dotenv import load_dotenv
 import os
+import time
 import uuid
 
 # Carrega variáveis de ambiente
@@ -12,11 +14,17 @@ API_URL = os.getenv("API_URL", "http://127.0.0.1:8000/chat/stream")
 BASE_URL = API_URL.rsplit("/chat/stream", 1)[0]
 CHAT_URL = API_URL
 FAQ_LIST_URL = f"{BASE_URL}/faq/"
-GENERATE_FAQ_URL = f"{BASE_URL}/faq/generate"
+FAQ_SEARCH_URL = f"{BASE_URL}/faq/search"
+GENERATE_FAQ_URL = f"{BASE_URL}/faq/generate/async"
+JOB_STATUS_URL_TEMPLATE = f"{BASE_URL}/jobs/{{job_id}}"
+JOB_RESULT_URL_TEMPLATE = f"{BASE_URL}/jobs/{{job_id}}/result"
 EMAIL_CREATE_URL = f"{BASE_URL}/emails/"
-QUIZ_GENERATE_URL = f"{BASE_URL}/quiz/generate"
+QUIZ_GENERATE_URL = f"{BASE_URL}/quiz/generate/stream"
 QUIZ_ANSWER_URL_TEMPLATE = f"{BASE_URL}/quiz/{{quiz_id}}/answer"
 
+# Re-renderizações por segundo da resposta do chat enquanto ela chega
+CHAT_RENDER_FPS = float(os.getenv("CHAT_RENDER_FPS", "15"))
+
 # Configuração da página
 st.set_page_config(
     page_title="EdTech Futura",
@@ -25,6 +33,86 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+FAQ_PAGE_SIZE = 1000   # máximo aceito pela listagem
+
+@st.cache_resource
+def faq_page_cache():
+    """
+    Páginas da listagem de FAQs já baixadas, com o ETag de cada uma:
+    after_id -> (etag, faqs, próximo cursor). Fica no processo do
+    Streamlit, então sobrevive a sessões novas e ao "Limpar Conversa".
+    """
+    return {}
+
+def load_all_faqs():
+    """
+    Carrega todas as FAQs página a página (keyset, header X-Next-Cursor).
+    Cada página vai com o ETag guardado em If-None-Match: sem mudanças o
+    backend responde 304, sem ler o banco, e a página guardada é reusada.
+    """
+    pages = faq_page_cache()
+    faqs, after_id = [], None
+    while True:
+        params = {"limit": FAQ_PAGE_SIZE}
+        if after_id is not None:
+            params["after_id"] = after_id
+        cached = pages.get(after_id)
+        headers = {"If-None-Match": cached[0]} if cached and cached[0] else {}
+        res = requests.get(FAQ_LIST_URL, params=params, headers=headers, timeout=10)
+        if res.status_code == 304:
+            page, next_cursor = cached[1], cached[2]
+        else:
+            res.raise_for_status()
+            page, next_cursor = res.json(), res.headers.get("X-Next-Cursor")
+            pages[after_id] = (res.headers.get("ETag"), page, next_cursor)
+        faqs.extend(page)
+        if not next_cursor:
+            return faqs
+        after_id = int(next_cursor)
+
+def iter_sse(response):
+    """
+    Lê um stream Server-Sent Events à medida que os bytes chegam e devolve
+    (evento, dados) a cada evento completo; os dados vêm em JSON.
+    """
+    event, data = "message", []
+    for raw in response.iter_lines(chunk_size=None):
+        line = raw.decode("utf-8")
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].lstrip())
+
+def render_sources(sources):
+    links = sorted({s["source"] for s in sources if s.get("source")})
+    if links:
+        st.caption("Fontes: " + " · ".join(links))
+
+def wait_for_job(job_id, progress_bar, poll_interval=1.0):
+    """
+    Acompanha um job assíncrono do backend até o fim, atualizando a barra
+    de progresso, e retorna o JSON de resultado.
+    """
+    while True:
+        res = requests.get(JOB_STATUS_URL_TEMPLATE.format(job_id=job_id), timeout=10)
+        res.raise_for_status()
+        job = res.json()
+        progress_bar.progress(job["progress"], text=job.get("message") or job["status"])
+        if job["status"] in ("succeeded", "failed", "cancelled"):
+            break
+        time.sleep(poll_interval)
+
+    res = requests.get(JOB_RESULT_URL_TEMPLATE.format(job_id=job_id), timeout=10)
+    res.raise_for_status()
+    out = res.json()
+    if out["status"] != "succeeded":
+        raise RuntimeError(out.get("error") or f"Job {out['status']}")
+    return out["result"]
+
 # Sidebar com navegação
 with st.sidebar:
     st.title("EdTech Futura")
@@ -55,49 +143,85 @@ if page == "Chat":
     for message in st.session_state.history:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
+            render_sources(message.get("sources", []))
     if prompt := st.chat_input("Pergunte sobre Python, FastAPI ou Streamlit..."):
         st.session_state.history.append({"role": "user", "content": prompt})
         with st.chat_message("user"):
             st.markdown(prompt)
         full_response = ""
+        sources = []
         with st.chat_message("assistant"):
             placeholder = st.empty()
+            parts = []
             try:
                 payload = {"question": prompt, "session_id": st.session_state.session_id}
                 response = requests.post(CHAT_URL, json=payload, stream=True, timeout=60)
+                if response.status_code == 429:
+                    retry = response.headers.get("Retry-After", "alguns")
+                    raise RuntimeError(f"muitas perguntas seguidas; tente de novo em {retry} s")
                 response.raise_for_status()
-                for chunk in response.iter_content(chunk_size=64):
-                    part = chunk.decode("utf-8")
-                    full_response += part
-                    placeholder.markdown(full_response)
-            except requests.RequestException as e:
-                placeholder.markdown(f"❌ Erro: {e}")
-                full_response = f"Erro: {e}"
-        st.session_state.history.append({"role": "assistant", "content": full_response})
+                # Os tokens são acumulados e a resposta só é redesenhada a
+                # cada 1/CHAT_RENDER_FPS s, não a cada pedaço recebido
+                last_render = 0.0
+                for event, data in iter_sse(response):
+                    if event == "sources":
+                        sources = data["sources"]
+                    elif event == "token":
+                        parts.append(data["text"])
+                        now = time.monotonic()
+                        if now - last_render >= 1 / CHAT_RENDER_FPS:
+                            placeholder.markdown("".join(parts) + "▌")
+                            last_render = now
+                    elif event == "error":
+                        raise RuntimeError(data["detail"])
+                full_response = "".join(parts)
+                placeholder.markdown(full_response)
+                render_sources(sources)
+            except (requests.RequestException, RuntimeError) as e:
+                partial = "".join(parts)
+                full_response = f"{partial}\n\nErro: {e}" if partial else f"Erro: {e}"
+                placeholder.markdown(f"{partial}\n\n❌ Erro: {e}" if partial else f"❌ Erro: {e}")
+        st.session_state.history.append({"role": "assistant", "content": full_response, "sources": sources})
 
 # === Página de FAQ ===
 elif page == "FAQ":
     st.header("📖 FAQ Consolidada")
     if not st.session_state.faqs:
         try:
-            res = requests.get(FAQ_LIST_URL, timeout=10)
-            res.raise_for_status()
-            st.session_state.faqs = res.json()
+            st.session_state.faqs = load_all_faqs()
         except Exception as e:
             st.error(f"Não foi possível carregar FAQs: {e}")
     if st.button("🔄 Gerar FAQ a partir dos e-mails"):
         try:
-            res = requests.post(GENERATE_FAQ_URL, timeout=180)
+            res = requests.post(GENERATE_FAQ_URL, timeout=10)
             res.raise_for_status()
-            st.session_state.faqs = res.json()
+            progress_bar = st.progress(0, text="Na fila")
+            wait_for_job(res.json()["job_id"], progress_bar)
+            progress_bar.empty()
+            # Recarrega a lista completa (a geração retorna só as FAQs novas/atualizadas)
+            st.session_state.faqs = load_all_faqs()
             st.success("✅ FAQ gerada com sucesso!")
         except Exception as e:
             st.error(f"Erro ao gerar FAQ: {e}")
     st.markdown("---")
-    for faq in st.session_state.faqs:
-        with st.expander(faq["question"]):
-            st.markdown(faq["answer"])
-            st.markdown(f"**Fonte:** {faq['excerpt']}  \n{faq['link']}")
+    search = st.text_input("🔎 Buscar nas FAQs", "")
+    if search.strip():
+        try:
+            res = requests.get(FAQ_SEARCH_URL, params={"q": search, "limit": 20}, timeout=10)
+            res.raise_for_status()
+            page_data = res.json()
+            st.caption(f"{page_data['total']} resultado(s)")
+            for hit in page_data["items"]:
+                with st.expander(hit["question"]):
+                    st.markdown(hit["answer_snippet"] or hit["answer"])
+                    st.markdown(f"**Fonte:** {hit['excerpt']}  \n{hit['link']}")
+        except Exception as e:
+            st.error(f"Erro na busca: {e}")
+    else:
+        for faq in st.session_state.faqs:
+            with st.expander(faq["question"]):
+                st.markdown(faq["answer"])
+                st.markdown(f"**Fonte:** {faq['excerpt']}  \n{faq['link']}")
 
 # === Página de Emails ===
 elif page == "Enviar Email":
@@ -142,10 +266,33 @@ elif page == "Quiz":
                 res = requests.post(
                     QUIZ_GENERATE_URL,
                     json={"theme": theme, "n_questions": n},
+                    stream=True,
                     timeout=60
                 )
                 res.raise_for_status()
-                st.session_state.quiz = res.json()
+                # NDJSON: uma linha por evento, perguntas chegam conforme são geradas
+                progress_bar = st.progress(0, text="Gerando perguntas...")
+                quiz = None
+                for line in res.iter_lines(decode_unicode=True):
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if event["event"] == "quiz":
+                        quiz = {**event["quiz"], "questions": []}
+                    elif event["event"] == "question":
+                        quiz["questions"].append(event["question"])
+                        done = len(quiz["questions"])
+                        progress_bar.progress(
+                            min(done / quiz["n_questions"], 1.0),
+                            text=f"Pergunta {done} de {quiz['n_questions']} pronta"
+                        )
+                    elif event["event"] == "error" and not (quiz and quiz["questions"]):
+                        raise RuntimeError(event["detail"])
+                progress_bar.empty()
+                if not quiz or not quiz["questions"]:
+                    raise RuntimeError("nenhuma pergunta recebida")
+                quiz["n_questions"] = len(quiz["questions"])
+                st.session_state.quiz = quiz
                 st.session_state.current = 0
                 st.session_state.score = 0
             except Exception as e:
@@ -169,6 +316,7 @@ elif page == "Quiz":
             if answered_flag not in st.session_state:
                 st.session_state[answered_flag] = False
                 st.session_state[out_flag] = None
+                st.session_state[f"shown_at_{idx}"] = time.time()
 
             # 1) Formulário de resposta
             if not st.session_state[answered_flag]:
@@ -180,7 +328,12 @@ elif page == "Quiz":
                     given = choice.split(":")[0]
                     try:
                         url = QUIZ_ANSWER_URL_TEMPLATE.format(quiz_id=quiz["id"])
-                        res = requests.post(url, json={"question_id": q["id"], "given_answer": given}, timeout=10)
+                        elapsed_ms = int((time.time() - st.session_state.get(f"shown_at_{idx}", time.time())) * 1000)
+                        res = requests.post(
+                            url,
+                            json={"question_id": q["id"], "given_answer": given, "time_spent_ms": elapsed_ms},
+                            timeout=10
+                        )
                         res.raise_for_status()
                         st.session_state[out_flag] = res.json()
                         st.session_state[answered_flag] = True
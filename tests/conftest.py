@@ -0,0 +1,19 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# Os módulos do backend são importados a partir da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.infrastructure.session import create_sqlite_engine
+from backend.migrations.runner import migrate
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    """Engine de um banco SQLite temporário com todas as migrations aplicadas."""
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    migrate(engine)
+    yield engine
+    engine.dispose()
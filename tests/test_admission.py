@@ -0,0 +1,40 @@
+# tests/test_admission.py
+import asyncio
+
+import pytest
+
+from backend.infrastructure import admission
+from backend.infrastructure.admission import RateLimited, StreamGate, TokenBuckets
+
+def test_bucket_in_debt_rejects_with_retry_after():
+    buckets = TokenBuckets("sessão", "session_tokens", rate=10, burst=100)
+    buckets.check("s")
+    buckets.charge("s", 150)
+    with pytest.raises(RateLimited) as e:
+        buckets.check("s")
+    assert 5 <= e.value.retry_after <= 6
+
+def test_requests_without_session_only_use_ip_bucket(monkeypatch):
+    monkeypatch.setattr(admission, "session_tokens", TokenBuckets("sessão", "session_tokens", rate=10, burst=100))
+    monkeypatch.setattr(admission, "ip_tokens", TokenBuckets("IP", "ip_tokens", rate=10, burst=100))
+    admission.charge_tokens(None, "1.2.3.4", 150)
+    with pytest.raises(RateLimited) as e:
+        admission.check_token_budget(None, "1.2.3.4")
+    assert e.value.reason == "ip_tokens"
+    assert not admission.session_tokens._buckets
+
+def test_stream_gate_queue_full_and_handoff():
+    async def scenario():
+        gate = StreamGate(max_active=1, max_queue=1, queue_timeout=1)
+        first = await gate.admit()
+        waiting = asyncio.create_task(gate.admit())
+        await asyncio.sleep(0)
+        with pytest.raises(RateLimited) as e:
+            await gate.admit()
+        assert e.value.reason == "queue_full"
+        first.release()
+        second = await waiting
+        second.release()
+        return gate.active
+
+    assert asyncio.run(scenario()) == 0
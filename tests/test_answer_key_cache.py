@@ -0,0 +1,62 @@
+# tests/test_answer_key_cache.py
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.models.quiz import Quiz, Question
+from backend.services.answer_key_cache import AnswerKeyCache
+
+@pytest.fixture
+def db(migrated_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=migrated_engine)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def quiz_id(db):
+    quiz = Quiz(theme="listas", n_questions=1, questions=[
+        Question(prompt="Pergunta 1?", correct_answer="A", explanation="Explicação."),
+    ])
+    db.add(quiz)
+    db.commit()
+    return quiz.id
+
+def add_question(db, quiz_id: int) -> int:
+    question = Question(quiz_id=quiz_id, prompt="Pergunta 2?", correct_answer="B", explanation="Explicação.")
+    db.add(question)
+    db.commit()
+    return question.id
+
+def test_key_is_cached_after_first_read(db, quiz_id):
+    cache = AnswerKeyCache(max_quizzes=10)
+    key = cache.get(db, quiz_id)
+    assert key is cache.get(db, quiz_id)
+    assert len(key["questions"]) == 1
+
+def test_invalidate_during_read_does_not_store_stale_key(db, quiz_id, monkeypatch):
+    cache = AnswerKeyCache(max_quizzes=10)
+    build = cache._build
+    added = []
+
+    def build_then_add_question(rows):
+        # Pergunta adicionada (e cache invalidado, como no QuizRepo) entre a leitura e o _store
+        added.append(add_question(db, quiz_id))
+        cache.invalidate(quiz_id)
+        return build(rows)
+
+    monkeypatch.setattr(cache, "_build", build_then_add_question)
+    stale = cache.get(db, quiz_id)
+    monkeypatch.undo()
+    new_question_id = added[0]
+
+    assert new_question_id not in stale["questions"]
+    assert new_question_id in cache.get(db, quiz_id)["questions"]
+
+def test_no_state_is_kept_for_invalidated_or_deleted_quizzes(db, quiz_id):
+    cache = AnswerKeyCache(max_quizzes=10)
+    cache.get(db, quiz_id)
+    for other_id in range(1000, 1100):
+        cache.invalidate(other_id)
+    cache.invalidate(quiz_id)
+    assert cache.get(db, 999_999) is None
+    assert cache._reads == {}
+    assert cache._keys == {}
@@ -0,0 +1,58 @@
+# tests/test_chat_coalescer.py
+import asyncio
+
+from backend.services.chat_coalescer import ChatCoalescer
+
+def slow_producer(calls, chunks=("a", "b", "c"), delay=0.01):
+    async def producer():
+        calls.append(1)
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield chunk
+    return producer
+
+async def read_all(chunks):
+    return [c async for c in chunks]
+
+def test_concurrent_joins_share_one_stream():
+    async def scenario():
+        coalescer, calls = ChatCoalescer(), []
+        first, leader1 = coalescer.join("k", slow_producer(calls))
+        second, leader2 = coalescer.join("k", slow_producer(calls))
+        results = await asyncio.gather(read_all(first), read_all(second))
+        return leader1, leader2, results, calls
+
+    leader1, leader2, results, calls = asyncio.run(scenario())
+    assert (leader1, leader2) == (True, False)
+    assert results == [["a", "b", "c"], ["a", "b", "c"]]
+    assert len(calls) == 1
+
+def test_join_right_after_last_subscriber_leaves_starts_new_stream():
+    async def scenario():
+        coalescer, calls = ChatCoalescer(), []
+        chunks, _ = coalescer.join("k", slow_producer(calls))
+        assert await chunks.__anext__() == "a"
+        # O último cliente desiste: o stream é cancelado, mas a task ainda não rodou o finally
+        await chunks.aclose()
+        again, leader = coalescer.join("k", slow_producer(calls))
+        return leader, await read_all(again), calls
+
+    leader, result, calls = asyncio.run(scenario())
+    assert leader is True
+    assert result == ["a", "b", "c"]
+    assert len(calls) == 2
+
+def test_cancelled_flight_reaches_followers_as_error():
+    async def scenario():
+        coalescer, calls = ChatCoalescer(), []
+        chunks, _ = coalescer.join("k", slow_producer(calls))
+        await asyncio.sleep(0)
+        coalescer._flights["k"].task.cancel()
+        try:
+            await read_all(chunks)
+        except Exception as e:
+            return e
+        return None
+
+    error = asyncio.run(scenario())
+    assert isinstance(error, RuntimeError)
@@ -0,0 +1,78 @@
+# tests/test_db_writer.py
+import asyncio
+import threading
+
+import pytest
+
+from backend.infrastructure import db_writer
+from backend.infrastructure.db_writer import async_serialized_write, serialized_write
+
+def test_waiting_coroutines_do_not_occupy_the_default_executor():
+    async def scenario():
+        release = threading.Event()
+        held = threading.Event()
+
+        def writer_thread():
+            with serialized_write():
+                held.set()
+                release.wait()
+
+        thread = threading.Thread(target=writer_thread)
+        thread.start()
+        held.wait()
+
+        active, peak = 0, 0
+
+        async def write():
+            nonlocal active, peak
+            async with async_serialized_write():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0)
+                active -= 1
+
+        writes = [asyncio.create_task(write()) for _ in range(64)]
+        await asyncio.sleep(0.05)
+        # Com o lock ocupado, o executor padrão continua livre
+        assert await asyncio.wait_for(asyncio.to_thread(lambda: "livre"), 1) == "livre"
+        release.set()
+        await asyncio.wait_for(asyncio.gather(*writes), 5)
+        thread.join()
+        return peak
+
+    assert asyncio.run(scenario()) == 1
+
+def test_sync_write_on_the_loop_during_an_async_write_raises_instead_of_deadlocking():
+    async def scenario():
+        async with async_serialized_write():
+            with pytest.raises(RuntimeError):
+                with serialized_write():
+                    pass
+        with serialized_write():
+            return "ok"
+
+    assert asyncio.run(scenario()) == "ok"
+
+def test_async_write_is_reentrant_in_the_same_task():
+    async def scenario():
+        async with async_serialized_write():
+            async with async_serialized_write():
+                pass
+        return db_writer._write_lock.locked()
+
+    assert asyncio.run(scenario()) is False
+
+def test_cancelled_waiter_does_not_leak_the_lock():
+    async def scenario():
+        db_writer._write_lock.acquire()
+        waiter = asyncio.create_task(async_serialized_write().__aenter__())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        db_writer._write_lock.release()
+        async with async_serialized_write():
+            pass
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert not db_writer._write_lock.locked()
@@ -0,0 +1,89 @@
+# tests/test_email_import.py
+import time
+
+import pytest
+
+from backend.services.email_import import CSVRowParser, MboxRowParser, NDJSONRowParser
+
+def parse(parser, text: str):
+    rows = []
+    for line in text.splitlines(keepends=True):
+        rows.extend(parser.feed(line))
+    rows.extend(parser.close())
+    return rows
+
+def test_ndjson_valid_invalid_and_blank_lines():
+    rows = parse(NDJSONRowParser(), (
+        '{"sender": "a@x.com", "subject": "Oi", "body": "Corpo"}\n'
+        "\n"
+        "{nao e json}\n"
+        "[1, 2]\n"
+        '{"sender": "b@x.com", "subject": "", "body": "Corpo"}\n'
+    ))
+    assert [r[0] for r in rows] == [1, 2, 3, 4]
+    assert rows[0][1] == {"sender": "a@x.com", "subject": "Oi", "body": "Corpo"}
+    assert rows[1][2].startswith("JSON inválido")
+    assert rows[2][2] == "Esperado um objeto JSON"
+    assert "subject" in rows[3][2]
+
+def test_csv_quoted_newlines_and_escaped_quotes():
+    rows = parse(CSVRowParser(), (
+        "sender,subject,body\n"
+        'a@x.com,Oi,"linha 1\nlinha 2 com ""aspas"""\n'
+        "b@x.com,Assunto,simples\n"
+    ))
+    assert [r[2] for r in rows] == [None, None]
+    assert rows[0][1]["body"] == 'linha 1\nlinha 2 com "aspas"'
+    assert rows[1][1]["sender"] == "b@x.com"
+
+def test_csv_quote_inside_unquoted_field_does_not_swallow_the_file():
+    lines = ["sender,subject,body\n", 'a@x.com,s,5" screen\n']
+    lines += [f"aluno{i}@x.com,Dúvida {i},corpo {i}\n" for i in range(20_000)]
+    started = time.perf_counter()
+    rows = parse(CSVRowParser(), "".join(lines))
+    assert time.perf_counter() - started < 2
+    assert len(rows) == 20_001
+    assert all(error is None for _, _, error in rows)
+    assert rows[0][1]["body"] == '5" screen'
+
+def test_csv_unclosed_quote_reports_error_and_resyncs():
+    parser = CSVRowParser(max_record_chars=200)
+    text = "sender,subject,body\n" + 'a@x.com,s,"nunca fecha\n'
+    text += "".join(f"aluno{i}@x.com,Dúvida {i},corpo\n" for i in range(50))
+    rows = parse(parser, text)
+    assert rows[0] == (1, None, "Aspas não fechadas no registro CSV")
+    assert len(rows) == 51
+    assert all(error is None for _, _, error in rows[1:])
+    assert rows[-1][1]["sender"] == "aluno49@x.com"
+
+def test_csv_unclosed_quote_at_end_of_file_keeps_earlier_rows():
+    rows = parse(CSVRowParser(), (
+        "sender,subject,body\n"
+        "a@x.com,s,ok\n"
+        'b@x.com,s,"sem fim\n'
+        "c@x.com,s,ok\n"
+    ))
+    assert [(r[1] or {}).get("sender") for r in rows] == ["a@x.com", None, "c@x.com"]
+
+def test_csv_column_count_and_missing_header():
+    rows = parse(CSVRowParser(), "sender,subject,body\na@x.com,s\n")
+    assert rows == [(1, None, "Esperadas 3 colunas, encontradas 2")]
+    with pytest.raises(ValueError):
+        parse(CSVRowParser(), "sender,body\n")
+
+def test_mbox_messages_and_from_escape():
+    rows = parse(MboxRowParser(), (
+        "From a@x.com Mon Jan  1 00:00:00 2024\n"
+        "From: a@x.com\n"
+        "Subject: Primeira\n"
+        "\n"
+        "Corpo\n"
+        ">From aqui continua o corpo\n"
+        "From b@x.com Mon Jan  1 00:00:00 2024\n"
+        "From: b@x.com\n"
+        "\n"
+        "Sem assunto\n"
+    ))
+    assert rows[0][1]["subject"] == "Primeira"
+    assert "From aqui continua o corpo" in rows[0][1]["body"]
+    assert rows[1][1] is None and "subject" in rows[1][2]
@@ -0,0 +1,15 @@
+# tests/test_faq_repo.py
+from sqlalchemy.orm import sessionmaker
+
+from backend.repository.faq_repo import FAQRepo
+
+def test_upsert_updates_answer_and_excerpt(migrated_engine):
+    with sessionmaker(bind=migrated_engine)() as db:
+        repo = FAQRepo(db)
+        repo.upsert("Como trancar a matrícula?", "Pelo portal.", "Art. 1", "https://x/1")
+        repo.upsert("Como trancar a matrícula?", "Na secretaria.", "Art. 2", "https://x/1")
+
+    with sessionmaker(bind=migrated_engine)() as db:
+        faqs = FAQRepo(db).list_all()
+        assert len(faqs) == 1
+        assert (faqs[0].answer, faqs[0].excerpt) == ("Na secretaria.", "Art. 2")
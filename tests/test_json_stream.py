@@ -0,0 +1,45 @@
+# tests/test_json_stream.py
+from backend.chains.json_stream import JSONArrayStreamParser
+
+QUIZ = '[{"q": "Qual [colchete] e {chave}?", "a": "aspas \\" e \\\\"}, {"q": "dois", "n": [1, 2]}]'
+
+def feed_all(parser, chunks):
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+def test_ignores_brackets_in_model_text_before_the_array():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('Aqui está [o quiz]: [{"a":1}]') == [{"a": 1}]
+    assert parser.done
+
+def test_skips_code_fences_and_whitespace():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('```json\n[\n  {"a": 1},\n  {"a": 2}\n]\n```') == [{"a": 1}, {"a": 2}]
+    assert parser.done
+
+def test_brackets_and_escapes_inside_strings():
+    assert JSONArrayStreamParser().feed(QUIZ) == [
+        {"q": "Qual [colchete] e {chave}?", "a": 'aspas " e \\'},
+        {"q": "dois", "n": [1, 2]},
+    ]
+
+def test_any_chunk_boundary_gives_the_same_objects():
+    expected = JSONArrayStreamParser().feed("texto [x] " + QUIZ)
+    text = "texto [x] " + QUIZ
+    assert feed_all(JSONArrayStreamParser(), text) == expected
+    for cut in range(len(text)):
+        assert feed_all(JSONArrayStreamParser(), [text[:cut], text[cut:]]) == expected
+
+def test_objects_are_returned_as_soon_as_they_close():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[{"a": 1}, {"a"') == [{"a": 1}]
+    assert parser.feed(': 2}') == [{"a": 2}]
+    assert not parser.done
+
+def test_malformed_object_is_counted_and_skipped():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[{"a": 1}, {"a": 2,}, {"a": 3}]') == [{"a": 1}, {"a": 3}]
+    assert len(parser.errors) == 1
+    assert parser.done
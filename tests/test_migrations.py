@@ -0,0 +1,38 @@
+# tests/test_migrations.py
+import pytest
+
+from backend.infrastructure.session import create_sqlite_engine
+from backend.migrations import m0001_baseline, m0003_usage_rollups
+from backend.migrations.query_plans import check_query_plans
+from backend.migrations.runner import apply_migration, applied_versions, migrate, MIGRATIONS
+
+def test_hot_queries_use_indexes(migrated_engine):
+    with migrated_engine.connect() as conn:
+        assert check_query_plans(conn) == []
+
+def test_migrate_applies_all_versions(migrated_engine):
+    assert applied_versions(migrated_engine) == [m.VERSION for m in MIGRATIONS]
+    assert migrate(migrated_engine) == []
+
+def test_failed_migration_rolls_back_ddl(tmp_path, monkeypatch):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    applied_versions(engine)
+    apply_migration(engine, m0001_baseline)
+    monkeypatch.setattr(m0003_usage_rollups, "BACKFILL", ["INSERT INTO tabela_inexistente VALUES (1)"])
+
+    with pytest.raises(Exception):
+        apply_migration(engine, m0003_usage_rollups)
+
+    with engine.connect() as conn:
+        columns = [row[1] for row in conn.exec_driver_sql("PRAGMA table_info(messages)")]
+        assert "model" not in columns
+        assert conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = 'usage_hourly'"
+        ).first() is None
+    assert applied_versions(engine) == [m0001_baseline.VERSION]
+
+    # Sem o defeito, a mesma migration roda de novo sem "duplicate column name"
+    monkeypatch.undo()
+    apply_migration(engine, m0003_usage_rollups)
+    assert applied_versions(engine) == [m0001_baseline.VERSION, m0003_usage_rollups.VERSION]
+    engine.dispose()
@@ -0,0 +1,61 @@
+# tests/test_profiling.py
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.infrastructure.config import settings
+from backend.infrastructure.profiling import ProfileStore, ProfilingMiddleware, SamplingProfiler
+
+def busy_work(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+def test_idle_threads_do_not_dominate_summary():
+    stop = threading.Event()
+    idle = [threading.Thread(target=stop.wait, daemon=True) for _ in range(4)]
+    busy = threading.Thread(target=busy_work, args=(stop,), daemon=True)
+    for t in idle + [busy]:
+        t.start()
+
+    profiler = SamplingProfiler(interval=0.002)
+    profiler.start()
+    threading.Event().wait(0.3)   # a thread do teste também fica ociosa
+    profiler.stop()
+    stop.set()
+
+    _, summary = profiler.export("teste")
+    assert profiler.idle_samples > 0
+    assert summary[0]["name"] != "wait"
+    assert all(entry["name"] != "wait" for entry in summary)
+    top = {entry["name"]: entry["fraction"] for entry in summary}
+    assert top.get("busy_work", 0) > 0.5
+
+def test_middleware_exports_off_the_event_loop(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    export_threads = []
+    original_export = SamplingProfiler.export
+
+    def export(self, name):
+        export_threads.append(threading.get_ident())
+        return original_export(self, name)
+
+    monkeypatch.setattr(SamplingProfiler, "export", export)
+
+    store = ProfileStore(max_profiles=4)
+    loop_threads = []
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        loop_threads.append(threading.get_ident())
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, store=store)
+    response = TestClient(app).get("/ping", headers={"X-Profile": "sample"})
+
+    assert response.status_code == 200
+    assert export_threads and export_threads[0] != loop_threads[0]
+    [profile] = store.list()
+    assert (profile["route"], profile["mode"], profile["status"]) == ("/ping", "sample", 200)
+    assert store.get(profile["id"])["data"]
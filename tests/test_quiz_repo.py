@@ -0,0 +1,79 @@
+# tests/test_quiz_repo.py
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from backend.models.quiz import Quiz, Question, Answer
+from backend.repository.quiz_repo import QuizRepo
+
+def make_quiz(n_questions: int) -> Quiz:
+    return Quiz(
+        theme=f"tema com {n_questions}",
+        n_questions=n_questions,
+        questions=[
+            Question(
+                prompt=f"Pergunta {i}?",
+                correct_answer="A",
+                explanation="Explicação.",
+                answers=[
+                    Answer(given_answer=letter, text=f"Alternativa {letter}", is_correct=letter == "A")
+                    for letter in "ABCD"
+                ],
+            )
+            for i in range(n_questions)
+        ],
+    )
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+@pytest.fixture
+def db(migrated_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=migrated_engine)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def quiz_ids(db):
+    small, large = make_quiz(1), make_quiz(12)
+    db.add_all([small, large])
+    db.commit()
+    ids = small.id, large.id
+    db.expunge_all()
+    return ids
+
+def test_get_quiz_with_questions_query_count_is_constant(db, migrated_engine, quiz_ids):
+    counts = []
+    for quiz_id in quiz_ids:
+        db.expunge_all()
+        with count_statements(migrated_engine) as statements:
+            quiz = QuizRepo(db).get_quiz_with_questions(quiz_id)
+        assert len(quiz["questions"]) in (1, 12)
+        assert all(len(q["answers"]) == 4 for q in quiz["questions"])
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+def test_list_quiz_summaries_query_count_is_constant(db, migrated_engine, quiz_ids):
+    with count_statements(migrated_engine) as statements:
+        QuizRepo(db).list_quiz_summaries()
+    assert len(statements) == 1
+
+    db.add(make_quiz(30))
+    db.commit()
+    db.expunge_all()
+    with count_statements(migrated_engine) as statements:
+        summaries = QuizRepo(db).list_quiz_summaries()
+    assert len(statements) == 1
+    assert [s["n_questions"] for s in summaries] == [1, 12, 30]
@@ -0,0 +1,45 @@
+# tests/test_response_cache.py
+from typing import List
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from backend.infrastructure.pagination import set_next_cursor
+from backend.infrastructure.response_cache import ResponseCache, TableGenerations
+
+def make_app():
+    generations = TableGenerations()
+    cache = ResponseCache(max_entries=16, generations=generations)
+    items = [{"id": i} for i in range(1, 4)]
+    builds = []
+    app = FastAPI()
+
+    @app.get("/items")
+    async def list_items(request: Request, response: Response, after_id: int = 0, limit: int = 2):
+        async def build():
+            builds.append(after_id)
+            page = [it for it in items if it["id"] > after_id][:limit]
+            set_next_cursor(response, page, limit)
+            return page
+        return await cache.respond(request, response, ("items",), List[dict], build)
+
+    return app, generations, builds
+
+def test_unchanged_page_returns_304_without_rebuilding():
+    app, generations, builds = make_app()
+    client = TestClient(app)
+
+    first = client.get("/items")
+    assert first.status_code == 200
+    assert first.headers["X-Next-Cursor"] == "2"
+    etag = first.headers["ETag"]
+
+    again = client.get("/items", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert builds == [0]
+
+    generations.bump("items")
+    changed = client.get("/items", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert builds == [0, 0]
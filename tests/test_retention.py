@@ -0,0 +1,123 @@
+# tests/test_retention.py
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from backend.infrastructure.config import settings
+from backend.models.message import Message, MessageArchive
+from backend.models.usage import UsageDaily, UsageHourly, UsageModel, UsageSession
+from backend.repository.usage_repo import usage_rollup_statements
+from backend.routers import archive_router
+from backend.services.retention_service import archive_old_messages, iter_archived_session
+
+NOW = datetime.now(timezone.utc).replace(tzinfo=None)
+OLD_DAY_1 = (NOW - timedelta(days=200)).replace(hour=10, minute=0, second=0, microsecond=0)
+OLD_DAY_2 = OLD_DAY_1 + timedelta(days=1)
+
+@pytest.fixture
+def Session(migrated_engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(settings, "ARCHIVE_COMPRESSION", "gzip")
+    return sessionmaker(bind=migrated_engine)
+
+def log(db, session_id: str, content: str, timestamp: datetime) -> None:
+    """Grava a mensagem e os agregados de uso na mesma transação, como o db_logger."""
+    db.add(Message(session_id=session_id, role="user", content=content, timestamp=timestamp,
+                   prompt_tokens=10, completion_tokens=5, model="gpt"))
+    for stmt in usage_rollup_statements(session_id, "gpt", 10, 5, timestamp):
+        db.execute(stmt)
+    db.commit()
+
+def seed(Session) -> None:
+    with Session() as db:
+        log(db, "s1", "antiga 1", OLD_DAY_1)
+        log(db, "s2", "outra sessão", OLD_DAY_1 + timedelta(minutes=1))
+        log(db, "s1", "antiga 2", OLD_DAY_1 + timedelta(minutes=2))
+        log(db, "s1", "antiga 3", OLD_DAY_2)
+        log(db, "s1", "recente", NOW - timedelta(days=1))
+
+def usage_snapshot(db):
+    return [
+        sorted(tuple(getattr(r, c.name) for c in table.__table__.columns) for r in db.query(table).all())
+        for table in (UsageHourly, UsageDaily, UsageSession, UsageModel)
+    ]
+
+def archived_files():
+    found = []
+    for root, _, files in os.walk(settings.ARCHIVE_DIR):
+        found.extend(os.path.relpath(os.path.join(root, f), settings.ARCHIVE_DIR) for f in files)
+    return sorted(found)
+
+def test_archives_into_day_partitions_and_keeps_usage(Session):
+    seed(Session)
+    with Session() as db:
+        usage_before = usage_snapshot(db)
+
+    stats = archive_old_messages(Session(), older_than_days=90, batch_size=2)
+    assert stats["archived"] == 4
+
+    with Session() as db:
+        assert [m.content for m in db.query(Message).all()] == ["recente"]
+        assert usage_snapshot(db) == usage_before
+        index = db.query(MessageArchive).order_by(MessageArchive.first_id, MessageArchive.session_id).all()
+
+    day_1, day_2 = OLD_DAY_1.strftime("%Y-%m-%d"), OLD_DAY_2.strftime("%Y-%m-%d")
+    assert [(e.session_id, e.day, e.first_id, e.last_id) for e in index] == [
+        ("s1", day_1, 1, 1), ("s2", day_1, 2, 2), ("s1", day_1, 3, 3), ("s1", day_2, 4, 4),
+    ]
+    for entry in index:
+        assert entry.path.startswith(os.path.join("messages", *entry.day.split("-")))
+        assert os.path.exists(os.path.join(settings.ARCHIVE_DIR, entry.path))
+    assert all(not f.endswith(".tmp") for f in archived_files())
+
+def test_failure_before_commit_keeps_rows_and_rerun_rewrites_same_file(Session):
+    seed(Session)
+    db = Session()
+
+    def fail():
+        raise RuntimeError("queda antes do commit")
+
+    db.commit = fail
+    with pytest.raises(RuntimeError):
+        archive_old_messages(db, older_than_days=90, batch_size=10)
+    db.close()
+
+    files_after_failure = archived_files()
+    assert files_after_failure
+    with Session() as check:
+        assert check.query(Message).count() == 5
+        assert check.query(MessageArchive).count() == 0
+
+    archive_old_messages(Session(), older_than_days=90, batch_size=10)
+    assert archived_files() == files_after_failure
+    with Session() as check:
+        assert check.query(Message).count() == 1
+        assert {e.path for e in check.query(MessageArchive)} == set(files_after_failure)
+
+def test_iter_archived_session_returns_history_in_order(Session):
+    seed(Session)
+    archive_old_messages(Session(), older_than_days=90, batch_size=2)
+    with Session() as db:
+        assert [r["content"] for r in iter_archived_session(db, "s1")] == ["antiga 1", "antiga 2", "antiga 3"]
+        assert [r["content"] for r in iter_archived_session(db, "s2")] == ["outra sessão"]
+
+def test_replay_session_with_and_without_live_messages(Session, monkeypatch):
+    seed(Session)
+    archive_old_messages(Session(), older_than_days=90, batch_size=2)
+    monkeypatch.setattr(archive_router, "SessionLocal", Session)
+    app = FastAPI()
+    app.include_router(archive_router.router)
+    client = TestClient(app)
+
+    def replay(**params):
+        response = client.get("/archive/sessions/s1", params=params)
+        assert response.status_code == 200
+        return [json.loads(line)["content"] for line in response.text.splitlines()]
+
+    assert replay() == ["antiga 1", "antiga 2", "antiga 3"]
+    assert replay(include_live=True) == ["antiga 1", "antiga 2", "antiga 3", "recente"]